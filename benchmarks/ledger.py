@@ -0,0 +1,53 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.config import DATE_FORMAT, DATE_TRANSACTIONS_KEY, PAYMENT_DATE_KEY
+from src.transaction_store import OPERATIONS_PATH
+
+PAYMENT_DATE_FORMAT = "%d.%m.%Y"
+LEDGER_END_DATE = datetime(2021, 12, 31, 23, 59, 59)
+OPERATIONS_PER_DAY = 6
+MAX_PERIOD_DAYS = 10 * 365
+EXCEL_MAX_ROWS = 1_048_575
+
+_source: DataFrame | None = None
+
+
+def get_source_operations(file_path: str = OPERATIONS_PATH) -> DataFrame:
+    """Возвращает операции из выгрузки банка, по которым строится синтетическая выгрузка"""
+    global _source
+    if _source is None:
+        _source = pd.read_excel(file_path)
+    return _source
+
+
+def generate_ledger(size: int, seed: int = 0, end_date: datetime = LEDGER_END_DATE) -> DataFrame:
+    """Возвращает синтетическую выгрузку из size операций с колонками operations.xlsx.
+    Строки выбираются случайно из настоящей выгрузки, даты операций равномерно распределяются
+    по периоду, который растет вместе с размером выгрузки, но не больше 10 лет.
+    Операции отсортированы от новых к старым, как в выгрузке банка"""
+    source = get_source_operations()
+    rng = np.random.default_rng(seed)
+
+    df = source.iloc[rng.integers(0, len(source), size)].reset_index(drop=True)
+
+    period_days = min(MAX_PERIOD_DAYS, max(90, size // OPERATIONS_PER_DAY))
+    offsets = np.sort(rng.integers(0, period_days * 24 * 60 * 60, size))
+    dates = pd.Series(pd.Timestamp(end_date) - pd.to_timedelta(offsets, unit="s"))
+    df[DATE_TRANSACTIONS_KEY] = dates.dt.strftime(DATE_FORMAT)
+    if PAYMENT_DATE_KEY in df.columns:
+        df[PAYMENT_DATE_KEY] = dates.dt.strftime(PAYMENT_DATE_FORMAT)
+    return df
+
+
+def write_ledger_excel(df: DataFrame, file_path: str) -> str:
+    """Записывает синтетическую выгрузку в Excel-файл и возвращает путь к нему"""
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"В Excel-лист помещается не больше {EXCEL_MAX_ROWS} операций")
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    df.to_excel(file_path, index=False)
+    return file_path
@@ -0,0 +1,348 @@
+"""Замеры скорости чтения, фильтрации, агрегатов, отчетов и веб-страниц на синтетических выгрузках.
+
+Запуск из корня проекта:
+    python -m benchmarks.run --sizes 10000 100000
+    python -m benchmarks.run --sizes 1000000 10000000 --excel-max-size 0
+    python -m benchmarks.run --compare benchmarks/results/<commit>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable
+from unittest.mock import patch
+
+from benchmarks.ledger import EXCEL_MAX_ROWS, LEDGER_END_DATE, generate_ledger, write_ledger_excel
+from src.config import CATEGORY_KEY, DESCRIPTION_KEY
+from src.report_writer import ReportWriter
+from src.reports import (
+    spending_by_categories,
+    spending_by_category,
+    spending_by_weekday,
+    spending_by_workday,
+    spending_rolling,
+)
+from src.services_utils import get_invest_table, get_search_by_keyword, get_search_mask
+from src.store_utils import get_store_amount_for_categories, get_store_total_amount_for_card
+from src.transaction_store import TransactionStore
+from src.transaction_utils import get_transactions_by_date_period, top_transactions_by_amount
+from src.utils import (
+    get_amount_for_categories,
+    get_start_date,
+    get_total_amount_for_card,
+    read_transactions_from_excel,
+)
+from src.views import get_data_events, get_data_main
+
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_SIZES = [10_000, 100_000]
+DEFAULT_REPEAT = 5
+DEFAULT_EXCEL_MAX_SIZE = 100_000
+DEFAULT_RECORDS_MAX_SIZE = 1_000_000
+REGRESSION_THRESHOLD = 1.1
+
+REPORT_DATE = LEDGER_END_DATE.strftime("%Y-%m-%d")
+ROLLING_START = LEDGER_END_DATE.replace(year=LEDGER_END_DATE.year - 5).strftime("%Y-%m-%d")
+INVEST_START_MONTH = ROLLING_START[:7]
+INVEST_END_MONTH = REPORT_DATE[:7]
+PAGE_DATE = LEDGER_END_DATE.strftime("%Y-%m-%d %H:%M:%S")
+REPORT_CATEGORY = "Супермаркеты"
+SEARCH_KEYWORD = "магнит"
+
+Context = dict[str, Any]
+
+
+def clear_cache(context: Context) -> None:
+    """Удаляет кэш прочитанных Excel-файлов, чтобы следующее чтение было холодным"""
+    shutil.rmtree(context["cache_path"], ignore_errors=True)
+
+
+def bench_read_cold(context: Context) -> Any:
+    return read_transactions_from_excel(context["excel_path"])
+
+
+def bench_read_warm(context: Context) -> Any:
+    return read_transactions_from_excel(context["excel_path"])
+
+
+def bench_date_period_list(context: Context) -> Any:
+    return get_transactions_by_date_period(context["records"], context["start_date"], context["end_date"])
+
+
+def bench_date_period_store(context: Context) -> Any:
+    return get_transactions_by_date_period(context["store"], context["start_date"], context["end_date"])
+
+
+def bench_total_amount_for_card(context: Context) -> Any:
+    return get_total_amount_for_card(context["records"])
+
+
+def bench_amount_for_categories(context: Context) -> Any:
+    return get_amount_for_categories(context["records"], num_top_cats=7)
+
+
+def bench_total_amount_for_card_typed(context: Context) -> Any:
+    return get_total_amount_for_card(context["transactions"])
+
+
+def bench_amount_for_categories_typed(context: Context) -> Any:
+    return get_amount_for_categories(context["transactions"], num_top_cats=7)
+
+
+def bench_total_amount_for_card_store(context: Context) -> Any:
+    return get_store_total_amount_for_card(context["store"])
+
+
+def bench_amount_for_categories_store(context: Context) -> Any:
+    return get_store_amount_for_categories(context["store"], num_top_cats=7)
+
+
+def bench_amount_for_categories_rollup(context: Context) -> Any:
+    period = context["store"].rollup.get_period(context["start_date"], context["end_date"])
+    return get_store_amount_for_categories(period, num_top_cats=7)
+
+
+def bench_search_by_keyword(context: Context) -> Any:
+    return get_search_by_keyword(context["records"], SEARCH_KEYWORD, {CATEGORY_KEY, DESCRIPTION_KEY})
+
+
+def bench_search_by_keyword_index(context: Context) -> Any:
+    return get_search_by_keyword(context["store"], SEARCH_KEYWORD, {CATEGORY_KEY, DESCRIPTION_KEY})
+
+
+def bench_search_mask(context: Context) -> Any:
+    return get_search_mask(context["store"].df, SEARCH_KEYWORD, {CATEGORY_KEY, DESCRIPTION_KEY})
+
+
+def bench_top_transactions(context: Context) -> Any:
+    return top_transactions_by_amount(context["transactions"], num_top_cats=5)
+
+
+def bench_top_transactions_store(context: Context) -> Any:
+    return top_transactions_by_amount(context["store"], num_top_cats=5, typed=True)
+
+
+def bench_invest_table(context: Context) -> Any:
+    return get_invest_table(context["store"], INVEST_START_MONTH, INVEST_END_MONTH, (10, 50, 100), reconcile=True)
+
+
+def bench_spending_by_category(context: Context) -> Any:
+    return spending_by_category(context["store"].typed_df, REPORT_CATEGORY, REPORT_DATE)
+
+
+def bench_spending_by_categories(context: Context) -> Any:
+    return spending_by_categories(context["store"].typed_df, dates=[REPORT_DATE])
+
+
+def bench_spending_rolling(context: Context) -> Any:
+    return spending_rolling(context["store"].typed_df, ROLLING_START, REPORT_DATE)
+
+
+def bench_spending_by_weekday(context: Context) -> Any:
+    return spending_by_weekday(context["store"].typed_df, REPORT_DATE)
+
+
+def bench_spending_by_workday(context: Context) -> Any:
+    return spending_by_workday(context["store"].typed_df, REPORT_DATE)
+
+
+def bench_page_main(context: Context) -> Any:
+    return get_data_main(PAGE_DATE)
+
+
+def bench_page_events(context: Context) -> Any:
+    return get_data_events(PAGE_DATE, "Y")
+
+
+# Имя замера, функция замера, подготовка перед каждым запуском, что нужно замеру
+BENCHMARKS: list[tuple[str, Callable[[Context], Any], Callable[[Context], None] | None, str]] = [
+    ("read_transactions_from_excel[cold]", bench_read_cold, clear_cache, "excel"),
+    ("read_transactions_from_excel[warm]", bench_read_warm, None, "excel"),
+    ("get_transactions_by_date_period[list]", bench_date_period_list, None, "records"),
+    ("get_transactions_by_date_period[store]", bench_date_period_store, None, "store"),
+    ("get_total_amount_for_card", bench_total_amount_for_card, None, "records"),
+    ("get_amount_for_categories", bench_amount_for_categories, None, "records"),
+    ("get_total_amount_for_card[transactions]", bench_total_amount_for_card_typed, None, "transactions"),
+    ("get_amount_for_categories[transactions]", bench_amount_for_categories_typed, None, "transactions"),
+    ("get_total_amount_for_card[store]", bench_total_amount_for_card_store, None, "store"),
+    ("get_amount_for_categories[store]", bench_amount_for_categories_store, None, "store"),
+    ("get_amount_for_categories[rollup]", bench_amount_for_categories_rollup, None, "store"),
+    ("get_search_by_keyword", bench_search_by_keyword, None, "records"),
+    ("get_search_by_keyword[index]", bench_search_by_keyword_index, None, "store"),
+    ("get_search_mask[dataframe]", bench_search_mask, None, "store"),
+    ("top_transactions_by_amount[transactions]", bench_top_transactions, None, "transactions"),
+    ("top_transactions_by_amount[store]", bench_top_transactions_store, None, "store"),
+    ("get_invest_table[store]", bench_invest_table, None, "store"),
+    ("spending_by_category", bench_spending_by_category, None, "store"),
+    ("spending_by_categories", bench_spending_by_categories, None, "store"),
+    ("spending_rolling", bench_spending_rolling, None, "store"),
+    ("spending_by_weekday", bench_spending_by_weekday, None, "store"),
+    ("spending_by_workday", bench_spending_by_workday, None, "store"),
+    ("get_data_main", bench_page_main, None, "store"),
+    ("get_data_events", bench_page_events, None, "store"),
+]
+
+
+def get_commit() -> str:
+    """Возвращает короткий хэш текущего коммита или unknown"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+    return result.stdout.strip() or "unknown"
+
+
+def measure(
+    func: Callable[[Context], Any], context: Context, repeat: int, setup: Callable[[Context], None] | None = None
+) -> dict[str, Any]:
+    """Запускает замер repeat раз и возвращает время в секундах"""
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup(context)
+        start = time.perf_counter()
+        func(context)
+        runs.append(time.perf_counter() - start)
+    return {
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.fmean(runs),
+        "runs": runs,
+    }
+
+
+def build_context(size: int, tmp_path: str, excel_max_size: int, records_max_size: int) -> Context:
+    """Строит синтетическую выгрузку и все представления, которые нужны замерам"""
+    raw_df = generate_ledger(size)
+    store = TransactionStore(raw_df.fillna(value=""))
+    end_date = LEDGER_END_DATE
+    context: Context = {
+        "store": store,
+        "start_date": get_start_date(end_date, "Y"),
+        "end_date": end_date,
+        "cache_path": os.path.join(tmp_path, "cache"),
+        "available": {"store"},
+    }
+    if size <= min(excel_max_size, EXCEL_MAX_ROWS):
+        context["excel_path"] = write_ledger_excel(raw_df, os.path.join(tmp_path, f"operations_{size}.xlsx"))
+        context["available"].add("excel")
+    if size <= records_max_size:
+        context["records"] = store.records
+        context["transactions"] = store.transactions
+        context["available"].update({"records", "transactions"})
+    return context
+
+
+def run_benchmarks(
+    sizes: list[int],
+    repeat: int = DEFAULT_REPEAT,
+    excel_max_size: int = DEFAULT_EXCEL_MAX_SIZE,
+    records_max_size: int = DEFAULT_RECORDS_MAX_SIZE,
+    names: list[str] | None = None,
+) -> dict[str, Any]:
+    """Выполняет замеры для каждого размера выгрузки и возвращает словарь с результатами.
+    Замеры, которым не хватает данных нужного вида (Excel-файла или списка словарей), пропускаются"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_path:
+        report_writer = ReportWriter(os.path.join(tmp_path, "reports"))
+        for size in sizes:
+            context = build_context(size, tmp_path, excel_max_size, records_max_size)
+            with (
+                patch("src.cache_utils.CACHE_PATH", context["cache_path"]),
+                patch("src.reports.get_report_writer", return_value=report_writer),
+                patch("src.views.get_store", return_value=context["store"]),
+                patch("src.views.get_market_data", return_value=({}, {})),
+            ):
+                for name, func, setup, requires in BENCHMARKS:
+                    if names and name not in names:
+                        continue
+                    if requires not in context["available"]:
+                        results.append({"name": name, "size": size, "skipped": True})
+                        continue
+                    result = measure(func, context, repeat, setup)
+                    results.append({"name": name, "size": size, **result})
+                    print(f"{name:<42} {size:>10} {result['median']:>12.6f} s", flush=True)
+        report_writer.stop()
+
+    return {
+        "commit": get_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_results(base: dict[str, Any], new: dict[str, Any], threshold: float = REGRESSION_THRESHOLD) -> list[str]:
+    """Сравнивает медианы замеров двух запусков, возвращает строки отчета.
+    Замеры, ставшие медленнее порога, помечаются как регрессии"""
+    base_results = {(item["name"], item["size"]): item for item in base["results"] if not item.get("skipped")}
+    lines = [f"{'Замер':<42} {'Размер':>10} {base['commit']:>12} {new['commit']:>12} {'Отношение':>10}"]
+    for item in new["results"]:
+        base_item = base_results.get((item["name"], item["size"]))
+        if item.get("skipped") or base_item is None:
+            continue
+        ratio = item["median"] / base_item["median"] if base_item["median"] else float("inf")
+        mark = "  регрессия" if ratio > threshold else ""
+        lines.append(
+            f"{item['name']:<42} {item['size']:>10} {base_item['median']:>12.6f} {item['median']:>12.6f} "
+            f"{ratio:>10.2f}{mark}"
+        )
+    return lines
+
+
+def save_results(results: dict[str, Any], file_path: str | None = None) -> str:
+    """Сохраняет результаты в JSON-файл, по умолчанию в benchmarks/results/<коммит>.json"""
+    if file_path is None:
+        file_path = os.path.join(RESULTS_PATH, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
+    return file_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры скорости анализа банковских операций")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="размеры выгрузок")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="кол-во запусков каждого замера")
+    parser.add_argument(
+        "--excel-max-size",
+        type=int,
+        default=DEFAULT_EXCEL_MAX_SIZE,
+        help="наибольший размер выгрузки, для которой пишется Excel-файл и замеряется чтение",
+    )
+    parser.add_argument(
+        "--records-max-size",
+        type=int,
+        default=DEFAULT_RECORDS_MAX_SIZE,
+        help="наибольший размер выгрузки, для которой строятся списки словарей и Transaction",
+    )
+    parser.add_argument("--bench", nargs="+", help="имена замеров, по умолчанию все")
+    parser.add_argument("--output", help="путь к JSON-файлу с результатами")
+    parser.add_argument("--compare", help="JSON-файл с результатами прошлого запуска для сравнения")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.excel_max_size, args.records_max_size, args.bench)
+    file_path = save_results(results, args.output)
+    print(f"Результаты сохранены в {file_path}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        print("\n".join(compare_results(base, results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
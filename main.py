@@ -1,14 +1,28 @@
-import json
 import logging
 import os
 import re
+import sys
 
 from src import loggers
-from src.config import AMOUNT_KEY, DATA_FOLDER_NAME, FILE_OPERATIONS
-from src.reports import spending_by_category, spending_by_weekday, spending_by_workday
-from src.services import (get_beneficial_categories, investment_bank, search_by_phone, search_person_transfer,
-                          simple_search)
-from src.utils import is_valid_datetime, read_df_from_excel, read_transactions_from_excel
+from src.config import AMOUNT_KEY, INVEST_LIMITS
+from src.json_utils import to_json
+from src.reports import (
+    spending_by_categories,
+    spending_by_category,
+    spending_by_weekday,
+    spending_by_workday,
+    spending_rolling,
+)
+from src.services import (
+    get_beneficial_categories,
+    investment_bank,
+    investment_bank_table,
+    search_by_phone,
+    search_person_transfer,
+    simple_search,
+)
+from src.transaction_store import get_store
+from src.utils import is_valid_datetime
 from src.views import get_data_events, get_data_main
 
 name = os.path.splitext(os.path.basename(__file__))[0]
@@ -91,15 +105,15 @@ def output_services() -> None:
     print("3. Простой поиск")
     print("4. Поиск по телефонным номерам")
     print("5. Поиск переводов физическим лицам")
+    print("6. Инвесткопилка по месяцам")
 
-    file_name = os.path.join(os.path.dirname(__file__), f"{DATA_FOLDER_NAME}", FILE_OPERATIONS)
-    transactions = read_transactions_from_excel(file_name)
+    store = get_store()
     res: str | float = 0.0
     while True:
         choice = input().strip()
-        if choice in {"1", "2", "3", "4", "5"}:
+        if choice in {"1", "2", "3", "4", "5", "6"}:
             break
-        print("Пожалуйста, введите 1, 2, 3, 4, 5")
+        print("Пожалуйста, введите 1, 2, 3, 4, 5, 6")
 
     match choice:
         case "1":
@@ -112,7 +126,7 @@ def output_services() -> None:
 
             year, month, percent_cashback = input_data.split(" ")
 
-            res = get_beneficial_categories(transactions, year, month, float(percent_cashback))
+            res = get_beneficial_categories(store, year, month, float(percent_cashback))
         case "2":
             print("\nВведите месяц и лимит округления через пробел")
             while True:
@@ -123,7 +137,7 @@ def output_services() -> None:
 
             month, limit = input_data.split(" ")
 
-            res = investment_bank(month, transactions, int(limit))
+            res = investment_bank(month, store, int(limit))
         case "3":
             print("\nВведите ключевое слово")
             while True:
@@ -132,13 +146,29 @@ def output_services() -> None:
                     break
                 print("Введите данные верно")
 
-            res = simple_search(transactions, input_data)
+            res = simple_search(store, input_data, file=sys.stdout)
         case "4":
-            res = search_by_phone(transactions)
+            res = search_by_phone(store, file=sys.stdout)
         case "5":
-            res = search_person_transfer(transactions)
+            res = search_person_transfer(store, file=sys.stdout)
+        case "6":
+            print("\nВведите первый и последний месяц и опционально лимиты округления через пробел")
+            while True:
+                input_data = input().strip()
+                if re.fullmatch(r"^\d{4}-\d{2}\s+\d{4}-\d{2}(?:\s+[1-9]\d*)*$", input_data):
+                    break
+                print("Введите данные верно")
+
+            start_month, end_month, *limits = input_data.split()
+            invest_limits = [int(limit) for limit in limits] or INVEST_LIMITS
+
+            res = investment_bank_table(start_month, end_month, store, invest_limits)
     logger.info("Выведен результат для категории Сервисы")
-    print(res)
+    if res == "":
+        # Результат поиска уже записан в stdout потоком, остается закончить строку
+        sys.stdout.write("\n")
+    else:
+        print(res)
 
 
 def output_reports() -> None:
@@ -147,15 +177,16 @@ def output_reports() -> None:
     print("1. Траты по категории")
     print("2. Траты по дням недели")
     print("3. Траты в рабочий/выходной день")
+    print("4. Траты по всем категориям")
+    print("5. Траты по категориям помесячно за скользящие три месяца")
 
-    file_name = os.path.join(os.path.dirname(__file__), f"{DATA_FOLDER_NAME}", FILE_OPERATIONS)
-    transactions = read_df_from_excel(file_name)
+    transactions = get_store().typed_df
 
     while True:
         choice = input().strip()
-        if choice in {"1", "2", "3"}:
+        if choice in {"1", "2", "3", "4", "5"}:
             break
-        print("Пожалуйста, введите 1, 2, 3")
+        print("Пожалуйста, введите 1, 2, 3, 4, 5")
 
     match choice:
         case "1":
@@ -202,10 +233,34 @@ def output_reports() -> None:
                     break
 
             res = spending_by_workday(transactions, data)
+        case "4":
+            print("\nВведите опционально даты в формате YYYY-MM-DD через пробел")
+            while True:
+                dates = input().strip().split()
+                if all(is_valid_datetime(date, "%Y-%m-%d") for date in dates):
+                    break
+                print("Введите данные верно")
+
+            res = spending_by_categories(transactions, dates=dates or None)
+            logger.info("Выведен результат для категории Отчеты")
+            print(to_json(res.to_dict()))
+            return
+        case "5":
+            print("\nВведите начальную и опционально конечную дату в формате YYYY-MM-DD через пробел")
+            while True:
+                dates = input().strip().split()
+                if 1 <= len(dates) <= 2 and all(is_valid_datetime(date, "%Y-%m-%d") for date in dates):
+                    break
+                print("Введите данные верно")
+
+            res = spending_rolling(transactions, *dates)
+            logger.info("Выведен результат для категории Отчеты")
+            print(to_json(res.to_dict()))
+            return
 
     json_data = res[AMOUNT_KEY].to_dict()
     logger.info("Выведен результат для категории Отчеты")
-    print(json.dumps(json_data, indent=4, ensure_ascii=False))
+    print(to_json(json_data))
 
 
 if __name__ == "__main__":
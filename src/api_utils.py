@@ -1,96 +1,187 @@
+import itertools
 import logging
 import os
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from src import loggers
-from src.config import (API_EXCHANGE_URL, API_STOCKS_URL, DATA_FOLDER_NAME, FILE_USER_SETTINGS, USER_CURRENCIES,
-                        USER_STOCKS)
+from src.config import (
+    API_EXCHANGE_URL,
+    API_MAX_WORKERS,
+    API_STOCKS_BATCH_SIZE,
+    API_STOCKS_URL,
+    API_TIMEOUT,
+    DATA_FOLDER_NAME,
+    FILE_USER_SETTINGS,
+    USER_CURRENCIES,
+    USER_STOCKS,
+)
+from src.quote_cache import get_quote_cache
 from src.utils import get_json_file
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
+USER_SETTINGS_PATH = os.path.join(os.path.dirname(__file__), f"../{DATA_FOLDER_NAME}", FILE_USER_SETTINGS)
+CURRENCY_QUOTE = "currency"
+STOCK_QUOTE = "stock"
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Возвращает общую для модуля сессию с пулом соединений"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=API_MAX_WORKERS, pool_maxsize=API_MAX_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def get_json_response(url: str, **kwargs: Any) -> dict[str, Any] | None:
+    """Выполняет GET-запрос через общую сессию с таймаутом, возвращает ответ json или None при ошибке"""
+    try:
+        response = get_session().get(url, timeout=API_TIMEOUT, **kwargs)
+    except requests.exceptions.RequestException as e:
+        logger.error("Ошибка: %s", e)
+        return None
+
+    if response.status_code != 200:
+        logger.error("Ошибка: Status code: %s", response.status_code)
+        return None
+
+    try:
+        result: dict[str, Any] = response.json()
+    except ValueError as e:
+        logger.error("Ошибка: %s", e)
+        return None
+    return result
 
-def get_currency_rates(date_time: datetime) -> dict[str, float]:
-    """Получает на вход дату и возвращает словарь с валютой"""
-    result = {}
 
-    fin_out_dct_path = os.path.join(os.path.dirname(__file__), f"..\\{DATA_FOLDER_NAME}", FILE_USER_SETTINGS)
+def get_currency_rates(date_time: datetime) -> dict[str, float]:
+    """Получает на вход дату и возвращает словарь с валютой.
+    Курсы, уже полученные за эту дату, берутся из кэша"""
+    result: dict[str, float] = {}
 
-    user_currencies = get_json_file(fin_out_dct_path).get(USER_CURRENCIES)
+    user_currencies = get_json_file(USER_SETTINGS_PATH).get(USER_CURRENCIES)
 
     if user_currencies:
-        url = f"{API_EXCHANGE_URL}{datetime.strftime(date_time, "%Y-%m-%d")}"
-        parameters = {"base": "RUB", "symbols": ",".join(user_currencies)}
+        date = datetime.strftime(date_time, "%Y-%m-%d")
+        quote_cache = get_quote_cache()
+        result = quote_cache.get_many(CURRENCY_QUOTE, user_currencies, date)
+        missing = [currency for currency in user_currencies if currency not in result]
+        if not missing:
+            logger.info("Получен словарь с курсами валюты из кэша")
+            return result
+
+        url = f"{API_EXCHANGE_URL}{date}"
+        parameters = {"base": "RUB", "symbols": ",".join(missing)}
         load_dotenv()
         api_key = os.getenv("API_KEY_EXCHANGE")
         headers = {"apikey": api_key}
 
-        try:
-            response = requests.get(url, headers=headers, params=parameters)
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Ошибка: {e}")
-            return {}
-
-        if response.status_code != 200:
-            logger.error(f"Ошибка: Status code: {response.status_code}")
-            return {}
-
-        result = response.json().get("rates")
-        if not result:
-            return {}
-        for key in result.keys():
-            result[key] = round(1 / result[key] if result[key] != 0.0 else 0.0, 2)
+        response = get_json_response(url, headers=headers, params=parameters)
+        if response is None:
+            return result
+
+        rates = response.get("rates")
+        if not rates:
+            return result
+        fetched = {key: round(1 / value if value != 0.0 else 0.0, 2) for key, value in rates.items()}
+        quote_cache.set_many(CURRENCY_QUOTE, fetched, date)
+        result.update(fetched)
         logger.info("Получен словарь с курсами валюты")
     else:
         logger.error("Ошибка: отсутствуют валюты в настройках")
     return result
 
 
-def get_stock_prices(date_time: datetime) -> dict[str, float]:
-    """Возвращает данные по ценам акций на дату"""
+def parse_stock_prices(response: dict[str, Any], stocks: list[str]) -> dict[str, float]:
+    """Разбирает ответ API акций по одному символу или по нескольким символам сразу.
+    Возвращает последние цены закрытия, символы без данных пропускаются"""
+    responses = {stocks[0]: response} if len(stocks) == 1 else response
+
     result = {}
+    for stock in stocks:
+        data = responses.get(stock)
+        if not isinstance(data, dict):
+            continue
+        values = data.get("values", [])
+        if values:
+            result[stock] = float(values[0].get("close", "0"))
+        else:
+            logger.error("Ошибка: нет котировок для %s", stock)
+    return result
+
 
-    fin_out_dct_path = os.path.join(os.path.dirname(__file__), f"..\\{DATA_FOLDER_NAME}", FILE_USER_SETTINGS)
+def get_stock_prices_batch(stocks: list[str], parameters: dict[str, Any]) -> dict[str, float]:
+    """Получает последние цены закрытия для группы акций одним запросом"""
+    response = get_json_response(API_STOCKS_URL, params={**parameters, "symbol": ",".join(stocks)})
+    if response is None:
+        return {}
+    return parse_stock_prices(response, stocks)
 
-    user_stocks = get_json_file(fin_out_dct_path).get(USER_STOCKS)
+
+def get_stock_prices(date_time: datetime) -> dict[str, float]:
+    """Возвращает данные по ценам акций на дату. Акции запрашиваются группами по несколько символов
+    только за последний торговый день, группы запрашиваются параллельно.
+    Цены, уже полученные за эту дату, берутся из кэша"""
+    result: dict[str, float] = {}
+
+    user_stocks = get_json_file(USER_SETTINGS_PATH).get(USER_STOCKS)
 
     if user_stocks:
-        end_date = datetime.strftime(date_time.replace(hour=23, minute=59, second=59), "%Y-%m-%d %H:%M:%S")
+        stocks = [str(stock) for stock in user_stocks]
+        date = datetime.strftime(date_time, "%Y-%m-%d")
+        quote_cache = get_quote_cache()
+        result = quote_cache.get_many(STOCK_QUOTE, stocks, date)
+        missing = [stock for stock in stocks if stock not in result]
+        if not missing:
+            logger.info("Получены котировки из кэша")
+            return result
 
-        start_date_dt = date_time - timedelta(days=10)
-        start_date = datetime.strftime(start_date_dt.replace(hour=0, minute=0, second=0), "%Y-%m-%d %H:%M:%S")
+        end_date = datetime.strftime(date_time.replace(hour=23, minute=59, second=59), "%Y-%m-%d %H:%M:%S")
 
         load_dotenv()
         api_key = os.getenv("API_KEY_STOCK")
-        url = API_STOCKS_URL
         parameters = {
             "interval": "1day",
-            "symbol": "",
-            "start_date": start_date,
+            "outputsize": "1",
             "end_date": end_date,
             "apikey": api_key,
             "dp": "2",
         }
 
-        for stock in user_stocks:
-            parameters["symbol"] = str(stock)
-            try:
-                response = requests.get(url, params=parameters)
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Ошибка: {e}")
-                return {}
-
-            if response.status_code != 200:
-                logger.error(f"Ошибка: Status code: {response.status_code}")
-                return {}
-
-            stocks = response.json().get("values", [])
-            if stocks:
-                result[stock] = float(stocks[0].get("close", "0"))
+        batches = [list(batch) for batch in itertools.batched(missing, API_STOCKS_BATCH_SIZE)]
+        fetched: dict[str, float] = {}
+        with ThreadPoolExecutor(max_workers=min(API_MAX_WORKERS, len(batches))) as executor:
+            for prices in executor.map(lambda batch: get_stock_prices_batch(batch, parameters), batches):
+                fetched.update(prices)
+
+        quote_cache.set_many(STOCK_QUOTE, fetched, date)
+        result.update(fetched)
+        result = {stock: result[stock] for stock in stocks if stock in result}
     logger.info("Получены фильтрованные котировки")
     return result
+
+
+def get_market_data(date_time: datetime) -> tuple[dict[str, float], dict[str, float]]:
+    """Параллельно получает курсы валют и цены акций на дату"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        currency_rates = executor.submit(get_currency_rates, date_time)
+        stock_prices = executor.submit(get_stock_prices, date_time)
+        result = currency_rates.result(), stock_prices.result()
+    logger.info("Получены курсы валют и цены акций")
+    return result
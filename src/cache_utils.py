@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+
+import pandas as pd
+from pandas import DataFrame
+
+from src import loggers
+from src.config import CACHE_FOLDER_NAME, DATA_FOLDER_NAME
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), f"../{DATA_FOLDER_NAME}", CACHE_FOLDER_NAME)
+CACHE_EXTENSION = ".pkl"
+APPENDS_SUFFIX = "_appends"
+
+
+def get_cache_prefix(file_path: str) -> str:
+    """Возвращает префикс имени файлов кэша для исходного файла"""
+    return hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+
+
+def get_cache_path(file_path: str) -> str | None:
+    """Принимает путь к исходному файлу, возвращает путь к файлу кэша.
+    Ключ кэша — путь, время изменения и размер файла. Если файл недоступен, возвращает None"""
+    try:
+        stat = os.stat(file_path)
+    except (OSError, ValueError):
+        return None
+
+    version = hashlib.sha1(f"{stat.st_mtime_ns}|{stat.st_size}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CACHE_PATH, f"{get_cache_prefix(file_path)}_{version}{CACHE_EXTENSION}")
+
+
+def load_cached_df(cache_path: str) -> DataFrame | None:
+    """Читает dataframe из файла кэша, при отсутствии или повреждении кэша возвращает None"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        df: DataFrame = pd.read_pickle(cache_path)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        logger.error("Ошибка: %s", e)
+        return None
+    logger.info("Получен dataframe из кэша %s", cache_path)
+    return df
+
+
+def save_cached_df(df: DataFrame, file_path: str, cache_path: str) -> None:
+    """Сохраняет dataframe в кэш и удаляет устаревшие версии кэша этого файла"""
+    prefix = get_cache_prefix(file_path)
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(CACHE_PATH, exist_ok=True)
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+
+        for entry in os.listdir(CACHE_PATH):
+            entry_path = os.path.join(CACHE_PATH, entry)
+            if entry.startswith(prefix) and entry.endswith(CACHE_EXTENSION) and entry_path != cache_path:
+                os.remove(entry_path)
+    except OSError as e:
+        logger.error("Ошибка: %s", e)
+        return
+    logger.info("Сохранен кэш %s", cache_path)
+
+
+def read_excel_cached(file_path: str) -> DataFrame:
+    """Читает Excel-файл через кэш: при неизменном файле dataframe берется из кэша,
+    иначе файл парсится и кэш обновляется"""
+    cache_path = get_cache_path(file_path)
+
+    if cache_path:
+        df = load_cached_df(cache_path)
+        if df is not None:
+            return df
+
+    df = pd.read_excel(file_path)
+
+    if cache_path:
+        save_cached_df(df, file_path, cache_path)
+    return df
+
+
+def get_appends_path(file_path: str) -> str | None:
+    """Возвращает папку с операциями, добавленными к исходному файлу. Папка привязана к версии файла:
+    если файл заменили, добавленные к старой версии операции больше не применяются"""
+    cache_path = get_cache_path(file_path)
+    if cache_path is None:
+        return None
+    return cache_path[: -len(CACHE_EXTENSION)] + APPENDS_SUFFIX
+
+
+def load_appended_dfs(file_path: str) -> list[DataFrame]:
+    """Возвращает dataframe с добавленными к файлу операциями в порядке добавления"""
+    appends_path = get_appends_path(file_path)
+    if appends_path is None or not os.path.isdir(appends_path):
+        return []
+
+    result = []
+    for entry in sorted(os.listdir(appends_path)):
+        if entry.endswith(CACHE_EXTENSION):
+            df = load_cached_df(os.path.join(appends_path, entry))
+            if df is not None:
+                result.append(df)
+    logger.info("Получено %s добавлений к файлу %s", len(result), file_path)
+    return result
+
+
+def save_appended_df(df: DataFrame, file_path: str) -> None:
+    """Сохраняет добавленные к файлу операции отдельным файлом и удаляет добавления к старым версиям файла"""
+    appends_path = get_appends_path(file_path)
+    if appends_path is None:
+        logger.error("Ошибка: файл %s недоступен", file_path)
+        return
+
+    prefix = get_cache_prefix(file_path)
+    try:
+        os.makedirs(appends_path, exist_ok=True)
+        number = len([entry for entry in os.listdir(appends_path) if entry.endswith(CACHE_EXTENSION)])
+        append_path = os.path.join(appends_path, f"{number:06d}{CACHE_EXTENSION}")
+        tmp_path = f"{append_path}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, append_path)
+
+        for entry in os.listdir(CACHE_PATH):
+            entry_path = os.path.join(CACHE_PATH, entry)
+            if entry.startswith(prefix) and entry.endswith(APPENDS_SUFFIX) and entry_path != appends_path:
+                shutil.rmtree(entry_path, ignore_errors=True)
+    except OSError as e:
+        logger.error("Ошибка: %s", e)
+        return
+    logger.info("Сохранено добавление %s", append_path)
@@ -7,15 +7,39 @@ CASHBACK_KEY = "Бонусы (включая кэшбэк)"
 CATEGORY_KEY = "Категория"
 STATUS_KEY = "Статус"
 DESCRIPTION_KEY = "Описание"
+PAYMENT_DATE_KEY = "Дата платежа"
+CURRENCY_KEY = "Валюта операции"
+PAYMENT_AMOUNT_KEY = "Сумма платежа"
+PAYMENT_CURRENCY_KEY = "Валюта платежа"
+BANK_CASHBACK_KEY = "Кэшбэк"
+MCC_KEY = "MCC"
+INVEST_ROUND_KEY = "Округление на инвесткопилку"
+PHONE_TAG_KEY = "Телефон"
+PERSON_TAG_KEY = "Получатель"
+MERCHANT_TAG_KEY = "Продавец"
+WEEKDAY_KEY = "day_of_week"
+TRANSFERS_CATEGORY = "Переводы"
+INVEST_LIMITS = (10, 50, 100)
 DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
 USER_CURRENCIES = "user_currencies"
 USER_STOCKS = "user_stocks"
 API_EXCHANGE_URL = r"https://api.apilayer.com/exchangerates_data/"
 API_STOCKS_URL = r"https://api.twelvedata.com/time_series"
+API_TIMEOUT = 10
+API_MAX_WORKERS = 8
+API_STOCKS_BATCH_SIZE = 8
 FILE_USER_SETTINGS = "user_settings.json"
 FILE_OPERATIONS = "operations.xlsx"
+FILE_QUOTES_CACHE = "quotes_cache.json"
+TRANSACTIONS_BATCH_SIZE = 10_000
+QUOTES_CACHE_TTL = 24 * 60 * 60
+QUOTES_CACHE_MAX_SIZE = 1024
 DATA_FOLDER_NAME = "data"
+CACHE_FOLDER_NAME = "cache"
 REPORTS_FOLDER_NAME = "reports"
+REPORTS_FORMAT = "json"
+LOGS_FOLDER_NAME = "logs"
+LOG_LEVELS: dict[str, int | str] = {"utils": "INFO"}
 RUSSIAN_DAYS = [
     "Понедельник",
     "Вторник",
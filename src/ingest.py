@@ -0,0 +1,85 @@
+import logging
+import os
+from collections import Counter
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src import loggers
+from src.transaction import to_str
+from src.transaction_store import OPERATIONS_PATH, TransactionStore, append_to_store, get_store, parse_dates
+from src.utils import read_df_from_excel
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+
+def to_fingerprint_value(value: Any) -> str:
+    """Приводит значение ячейки к строке для отпечатка: числа сравниваются как float,
+    чтобы 5411 и 5411.0 из разных выгрузок совпадали"""
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        value = float(value)
+        return "" if value != value else repr(value)
+    return to_str(value)
+
+
+def get_fingerprints(df: DataFrame, columns: list[str]) -> np.ndarray:
+    """Возвращает отпечатки строк dataframe по колонкам: хэш uint64 от значений всех колонок.
+    Колонки, которых нет в dataframe, считаются пустыми"""
+    values = [
+        df[column].map(to_fingerprint_value) if column in df.columns else pd.Series([""] * len(df), index=df.index)
+        for column in columns
+    ]
+    rows = pd.concat(values, axis=1).agg("\x1f".join, axis=1) if values and len(df) else pd.Series([], dtype=object)
+    return pd.util.hash_array(rows.to_numpy(dtype=object))
+
+
+def get_new_operations(store: TransactionStore, df: DataFrame) -> DataFrame:
+    """Получает хранилище и выгрузку банка. Возвращает операции выгрузки, которых нет в хранилище.
+    Операции новее последней операции хранилища новые без проверки, более старые сравниваются
+    по отпечаткам с операциями хранилища за тот же период. Операции без даты пропускаются"""
+    columns = list(store.df.columns) or list(df.columns)
+    df = df.reset_index(drop=True)
+    dates = parse_dates(df)
+    valid = ~np.isnat(dates)
+    if not valid.all():
+        logger.warning("Пропущено %s операций без даты", int((~valid).sum()))
+
+    keys = store.date_keys
+    if not len(keys):
+        new = valid
+    else:
+        watermark = (-keys[0]).view("datetime64[ns]")
+        new = valid & (dates > watermark)
+        overlap = np.flatnonzero(valid & (dates <= watermark))
+        if len(overlap):
+            rows = store.get_rows_by_date_period(pd.Timestamp(dates[overlap].min()), pd.Timestamp(watermark))
+            known = Counter(get_fingerprints(store.df.iloc[rows], columns).tolist())
+            for row, fingerprint in zip(overlap, get_fingerprints(df.iloc[overlap], columns).tolist()):
+                if known[fingerprint]:
+                    known[fingerprint] -= 1
+                else:
+                    new[row] = True
+
+    result = df.loc[new].reindex(columns=columns, fill_value="").reset_index(drop=True)
+    logger.info("Найдено %s новых операций из %s", len(result), len(df))
+    return result
+
+
+def ingest_operations(export_path: str, file_path: str = OPERATIONS_PATH) -> int:
+    """Добавляет к хранилищу файла с операциями новые операции из выгрузки банка.
+    Возвращает кол-во добавленных операций"""
+    df = read_df_from_excel(export_path)
+    if df.empty:
+        logger.warning("Выгрузка %s пуста или не прочитана", export_path)
+        return 0
+
+    new = get_new_operations(get_store(file_path), df)
+    if not len(new):
+        return 0
+    append_to_store(new, file_path)
+    logger.info("Из выгрузки %s добавлено %s операций", export_path, len(new))
+    return len(new)
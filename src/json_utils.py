@@ -0,0 +1,51 @@
+import json
+import logging
+import os
+import sys
+from itertools import islice
+from typing import Any, Iterable, TextIO
+
+import orjson
+
+from src import loggers
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+JSON_INDENT = 4
+PRETTY_ITEM_INDENT = " " * JSON_INDENT
+COMPACT_CHUNK_SIZE = 1000
+
+
+def to_json(data: Any, pretty: bool = True) -> str:
+    """Возвращает JSON-строку с данными. Красивый вывод с отступами для консоли — через json,
+    компактный — через orjson, ключи-числа в нем приводятся к строкам, как в json"""
+    if pretty:
+        return json.dumps(data, indent=JSON_INDENT, ensure_ascii=False)
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def write_json(items: Iterable[Any], file: TextIO | None = None, pretty: bool = False) -> int:
+    """Пишет JSON-массив в файл (по умолчанию в stdout) по частям, не собирая всю строку в памяти.
+    Компактный вывод пишется пачками элементов, красивый совпадает с to_json для того же списка.
+    Возвращает кол-во записанных элементов"""
+    if file is None:
+        file = sys.stdout
+
+    count = 0
+    file.write("[")
+    if pretty:
+        for item in items:
+            text = "\n".join(PRETTY_ITEM_INDENT + line for line in to_json(item, pretty).split("\n"))
+            file.write(("," if count else "") + "\n" + text)
+            count += 1
+        file.write("\n]" if count else "]")
+    else:
+        iterator = iter(items)
+        while chunk := list(islice(iterator, COMPACT_CHUNK_SIZE)):
+            file.write(("," if count else "") + to_json(chunk, pretty)[1:-1])
+            count += len(chunk)
+        file.write("]")
+    logger.info("Записан JSON-массив из %s элементов", count)
+    return count
@@ -1,27 +1,122 @@
+import atexit
 import logging
 import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from src.config import LOG_LEVELS, LOGS_FOLDER_NAME
 
 FORMAT_LOG = "%(asctime)s  %(module)s.%(funcName)s - %(levelname)s: %(message)s"
 FORMAT_DATE_LOG = "%Y-%m-%d %H:%M:%S"
 
+LOGS_PATH = os.path.join(os.path.dirname(__file__), "..", LOGS_FOLDER_NAME)
+
+
+class RoutingHandler(logging.Handler):
+    """Обработчик, который пишет запись в файл логгера, создавшего запись"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.handlers: dict[str, logging.Handler] = {}
+
+    def set_handler(self, name_logger: str, handler: logging.Handler) -> None:
+        """Назначает логгеру обработчик, прежний обработчик закрывается. Замена и закрытие идут
+        под блокировкой обработчика, поэтому поток записи не пишет в закрытый файл"""
+        with self.lock:  # type: ignore[union-attr]
+            old_handler = self.handlers.get(name_logger)
+            self.handlers[name_logger] = handler
+            if old_handler is not None:
+                old_handler.close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self.handlers.get(record.name)
+        if handler is not None and record.levelno >= handler.level:
+            handler.handle(record)
+
+    def flush(self) -> None:
+        for handler in list(self.handlers.values()):
+            handler.flush()
+
+    def close(self) -> None:
+        for handler in list(self.handlers.values()):
+            handler.close()
+        super().close()
+
+
+class LazyQueueHandler(QueueHandler):
+    """Кладет запись в очередь без форматирования, сообщение собирается в потоке записи.
+    Если поток записи остановлен, запись сразу пишется в файл логгера"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with _listener_lock:
+            if _listener is not None:
+                super().emit(record)
+                return
+        _routing_handler.handle(record)
+
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_routing_handler = RoutingHandler()
+_listener: QueueListener | None = None
+_listener_lock = threading.Lock()
+
+
+def start_listener() -> None:
+    """Запускает общий поток записи логов, если он еще не запущен"""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_queue, _routing_handler)
+            _listener.start()
+
+
+def stop_listener() -> None:
+    """Останавливает поток записи логов, дописав все записи из очереди"""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+    _routing_handler.flush()
+
+
+atexit.register(stop_listener)
+
+
+def get_file_handler(name_logger: str) -> logging.Handler | None:
+    """Возвращает файловый обработчик логгера"""
+    return _routing_handler.handlers.get(name_logger)
+
 
 def create_logger(name_logger: str, name_log_file: str, logging_level: int) -> logging.Logger:
-    """Функция создания логера для модулей"""
-    logger = logging.getLogger(name_logger)
-    logger.setLevel(logging_level)
+    """Функция создания логера для модулей. Записи передаются через очередь
+    в общий поток, который пишет их в файл логгера. Уровень можно переопределить в LOG_LEVELS"""
+    level = LOG_LEVELS.get(name_logger, logging_level)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
 
-    logs_path = os.path.join(os.path.dirname(__file__), "..\\logs\\")
+    logger = logging.getLogger(name_logger)
+    logger.setLevel(level)
 
-    if not os.path.exists(logs_path):
-        os.makedirs(logs_path)
+    if not os.path.exists(LOGS_PATH):
+        os.makedirs(LOGS_PATH)
 
-    file_handler = logging.FileHandler(os.path.join(logs_path, name_log_file), mode="w", encoding="utf-8")
-    file_handler.setLevel(logging_level)
+    file_handler = logging.FileHandler(os.path.join(LOGS_PATH, name_log_file), mode="w", encoding="utf-8")
+    file_handler.setLevel(level)
 
     file_formatter = logging.Formatter(FORMAT_LOG, FORMAT_DATE_LOG)
 
     file_handler.setFormatter(file_formatter)
 
-    logger.addHandler(file_handler)
+    _routing_handler.set_handler(name_logger, file_handler)
+
+    if not any(isinstance(handler, LazyQueueHandler) for handler in logger.handlers):
+        logger.addHandler(LazyQueueHandler(_queue))
+
+    start_listener()
 
     return logger
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src import loggers
+from src.config import DATA_FOLDER_NAME, FILE_QUOTES_CACHE, QUOTES_CACHE_MAX_SIZE, QUOTES_CACHE_TTL
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+QUOTES_CACHE_PATH = os.path.join(os.path.dirname(__file__), f"../{DATA_FOLDER_NAME}", FILE_QUOTES_CACHE)
+
+
+class QuoteCache:
+    """Кэш котировок и курсов валют по ключу (вид, символ, дата) со сроком жизни,
+    вытеснением давно не используемых записей и сохранением в файл"""
+
+    def __init__(
+        self, file_path: str | None = None, ttl: float = QUOTES_CACHE_TTL, max_size: int = QUOTES_CACHE_MAX_SIZE
+    ) -> None:
+        self.file_path = file_path
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        if file_path:
+            self.load()
+
+    @staticmethod
+    def get_key(kind: str, symbol: str, date: str) -> str:
+        """Возвращает ключ записи кэша"""
+        return f"{kind}:{symbol}:{date}"
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, kind: str, symbol: str, date: str) -> float | None:
+        """Возвращает значение из кэша или None, если записи нет или срок ее жизни истек"""
+        key = self.get_key(kind, symbol, date)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, stored_at = item
+            if time.time() - stored_at > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+        return value
+
+    def set(self, kind: str, symbol: str, date: str, value: float) -> None:
+        """Сохраняет значение в кэш, при переполнении вытесняет давно не используемые записи"""
+        key = self.get_key(kind, symbol, date)
+        with self._lock:
+            self._items[key] = (value, time.time())
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def get_many(self, kind: str, symbols: list[str], date: str) -> dict[str, float]:
+        """Возвращает словарь найденных в кэше значений для списка символов"""
+        result = {}
+        for symbol in symbols:
+            value = self.get(kind, symbol, date)
+            if value is not None:
+                result[symbol] = value
+        return result
+
+    def set_many(self, kind: str, values: dict[str, float], date: str) -> None:
+        """Сохраняет в кэш словарь значений и записывает кэш в файл"""
+        for symbol, value in values.items():
+            self.set(kind, symbol, date, value)
+        if values:
+            self.save()
+
+    def load(self) -> None:
+        """Загружает кэш из файла, записи с истекшим сроком жизни пропускаются"""
+        if not self.file_path or not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.decoder.JSONDecodeError) as e:
+            logger.error("Ошибка: %s", e)
+            return
+
+        if not isinstance(data, dict):
+            logger.error("Ошибка: неверный формат кэша котировок в файле %s", self.file_path)
+            return
+
+        now = time.time()
+        with self._lock:
+            for key, item in data.items():
+                try:
+                    value, stored_at = item
+                    value, stored_at = float(value), float(stored_at)
+                except (TypeError, ValueError):
+                    logger.warning("Пропущена неверная запись кэша котировок %s", key)
+                    continue
+                if now - stored_at <= self.ttl:
+                    self._items[key] = (value, stored_at)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        logger.info("Загружен кэш котировок из файла %s", self.file_path)
+
+    def save(self) -> None:
+        """Записывает кэш в файл через временный файл, одновременные записи выполняются по очереди"""
+        if not self.file_path:
+            return
+        tmp_path = f"{self.file_path}.tmp"
+        with self._save_lock:
+            with self._lock:
+                data = dict(self._items)
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.file_path)
+            except OSError as e:
+                logger.error("Ошибка: %s", e)
+                return
+        logger.info("Сохранен кэш котировок в файл %s", self.file_path)
+
+
+_quote_cache: QuoteCache | None = None
+_quote_cache_lock = threading.Lock()
+
+
+def get_quote_cache() -> QuoteCache:
+    """Возвращает общий для процесса кэш котировок, сохраняемый в папке data"""
+    global _quote_cache
+    with _quote_cache_lock:
+        if _quote_cache is None:
+            _quote_cache = QuoteCache(QUOTES_CACHE_PATH)
+        return _quote_cache
@@ -0,0 +1,195 @@
+import atexit
+import hashlib
+import logging
+import os
+import pickle
+import queue
+import threading
+from typing import Any, Callable
+
+from src import loggers
+from src.config import REPORTS_FOLDER_NAME, REPORTS_FORMAT
+from src.json_utils import to_json
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+REPORTS_PATH = os.path.join(os.path.dirname(__file__), "..", REPORTS_FOLDER_NAME)
+
+REPORT_FORMATS: dict[str, tuple[str, Callable[[Any], bytes]]] = {
+    "json": (".json", lambda data: to_json(data).encode("utf-8")),
+    "compact": (".json", lambda data: to_json(data, pretty=False).encode("utf-8")),
+    "pickle": (".pkl", lambda data: pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)),
+}
+
+
+def get_content_hash(content: bytes) -> str:
+    """Возвращает хэш содержимого файла отчета"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def get_file_signature(file_path: str) -> tuple[int, int] | None:
+    """Возвращает время изменения и размер файла или None, если файла нет"""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def write_atomic(file_path: str, content: bytes) -> None:
+    """Записывает содержимое во временный файл рядом с файлом и переименовывает его в файл.
+    У каждого процесса и потока свой временный файл, поэтому одновременные записи
+    не оставляют недописанных файлов"""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ReportWriter:
+    """Запись файлов отчетов в фоновом потоке. Отчет сериализуется и пишется в потоке записи,
+    файл заменяется атомарно, а отчет с тем же содержимым повторно не пишется.
+    Из нескольких ожидающих записей в один файл пишется только последняя"""
+
+    def __init__(self, folder: str = REPORTS_PATH, background: bool = True) -> None:
+        self.folder = folder
+        self.background = background
+        self._pending: dict[str, tuple[Any, str]] = {}
+        self._hashes: dict[str, tuple[str, tuple[int, int] | None]] = {}
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def get_path(self, report_name: str, report_format: str) -> str:
+        """Возвращает путь файла отчета: расширение файла задается форматом"""
+        if report_format not in REPORT_FORMATS:
+            raise ValueError(f"Неизвестный формат {report_format}, допустимы: {', '.join(REPORT_FORMATS)}")
+        extension, _ = REPORT_FORMATS[report_format]
+        return os.path.join(self.folder, os.path.splitext(report_name)[0] + extension)
+
+    def submit(self, report_name: str, data: Any, report_format: str = REPORTS_FORMAT) -> str:
+        """Ставит отчет в очередь на запись и возвращает путь файла, не дожидаясь записи.
+        Данные после передачи изменять нельзя"""
+        file_path = self.get_path(report_name, report_format)
+        if not self.background:
+            self.write(file_path, data, report_format)
+            return file_path
+
+        with self._lock:
+            is_queued = file_path in self._pending
+            self._pending[file_path] = (data, report_format)
+            if self._thread is None:
+                self._start()
+        if not is_queued:
+            self._queue.put(file_path)
+        return file_path
+
+    def _start(self) -> None:
+        """Запускает поток записи, вызывается под блокировкой"""
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def get_file_hash(self, file_path: str) -> str | None:
+        """Возвращает хэш текущего содержимого файла. Файл перечитывается, только если
+        он изменился после последней записи или проверки"""
+        signature = get_file_signature(file_path)
+        if signature is None:
+            return None
+        with self._lock:
+            cached = self._hashes.get(file_path)
+        if cached is not None and cached[1] == signature:
+            return cached[0]
+        with open(file_path, "rb") as f:
+            content_hash = get_content_hash(f.read())
+        with self._lock:
+            self._hashes[file_path] = (content_hash, signature)
+        return content_hash
+
+    def write(self, file_path: str, data: Any, report_format: str) -> bool:
+        """Сериализует и записывает отчет. Возвращает False, если файл не изменился или не записан"""
+        try:
+            content = REPORT_FORMATS[report_format][1](data)
+            content_hash = get_content_hash(content)
+            if self.get_file_hash(file_path) == content_hash:
+                logger.info("Файл %s не изменился", file_path)
+                return False
+            write_atomic(file_path, content)
+            signature = get_file_signature(file_path)
+            with self._lock:
+                self._hashes[file_path] = (content_hash, signature)
+        except (OSError, TypeError, ValueError, pickle.PicklingError) as e:
+            logger.error("Ошибка: %s", e)
+            return False
+        logger.info("Сохранен файл %s", file_path)
+        return True
+
+    def _run(self) -> None:
+        try:
+            while True:
+                file_path = self._queue.get()
+                try:
+                    if file_path is None:
+                        return
+                    with self._lock:
+                        data, report_format = self._pending.pop(file_path)
+                    self.write(file_path, data, report_format)
+                except Exception as e:
+                    logger.error("Ошибка: %s", e)
+                finally:
+                    self._queue.task_done()
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+                    if self._pending:
+                        self._start()
+
+    def flush(self) -> None:
+        """Ждет, пока будут записаны все отчеты из очереди"""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Дописывает отчеты из очереди и останавливает поток записи. Поток остается текущим,
+        пока не дойдет до конца очереди, поэтому отправка отчета во время остановки не запускает
+        второй поток. Отчеты, отправленные после начала остановки, пишет новый поток"""
+        with self._lock:
+            thread = self._thread
+            if thread is not None and not self._stopping:
+                self._stopping = True
+                self._queue.put(None)
+        if thread is not None:
+            thread.join()
+
+
+_report_writer: ReportWriter | None = None
+_report_writer_lock = threading.Lock()
+
+
+def get_report_writer() -> ReportWriter:
+    """Возвращает общий для процесса поток записи отчетов в папку reports"""
+    global _report_writer
+    with _report_writer_lock:
+        if _report_writer is None:
+            _report_writer = ReportWriter()
+        return _report_writer
+
+
+def stop_report_writer() -> None:
+    """Дописывает отчеты из очереди общего потока записи"""
+    with _report_writer_lock:
+        report_writer = _report_writer
+    if report_writer is not None:
+        report_writer.stop()
+
+
+atexit.register(stop_report_writer)
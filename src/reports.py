@@ -1,34 +1,51 @@
 import functools
-import json
 import logging
 import os
+from datetime import datetime
 from typing import Any, Callable, Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
 from src import loggers
-from src.config import AMOUNT_KEY, CATEGORY_KEY, DATE_TRANSACTIONS_KEY, REPORTS_FOLDER_NAME, RUSSIAN_DAYS
-from src.reports_utils import get_dataframe_spending, get_dates_by_month
+from src.config import AMOUNT_KEY, CATEGORY_KEY, REPORTS_FORMAT, RUSSIAN_DAYS, WEEKDAY_KEY
+from src.report_writer import get_report_writer
+from src.reports_utils import (
+    get_dates_by_month,
+    get_rolling_sums,
+    get_rolling_windows,
+    get_spending_amounts,
+    get_spending_rows,
+    get_typed_frame,
+    get_window_positions,
+)
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
+WEEKDAY_NAMES = np.array(RUSSIAN_DAYS, dtype=object)
+DAY_TYPE_NAMES = np.array(["Рабочий день", "Выходной день"], dtype=object)
+
+
+def log_reports_to_file(
+    file_name: str = "report.json", column: Optional[str] = AMOUNT_KEY, report_format: Optional[str] = None
+) -> Callable:
+    """Декоратор сохраняет колонку отчета в файл папки отчетов. Если колонка не указана,
+    сохраняется весь dataframe по колонкам. Файл пишется в фоновом потоке, время отчета
+    не включает запись на диск. Формат по умолчанию задается в REPORTS_FORMAT"""
 
-def log_reports_to_file(file_name: str = "report.json") -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args: Iterable, **kwargs: Iterable) -> Any:
             df = func(*args, **kwargs)
-            dct = df[AMOUNT_KEY].to_dict()
-
-            file_path = os.path.join(os.path.dirname(__file__), f"../{REPORTS_FOLDER_NAME}", file_name)
+            dct = df.to_dict() if column is None else df[column].to_dict()
             try:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(dct, f, ensure_ascii=False, indent=4)
-            except (FileNotFoundError, TypeError) as e:
-                logger.error(f"Ошибка: {e}")
-            logger.info(f"Сохранен файл {file_path}")
+                file_path = get_report_writer().submit(file_name, dct, report_format or REPORTS_FORMAT)
+            except ValueError as e:
+                logger.error("Ошибка: %s", e)
+            else:
+                logger.info("Файл %s поставлен в очередь на запись", file_path)
             return df
 
         return wrapper
@@ -42,23 +59,71 @@ def spending_by_category(transactions: pd.DataFrame, category: str, date: Option
     Возвращает траты по данной категории за последние 3 месяца"""
     start_date, end_date = get_dates_by_month(date)
 
-    filtered = get_dataframe_spending(transactions, start_date, end_date, category=category)
-    result = filtered.groupby(CATEGORY_KEY).agg({AMOUNT_KEY: "sum"}).round(2)
+    typed = get_typed_frame(transactions)
+    rows = get_spending_rows(typed, start_date, end_date, category=category)
+    amounts = get_spending_amounts(typed, rows)
+    result = amounts.groupby(typed[CATEGORY_KEY].to_numpy()[rows]).sum().round(2).to_frame(AMOUNT_KEY)
+    result.index.name = CATEGORY_KEY
     logger.info("Получен dataframe с расходами по категориям")
     return result
 
 
+@log_reports_to_file("spending_by_categories.json", column=None)
+def spending_by_categories(
+    transactions: pd.DataFrame,
+    categories: Optional[Iterable[str]] = None,
+    dates: Optional[Iterable[Optional[str]]] = None,
+) -> pd.DataFrame:
+    """Функция принимает на вход транзакции, опционально категории (по умолчанию все) и список дат.
+    Возвращает таблицу трат: строки — категории, колонки — даты, в ячейке траты по категории
+    за 3 месяца до даты. Повторяющиеся даты дают одну колонку. Все окна считаются за один проход и одну группировку"""
+    anchors: dict[str, tuple[datetime, datetime]] = {}
+    for date in [None] if dates is None else dates:
+        window = get_dates_by_month(date)
+        anchors.setdefault(window[1].strftime("%Y-%m-%d"), window)
+    labels, windows = list(anchors), list(anchors.values())
+
+    typed = get_typed_frame(transactions)
+    if windows:
+        rows = get_spending_rows(typed, min(start for start, _ in windows), max(end for _, end in windows))
+    else:
+        rows = np.arange(0)
+    codes, uniques = pd.factorize(typed[CATEGORY_KEY].to_numpy()[rows])
+    keep = codes >= 0
+    if categories is not None:
+        categories = set(categories)
+        keep &= np.isin(uniques, list(categories))[codes]
+    rows, codes = rows[keep], codes[keep]
+
+    window_index, positions = get_window_positions(typed, rows, windows)
+    amounts = get_spending_amounts(typed, rows[positions])
+    sums = amounts.groupby([np.asarray(uniques, dtype=object)[codes[positions]], window_index]).sum()
+
+    index = sorted(categories) if categories is not None else sorted(sums.index.get_level_values(0).unique())
+    result = pd.DataFrame(0.0, index=pd.Index(index, dtype=object, name=CATEGORY_KEY), columns=range(len(windows)))
+    if len(sums):
+        matrix = sums.unstack()
+        result = matrix.reindex(index=result.index, columns=result.columns).fillna(0.0)
+    result = result.round(2)
+    result.columns = pd.Index(labels)
+    logger.info("Получен dataframe с расходами по %s категориям за %s периодов", len(result), len(labels))
+    return result
+
+
 @log_reports_to_file("spending_by_weekday.json")
 def spending_by_weekday(transactions: pd.DataFrame, date: Optional[str] = None) -> pd.DataFrame:
     """Функция принимает на вход транзакции, дату опционально.
     Возвращает средние траты в каждый из дней недели за последние три месяца"""
     start_date, end_date = get_dates_by_month(date)
 
-    filtered = get_dataframe_spending(transactions, start_date, end_date)
-    filtered["day_of_week"] = filtered[DATE_TRANSACTIONS_KEY].dt.weekday
-    filtered["day_name_ru"] = filtered["day_of_week"].map((lambda x: RUSSIAN_DAYS[x]))
-    result = filtered.groupby("day_name_ru").agg({AMOUNT_KEY: "sum", "day_of_week": "first"}).round(2)
-    result = result.sort_values("day_of_week")
+    typed = get_typed_frame(transactions)
+    rows = get_spending_rows(typed, start_date, end_date)
+    sums = get_spending_amounts(typed, rows).groupby(typed[WEEKDAY_KEY].to_numpy()[rows]).sum().round(2)
+    weekdays = sums.index.to_numpy(dtype=np.int8)
+    result = pd.DataFrame(
+        {AMOUNT_KEY: sums.to_numpy(), WEEKDAY_KEY: weekdays},
+        index=pd.Index(WEEKDAY_NAMES[weekdays], name="day_name_ru"),
+    )
     logger.info("Получен dataframe с расходами по дням недели")
     return result
 
@@ -70,12 +135,53 @@ def spending_by_workday(transactions: pd.DataFrame, date: Optional[str] = None)
     Возвращает средние траты в рабочий и в выходной день за последние три месяца"""
     start_date, end_date = get_dates_by_month(date)
 
-    filtered = get_dataframe_spending(transactions, start_date, end_date)
-    filtered["day_of_week"] = filtered[DATE_TRANSACTIONS_KEY].dt.weekday
-    filtered["type_day"] = filtered["day_of_week"].map(
-        lambda x: "Рабочий день" if x in range(0, 5) else "Выходной день"
+    typed = get_typed_frame(transactions)
+    rows = get_spending_rows(typed, start_date, end_date)
+    sums = get_spending_amounts(typed, rows).groupby(typed[WEEKDAY_KEY].to_numpy()[rows] >= 5).sum().round(2)
+    result = pd.DataFrame(
+        {AMOUNT_KEY: sums.to_numpy()},
+        index=pd.Index(DAY_TYPE_NAMES[sums.index.to_numpy(dtype=np.intp)], name="type_day"),
     )
-    result = filtered.groupby("type_day").agg({AMOUNT_KEY: "sum"}).round(2)
-    result = result.sort_values("type_day", ascending=False)
     logger.info("Получен dataframe с расходами по типам дней")
     return result
+
+
+@log_reports_to_file("spending_rolling.json", column=None)
+def spending_rolling(
+    transactions: pd.DataFrame,
+    start: str,
+    end: Optional[str] = None,
+    by: str = "category",
+    freq: str = "month",
+    months: int = 3,
+) -> pd.DataFrame:
+    """Функция принимает на вход транзакции, начальную и опционально конечную дату, группировку
+    (category, weekday или workday), шаг (month или week) и длину окна в месяцах.
+    Возвращает таблицу: строки — категории, дни недели или типы дней, колонки — первые числа месяцев
+    (или понедельники), в ячейке траты за months месяцев до даты. Все окна считаются за один проход"""
+    windows = get_rolling_windows(start, end, freq, months)
+    labels = [end_date.strftime("%Y-%m-%d") for _, end_date in windows]
+
+    typed = get_typed_frame(transactions)
+    if windows:
+        rows = get_spending_rows(typed, windows[0][0], windows[-1][1])
+    else:
+        rows = np.arange(0)
+
+    if by == "category":
+        codes, uniques = pd.factorize(typed[CATEGORY_KEY].to_numpy()[rows], sort=True)
+        rows, codes = rows[codes >= 0], codes[codes >= 0]
+        index = pd.Index(np.asarray(uniques, dtype=object), name=CATEGORY_KEY)
+    elif by == "weekday":
+        codes = typed[WEEKDAY_KEY].to_numpy()[rows].astype(np.intp)
+        index = pd.Index(WEEKDAY_NAMES, name="day_name_ru")
+    elif by == "workday":
+        codes = (typed[WEEKDAY_KEY].to_numpy()[rows] >= 5).astype(np.intp)
+        index = pd.Index(DAY_TYPE_NAMES, name="type_day")
+    else:
+        raise ValueError(f"Неизвестная группировка {by}, допустимы: category, weekday, workday")
+
+    sums = get_rolling_sums(typed, rows, codes, len(index), windows)
+    result = pd.DataFrame(np.round(sums, 2) + 0.0, index=index, columns=pd.Index(labels))
+    logger.info("Получен dataframe со скользящими расходами по %s за %s периодов", by, len(labels))
+    return result
@@ -3,41 +3,150 @@ import os
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
 from src import loggers
-from src.config import AMOUNT_KEY, CATEGORY_KEY, DATE_TRANSACTIONS_KEY
+from src.config import AMOUNT_KEY, CATEGORY_KEY, DATE_TRANSACTIONS_KEY, WEEKDAY_KEY
+from src.transaction_store import NS_PER_DAY, get_weekdays
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
+ANCHOR_FREQUENCIES = {"month": "MS", "week": "W-MON"}
 
-def get_dataframe_spending(
+
+def get_typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Возвращает dataframe для отчетов: колонка даты разобрана в datetime64, номер дня недели
+    в колонке int8. Подготовленный dataframe (typed_df хранилища) возвращается как есть,
+    иначе создается поверхностная копия без копирования данных колонок. Исходный dataframe не меняется"""
+    dates = df[DATE_TRANSACTIONS_KEY]
+    is_typed = pd.api.types.is_datetime64_any_dtype(dates)
+    if is_typed and WEEKDAY_KEY in df.columns:
+        return df
+
+    if not is_typed:
+        dates = pd.to_datetime(dates, dayfirst=True)
+    typed = df.copy(deep=False)
+    typed[DATE_TRANSACTIONS_KEY] = dates
+    typed[WEEKDAY_KEY] = get_weekdays(dates.to_numpy(dtype="datetime64[ns]"))
+    logger.info("Подготовлен dataframe для отчетов")
+    return typed
+
+
+def get_spending_rows(
     df: pd.DataFrame,
     start_date: datetime,
     end_date: datetime,
     category: str = "",
     expense: bool = True,
-) -> pd.DataFrame:
-    """Принимает на вход dataframe, начальную и конечную даты, опционально категорию и признак расходов.
-    Возвращает фильтрованый dataframe"""
-    df[DATE_TRANSACTIONS_KEY] = pd.to_datetime(df[DATE_TRANSACTIONS_KEY], dayfirst=True)
-
-    filter_data = (df[DATE_TRANSACTIONS_KEY] >= start_date) & (df[DATE_TRANSACTIONS_KEY] <= end_date)
+) -> np.ndarray:
+    """Принимает подготовленный dataframe, начальную и конечную даты, опционально категорию и признак расходов.
+    Возвращает номера подходящих строк. Категория сравнивается только у строк, прошедших фильтр по датам"""
+    dates = df[DATE_TRANSACTIONS_KEY].to_numpy(dtype="datetime64[ns]")
+    amounts = df[AMOUNT_KEY].to_numpy()
+    mask = (dates >= np.datetime64(start_date, "ns")) & (dates <= np.datetime64(end_date, "ns"))
+    mask &= (amounts < 0) if expense else (amounts > 0)
 
+    rows = np.flatnonzero(mask)
     if category:
-        filter_data &= df[CATEGORY_KEY] == category
+        rows = rows[df[CATEGORY_KEY].to_numpy()[rows] == category]
+    return rows
+
+
+def get_window_positions(
+    df: pd.DataFrame, rows: np.ndarray, windows: list[tuple[datetime, datetime]]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Принимает подготовленный dataframe, номера строк и окна дат (начало, конец).
+    Возвращает номера окон и позиции в rows для всех пар, где строка попала в окно.
+    Строки один раз сортируются по дате, границы всех окон находятся бинарным поиском,
+    поэтому работа пропорциональна числу пар, а не окнам на строки. Внутри окна позиции идут по порядку"""
+    dates = df[DATE_TRANSACTIONS_KEY].to_numpy(dtype="datetime64[ns]")[rows]
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+    starts = np.array([np.datetime64(start, "ns") for start, _ in windows], dtype="datetime64[ns]")
+    ends = np.array([np.datetime64(end, "ns") for _, end in windows], dtype="datetime64[ns]")
+    lows = np.searchsorted(sorted_dates, starts, side="left")
+    highs = np.maximum(np.searchsorted(sorted_dates, ends, side="right"), lows)
+
+    window_index = np.repeat(np.arange(len(windows)), highs - lows)
+    positions = np.concatenate([np.arange(0)] + [np.sort(order[low:high]) for low, high in zip(lows, highs)])
+    return window_index, positions
+
+
+def get_rolling_sums(
+    df: pd.DataFrame,
+    rows: np.ndarray,
+    codes: np.ndarray,
+    size: int,
+    windows: list[tuple[datetime, datetime]],
+) -> np.ndarray:
+    """Принимает подготовленный dataframe, номера строк, коды групп строк, кол-во групп и окна дат,
+    начинающиеся и заканчивающиеся в полночь. Возвращает матрицу сумм модулей по группам и окнам.
+    Строки один раз складываются в свод по дням, окно считается разностью накопленных сумм свода:
+    весь день начала, дни до дня конца и операции ровно в полночь дня конца, как при фильтре по датам"""
+    result = np.zeros((size, len(windows)))
+    if not windows:
+        return result
+
+    start_days = np.array([np.datetime64(start, "D") for start, _ in windows]).astype(np.int64)
+    end_days = np.array([np.datetime64(end, "D") for _, end in windows]).astype(np.int64)
+    first_day = int(start_days.min())
+    num_days = int(end_days.max()) - first_day + 1
+
+    dates = df[DATE_TRANSACTIONS_KEY].to_numpy(dtype="datetime64[ns]")[rows].view("int64")
+    amounts = np.abs(df[AMOUNT_KEY].to_numpy(dtype=float)[rows])
+    cells = (dates // NS_PER_DAY - first_day) * size + codes
+    midnight = dates % NS_PER_DAY == 0
 
-    if expense:
-        filter_data &= df[AMOUNT_KEY] < 0
-    else:
-        filter_data &= df[AMOUNT_KEY] > 0
+    daily = np.bincount(cells, weights=amounts, minlength=num_days * size).reshape(num_days, size)
+    at_midnight = np.bincount(cells[midnight], weights=amounts[midnight], minlength=num_days * size)
+    cumulative = np.concatenate([np.zeros((1, size)), np.cumsum(daily, axis=0)])
+
+    start_index, end_index = start_days - first_day, end_days - first_day
+    result = cumulative[end_index] - cumulative[start_index] + at_midnight.reshape(num_days, size)[end_index]
+    return np.transpose(result)
+
+
+def get_rolling_windows(
+    start: str, end: Optional[str] = None, freq: str = "month", months: int = 3
+) -> list[tuple[datetime, datetime]]:
+    """Принимает начальную и конечную строковые даты, шаг (месяц или неделя) и длину окна в месяцах.
+    Возвращает окна дат, которые заканчиваются на первых числах месяцев или понедельниках между датами"""
+    if freq not in ANCHOR_FREQUENCIES:
+        raise ValueError(f"Неизвестный шаг {freq}, допустимы: {', '.join(ANCHOR_FREQUENCIES)}")
+    end_date = datetime.now() if end is None else datetime.strptime(end, "%Y-%m-%d")
+    anchors = pd.date_range(datetime.strptime(start, "%Y-%m-%d"), end_date, freq=ANCHOR_FREQUENCIES[freq])
+    windows = [(anchor - relativedelta(months=months), anchor) for anchor in anchors.to_pydatetime()]
+    logger.info("Получено %s окон дат", len(windows))
+    return windows
+
+
+def get_spending_amounts(df: pd.DataFrame, rows: np.ndarray) -> pd.Series:
+    """Возвращает модули сумм операций по номерам строк. Копируется только колонка сумм этих строк"""
+    return pd.Series(np.abs(df[AMOUNT_KEY].to_numpy()[rows]))
+
+
+def get_dataframe_spending(
+    df: pd.DataFrame,
+    start_date: datetime,
+    end_date: datetime,
+    category: str = "",
+    expense: bool = True,
+) -> pd.DataFrame:
+    """Принимает на вход dataframe, начальную и конечную даты, опционально категорию и признак расходов.
+    Возвращает фильтрованый dataframe с колонками исходного. Уже разобранная колонка даты повторно не разбирается,
+    результат собирается из выбранных строк колонок исходного без промежуточной копии всех строк"""
+    typed = get_typed_frame(df)
+    rows = get_spending_rows(typed, start_date, end_date, category, expense)
 
-    filtered = df.loc[filter_data].copy()
-    filtered[AMOUNT_KEY] = filtered[AMOUNT_KEY].abs()
-    # filtered[DATE_TRANSACTIONS_KEY] = filtered[DATE_TRANSACTIONS_KEY].dt.strftime("%d.%m.%Y %H:%M:%S")
+    columns = {
+        key: get_spending_amounts(typed, rows).to_numpy() if key == AMOUNT_KEY else typed[key].array[rows]
+        for key in df.columns
+    }
+    filtered = pd.DataFrame(columns, index=typed.index[rows])
     logger.info("Получены фильтрованные dataframe")
     return filtered
 
@@ -0,0 +1,98 @@
+import logging
+import os
+import re
+import threading
+from typing import Callable, Iterable
+
+import numpy as np
+
+from src import loggers
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+NGRAM_SIZE = 3
+
+
+def get_ngrams(text: str, size: int = NGRAM_SIZE) -> set[str]:
+    """Возвращает множество n-грамм строки, приведенной к casefold"""
+    folded = text.casefold()
+    return {folded[i : i + size] for i in range(len(folded) - size + 1)}
+
+
+class TrigramIndex:
+    """Инвертированный индекс по триграммам одной колонки. Индексируются не строки dataframe,
+    а словарь значений колонки, поэтому повторяющиеся описания индексируются один раз.
+    Строки dataframe находятся по кодам значений через отсортированную перестановку"""
+
+    def __init__(self, codes: np.ndarray, uniques: np.ndarray) -> None:
+        self.uniques = uniques
+        self._rows = np.argsort(codes, kind="stable")
+        self._starts = np.searchsorted(codes[self._rows], np.arange(len(uniques) + 1), side="left")
+
+        postings: dict[str, list[int]] = {}
+        for code, value in enumerate(uniques):
+            for ngram in get_ngrams(value):
+                postings.setdefault(ngram, []).append(code)
+        self._postings = {ngram: np.array(value_codes, dtype=np.int64) for ngram, value_codes in postings.items()}
+        logger.info("Построен индекс: %s значений, %s триграмм", len(uniques), len(postings))
+
+    def get_candidates(self, keyword: str) -> np.ndarray:
+        """Возвращает коды значений, в которых есть все триграммы запроса.
+        Для запросов короче триграммы кандидаты — все значения"""
+        ngrams = get_ngrams(keyword)
+        if not ngrams:
+            return np.arange(len(self.uniques))
+
+        postings = sorted((self._postings.get(ngram, np.arange(0)) for ngram in ngrams), key=len)
+        candidates = postings[0]
+        for value_codes in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, value_codes, assume_unique=True)
+        return candidates
+
+    def get_rows(self, value_codes: Iterable[int]) -> np.ndarray:
+        """Возвращает номера строк dataframe со значениями по кодам"""
+        starts = self._starts
+        return np.concatenate([np.arange(0)] + [self._rows[starts[code] : starts[code + 1]] for code in value_codes])
+
+    def search(self, pattern: re.Pattern, keyword: str | None = None) -> np.ndarray:
+        """Возвращает номера строк, значения которых подходят под регулярное выражение.
+        Если передан запрос без спецсимволов, выражение проверяется только на кандидатах по триграммам"""
+        candidates = np.arange(len(self.uniques)) if keyword is None else self.get_candidates(keyword)
+        uniques = self.uniques
+        return self.get_rows(code for code in candidates.tolist() if pattern.search(uniques[code]))
+
+
+class SearchIndex:
+    """Индексы по триграммам для колонок хранилища. Индекс колонки строится при первом поиске по ней"""
+
+    def __init__(self, get_codes: Callable[[str], tuple[np.ndarray, np.ndarray]]) -> None:
+        self._get_codes = get_codes
+        self._indexes: dict[str, TrigramIndex] = {}
+        self._lock = threading.Lock()
+
+    def get_index(self, key: str) -> TrigramIndex:
+        """Возвращает индекс колонки, индекс строится один раз"""
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = TrigramIndex(*self._get_codes(key))
+                    self._indexes[key] = index
+        return index
+
+    def search(self, keyword: str, search_keys: Iterable[str], esc_symbols: bool = True) -> np.ndarray:
+        """Получает запрос и колонки поиска, возвращает отсортированные номера строк, в которых запрос
+        найден хотя бы в одной колонке без учета регистра. Запрос без экранирования считается
+        регулярным выражением и проверяется на всех значениях колонки"""
+        pattern = re.compile(re.escape(keyword) if esc_symbols else keyword, re.IGNORECASE)
+        rows = [self.get_index(key).search(pattern, keyword if esc_symbols else None) for key in search_keys]
+        result = np.sort(np.concatenate([np.arange(0)] + rows))
+        if len(result) > 1:
+            result = result[np.concatenate([[True], result[1:] != result[:-1]])]
+        logger.info("Найдено %s строк по запросу", len(result))
+        return result
@@ -1,95 +1,161 @@
-import json
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Sequence, TextIO
 
 from dateutil.relativedelta import relativedelta
+from pandas import DataFrame
 
 from src import loggers
-from src.config import CATEGORY_KEY, DESCRIPTION_KEY
-from src.services_utils import get_cashback_categories, get_invest_amount, get_search_by_keyword
-from src.transaction_utils import (get_transactions_by_date_period, get_transactions_for_categories,
-                                   top_transactions_by_amount)
+from src.config import CATEGORY_KEY, DESCRIPTION_KEY, INVEST_LIMITS, PERSON_TAG_KEY, PHONE_TAG_KEY, TRANSFERS_CATEGORY
+from src.json_utils import to_json, write_json
+from src.services_utils import (
+    get_cashback_categories,
+    get_invest_amount,
+    get_invest_table,
+    get_search_by_keyword,
+    get_tagged_transactions,
+)
+from src.tagging import PERSON_PATTERN, PHONE_PATTERN
+from src.transaction_store import TransactionStore
+from src.transaction_utils import (
+    get_transactions_by_date_period,
+    get_transactions_for_categories,
+    top_transactions_by_amount,
+)
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
 
-def get_beneficial_categories(data: list[dict[str, Any]], year: str, month: str, percent_cashback: float = 5.0) -> str:
+def dump_transactions(data: list[dict[str, Any]], pretty: bool = True, file: TextIO | None = None) -> str:
+    """Возвращает JSON со списком найденных транзакций, компактный при pretty=False.
+    Если передан файл, список пишется в него по одной транзакции и возвращается пустая строка.
+    Ошибка при записи в файл пробрасывается: часть списка уже записана и пустой JSON к ней не дописывается"""
+    if file is not None:
+        try:
+            write_json(data, file, pretty)
+        except Exception as e:
+            logger.error("Ошибка: %s", e)
+            raise
+        logger.info("Найдены транзакции")
+        return ""
+
+    try:
+        result = to_json(data, pretty)
+        logger.info("Найдены транзакции")
+    except Exception as e:
+        logger.error("Ошибка: %s", e)
+        result = to_json({}, pretty)
+
+    return result
+
+
+def get_beneficial_categories(
+    data: list[dict[str, Any]] | TransactionStore,
+    year: str,
+    month: str,
+    percent_cashback: float = 5.0,
+    pretty: bool = True,
+) -> str:
     """На вход функции поступают данные для анализа, год и месяц. На выходе — JSON с анализом,
     сколько на каждой категории можно заработать кешбэка в указанном месяце года."""
     start_date = datetime(int(year), int(month), 1)
     end_date = start_date + relativedelta(months=1) - timedelta(days=1)
 
-    filtered_data = get_transactions_by_date_period(data, start_date, end_date)
+    filtered_data = (
+        data.get_by_date_period(start_date, end_date)
+        if isinstance(data, TransactionStore)
+        else get_transactions_by_date_period(data, start_date, end_date)
+    )
     cashback_data = get_cashback_categories(filtered_data, percent_cashback)
 
     try:
-        result = json.dumps(cashback_data, indent=4, ensure_ascii=False)
+        result = to_json(cashback_data, pretty)
         logger.info("Получен json с категориями кэшбека")
     except Exception as e:
-        logger.error(f"Ошибка: {e}")
-        result = json.dumps({}, indent=4, ensure_ascii=False)
+        logger.error("Ошибка: %s", e)
+        result = to_json({}, pretty)
 
     return result
 
 
-def investment_bank(month: str, transactions: list[dict[str, Any]], limit: int) -> float:
+def investment_bank(month: str, transactions: list[dict[str, Any]] | TransactionStore, limit: int) -> float:
     """На вход функции поступают месяц и список транзакций. На выходе возможная сумма в инвесткопилку"""
     start_date = datetime.strptime(f"{month}-01", "%Y-%m-%d")
     end_date = start_date + relativedelta(months=1) - timedelta(days=1)
 
-    filtered_data = get_transactions_by_date_period(transactions, start_date, end_date)
+    filtered_data = get_transactions_by_date_period(transactions, start_date, end_date, typed=True)
     filtered_data = top_transactions_by_amount(filtered_data, except_categories={"Переводы"})
     logger.info("Получена сумма для инвесткопилки")
     return get_invest_amount(filtered_data, limit)
 
 
-def simple_search(transactions: list[dict[str, Any]], keyword: str) -> str:
-    """На вход функции поступает список транзакция и ключевое слова.
-    На выходе JSON-ответ со всеми транзакциями, содержащими запрос в описании или категории."""
-    data = get_search_by_keyword(transactions, keyword, {CATEGORY_KEY, DESCRIPTION_KEY})
-
+def investment_bank_table(
+    start_month: str,
+    end_month: str,
+    transactions: list[dict[str, Any]] | TransactionStore,
+    limits: Sequence[float] = INVEST_LIMITS,
+    reconcile: bool = False,
+    pretty: bool = True,
+) -> str:
+    """На вход функции поступают первый и последний месяц и транзакции. На выходе — JSON с возможной
+    суммой в инвесткопилку для каждого месяца и каждого лимита округления.
+    С признаком reconcile добавляется округление, которое банк уже отправил в инвесткопилку"""
     try:
-        result = json.dumps(data, indent=4, ensure_ascii=False)
-        logger.info("Найдены транзакции")
+        store = (
+            transactions if isinstance(transactions, TransactionStore) else TransactionStore(DataFrame(transactions))
+        )
+        table = get_invest_table(store, start_month, end_month, limits, reconcile)
+        table.columns = table.columns.map(str)
+        result = to_json(table.to_dict("index"), pretty)
+        logger.info("Получена таблица для инвесткопилки")
     except Exception as e:
-        logger.error(f"Ошибка: {e}")
-        result = json.dumps({}, indent=4, ensure_ascii=False)
+        logger.error("Ошибка: %s", e)
+        result = to_json({}, pretty)
 
     return result
 
 
-def search_by_phone(transactions: list[dict[str, Any]]) -> str:
-    """Функция возвращает JSON со всеми транзакциями, содержащими в описании мобильные номера."""
-    keyword = r"\+7\s\d{3}\s\d{3}\-\d{2}\-\d{2}"
-    data = get_search_by_keyword(transactions, keyword, {DESCRIPTION_KEY}, esc_symbols=False)
+def simple_search(
+    transactions: list[dict[str, Any]] | TransactionStore,
+    keyword: str,
+    pretty: bool = True,
+    file: TextIO | None = None,
+) -> str:
+    """На вход функции поступает список транзакция и ключевое слова.
+    На выходе JSON-ответ со всеми транзакциями, содержащими запрос в описании или категории.
+    По хранилищу поиск идет через индекс триграмм"""
+    data = get_search_by_keyword(transactions, keyword, {CATEGORY_KEY, DESCRIPTION_KEY})
 
-    try:
-        result = json.dumps(data, indent=4, ensure_ascii=False)
-        logger.info("Найдены транзакции")
-    except Exception as e:
-        logger.error(f"Ошибка: {e}")
-        result = json.dumps({}, indent=4, ensure_ascii=False)
+    return dump_transactions(data, pretty, file)
 
-    return result
 
+def search_by_phone(
+    transactions: list[dict[str, Any]] | TransactionStore, pretty: bool = True, file: TextIO | None = None
+) -> str:
+    """Функция возвращает JSON со всеми транзакциями, содержащими в описании мобильные номера.
+    В хранилище номера найдены заранее в колонке тега Телефон."""
+    if isinstance(transactions, TransactionStore):
+        data = get_tagged_transactions(transactions, PHONE_TAG_KEY)
+    else:
+        data = get_search_by_keyword(transactions, PHONE_PATTERN, {DESCRIPTION_KEY}, esc_symbols=False)
+
+    return dump_transactions(data, pretty, file)
 
-def search_person_transfer(transactions: list[dict[str, Any]]) -> str:
+
+def search_person_transfer(
+    transactions: list[dict[str, Any]] | TransactionStore, pretty: bool = True, file: TextIO | None = None
+) -> str:
     """Функция возвращает JSON со всеми транзакциями, которые относятся к переводам физлицам.
     Категория такой транзакции — Переводы, а в описании есть имя и первая буква фамилии с точкой.
+    В хранилище имена найдены заранее в колонке тега Получатель.
     """
-    keyword = r"[А-ЯЁ][а-яё]+ [А-ЯЁ]\."
-    cat_data = get_transactions_for_categories(transactions, {"Переводы"})
-    data = get_search_by_keyword(cat_data, keyword, {DESCRIPTION_KEY}, esc_symbols=False)
-
-    try:
-        result = json.dumps(data, indent=4, ensure_ascii=False)
-        logger.info("Найдены транзакции")
-    except Exception as e:
-        logger.error(f"Ошибка: {e}")
-        result = json.dumps({}, indent=4, ensure_ascii=False)
+    if isinstance(transactions, TransactionStore):
+        data = get_tagged_transactions(transactions, PERSON_TAG_KEY, {TRANSFERS_CATEGORY})
+    else:
+        cat_data = get_transactions_for_categories(transactions, {TRANSFERS_CATEGORY})
+        data = get_search_by_keyword(cat_data, PERSON_PATTERN, {DESCRIPTION_KEY}, esc_symbols=False)
 
-    return result
+    return dump_transactions(data, pretty, file)
@@ -1,49 +1,182 @@
 import logging
 import os
 import re
-from typing import Any
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
 
 from src import loggers
-from src.config import AMOUNT_ROUND_UP_KEY
-from src.utils import get_amount_for_categories
+from src.config import (
+    AMOUNT_KEY,
+    AMOUNT_ROUND_UP_KEY,
+    CATEGORY_KEY,
+    INVEST_LIMITS,
+    INVEST_ROUND_KEY,
+    TRANSFERS_CATEGORY,
+)
+from src.store_utils import get_operations_mask, get_store_amount_for_categories
+from src.transaction import Transaction, iter_fields
+from src.transaction_store import TransactionStore
+from src.utils import CATEGORY_FIELDS, get_amount_for_category_fields
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
+MONTH = np.timedelta64(1, "M")
+DAY = np.timedelta64(1, "D")
+
+
+def get_cashback_categories(
+    data: Iterable[dict[str, Any] | Transaction] | TransactionStore, percent_cashback: float
+) -> dict[str, Any]:
+    """Получает на вход список транзакций или хранилище, возвращает возможный кэшбек по категориям.
+    Для хранилища кэшбек считается по кодам категорий"""
+    if isinstance(data, TransactionStore):
+        amounts = np.trunc(data.get_values(AMOUNT_ROUND_UP_KEY) * percent_cashback / 100)
+        logger.info("Получены словари кэшбека по категориям из хранилища")
+        return get_store_amount_for_categories(data, except_categories={"Переводы"}, amounts=amounts)
 
-def get_cashback_categories(data: list[dict[str, Any]], percent_cashback: float) -> dict[str, Any]:
-    """Получает на вход список транзакций возвращает возможный кэшбек по категориям"""
-    data_cashback = [
-        {
-            **tx,
-            AMOUNT_ROUND_UP_KEY: int(tx.get(AMOUNT_ROUND_UP_KEY, 0.0) * percent_cashback / 100),
-        }
-        for tx in data
-    ]
+    fields = (
+        (category, float(int(amount_round_up * percent_cashback / 100)), amount, tx_status)
+        for category, amount_round_up, amount, tx_status in iter_fields(data, CATEGORY_FIELDS)
+    )
 
-    result = get_amount_for_categories(data_cashback, except_categories={"Переводы"})
+    result = get_amount_for_category_fields(fields, except_categories={"Переводы"})
     logger.info("Получены словари кэшбека по категориям")
     return result
 
 
-def get_invest_amount(data: list[dict[str, Any]], limit: int) -> float:
+def get_invest_diffs(values: np.ndarray, limits: Sequence[float]) -> np.ndarray:
+    """Получает на вход суммы операций и лимиты округления. Возвращает таблицу операций на лимиты
+    с разницами после округления вверх до лимита, для всех лимитов за один проход"""
+    steps = np.asarray(limits, dtype=float)
+    if (steps <= 0).any():
+        raise ValueError("Лимит округления должен быть больше нуля")
+    amounts = values[:, None]
+    result: np.ndarray = np.where(amounts % steps != 0, (amounts // steps + 1) * steps - amounts, 0.0)
+    return result
+
+
+def get_invest_amounts(values: np.ndarray, groups: np.ndarray, size: int, limits: Sequence[float]) -> np.ndarray:
+    """Получает на вход суммы операций, номера групп (например, месяцев), кол-во групп и лимиты округления.
+    Возвращает таблицу групп на лимиты с суммами разниц после округления, суммы складываются одним bincount"""
+    diffs = get_invest_diffs(values, limits)
+    cells = groups[:, None] * len(limits) + np.arange(len(limits))
+    result: np.ndarray = np.bincount(cells.ravel(), weights=diffs.ravel(), minlength=size * len(limits))
+    return result.reshape(size, len(limits))
+
+
+def get_invest_amount(data: Iterable[dict[str, Any] | Transaction], limit: int) -> float:
     """Получает на вход список транзакций и лимит округления, возвращает сумму"""
-    lst = [
-        (tx.get(AMOUNT_ROUND_UP_KEY, 0) // limit + 1) * limit - tx.get(AMOUNT_ROUND_UP_KEY, 0)
-        for tx in data
-        if tx.get(AMOUNT_ROUND_UP_KEY, 0) % limit != 0
-    ]
+    values = np.array([amount for amount, in iter_fields(data, (AMOUNT_ROUND_UP_KEY,))], dtype=float)
+    result = sum(get_invest_diffs(values, [limit])[:, 0].tolist())
     logger.info("Получена сумма разниц после округления")
-    return float(sum(lst))
+    return float(result)
+
+
+def get_invest_table(
+    store: TransactionStore,
+    start_month: str,
+    end_month: str,
+    limits: Sequence[float] = INVEST_LIMITS,
+    reconcile: bool = False,
+) -> DataFrame:
+    """Получает на вход хранилище, первый и последний месяц в формате YYYY-MM и лимиты округления.
+    Возвращает таблицу месяцев на лимиты с возможными суммами в инвесткопилку. Месяц берется так же,
+    как в investment_bank: с первого дня до начала последнего дня месяца, без переводов.
+    С признаком reconcile округляются суммы до округления банка, а в колонке bank — округление банка"""
+    first = np.datetime64(start_month, "M")
+    last = np.datetime64(end_month, "M")
+    if first > last:
+        first, last = last, first
+    size = int((last - first).astype(int)) + 1
+    end_date = (last + MONTH).astype("datetime64[D]") - DAY
+
+    rows = store.get_rows_by_date_period(pd.Timestamp(first).to_pydatetime(), pd.Timestamp(end_date).to_pydatetime())
+    dates = store.dates[rows]
+    months = dates.astype("datetime64[M]")
+    mask = get_operations_mask(store, store.get_values(AMOUNT_KEY), except_categories={TRANSFERS_CATEGORY})[rows]
+    mask &= dates <= ((months + MONTH).astype("datetime64[D]") - DAY).astype(dates.dtype)
+
+    groups = (months - first).astype(np.int64)[mask]
+    values = store.get_values(AMOUNT_ROUND_UP_KEY)[rows][mask]
+    bank = store.get_values(INVEST_ROUND_KEY)[rows][mask]
+    table = get_invest_amounts(values - bank if reconcile else values, groups, size, limits)
+
+    result = DataFrame(
+        table.round(2),
+        index=pd.Index(np.datetime_as_string(first + np.arange(size)), name="month"),
+        columns=list(limits),
+    )
+    if reconcile:
+        result["bank"] = np.bincount(groups, weights=bank, minlength=size).round(2)
+    logger.info("Получена таблица инвесткопилки за %s месяцев по %s лимитам", size, len(limits))
+    return result
+
+
+def get_search_mask(
+    data: TransactionStore | DataFrame, keyword: str, search_keys: Iterable[str], esc_symbols: bool = True
+) -> np.ndarray:
+    """Получает на вход хранилище или dataframe, запрос и колонки поиска. Возвращает маску строк,
+    в которых запрос найден хотя бы в одной колонке без учета регистра. Запрос проверяется через
+    str.contains по словарю значений колонки, маска строк собирается по кодам значений"""
+    pattern = re.escape(keyword) if esc_symbols else keyword
+    mask = np.zeros(len(data), dtype=bool)
+    for key in search_keys:
+        if isinstance(data, TransactionStore):
+            codes, uniques = data.get_codes(key)
+        elif key in data.columns:
+            codes, uniques = pd.factorize(data[key].to_numpy(dtype=object), use_na_sentinel=False)
+        else:
+            continue
+        matched = pd.Series(uniques, dtype=object).str.contains(pattern, flags=re.IGNORECASE, regex=True, na=False)
+        mask |= matched.to_numpy(dtype=bool)[codes]
+    logger.info("Получена маска строк по запросу")
+    return mask
 
 
 def get_search_by_keyword(
-    data: list[dict[str, Any]], keyword: str, search_keys: set, esc_symbols: bool = True
+    data: list[dict[str, Any]] | TransactionStore | DataFrame, keyword: str, search_keys: set, esc_symbols: bool = True
 ) -> list[dict[str, Any]]:
-    """Получает на вход список транзакций, запрос и множество ключей поиска, возвращает список транзакций"""
+    """Получает на вход список транзакций, запрос и множество ключей поиска, возвращает список транзакций.
+    В хранилище запрос ищется по индексу триграмм, регулярное выражение проверяется только на кандидатах.
+    Регулярные выражения в хранилище и запросы по dataframe ищутся маской через str.contains"""
+    if isinstance(data, TransactionStore):
+        records = data.records
+        if esc_symbols:
+            rows = data.search_index.search(keyword, search_keys)
+        else:
+            rows = np.flatnonzero(get_search_mask(data, keyword, search_keys, esc_symbols))
+        result = [records[row] for row in rows.tolist()]
+        logger.info("Получен список транзакций по запросу из хранилища")
+        return result
+    if isinstance(data, DataFrame):
+        found: list[dict] = data.loc[get_search_mask(data, keyword, search_keys, esc_symbols)].to_dict("records")
+        logger.info("Получен список транзакций по запросу из dataframe")
+        return found
+
     key = re.escape(keyword) if esc_symbols else keyword
     pattern = re.compile(key, re.IGNORECASE)
     result = [tx for tx in data if any(pattern.search(tx[key]) for key in search_keys)]
     logger.info("Получен список транзакций по запросу")
     return result
+
+
+def get_tagged_transactions(
+    store: TransactionStore, key: str, categories: set[str] | None = None
+) -> list[dict[str, Any]]:
+    """Получает на вход хранилище, колонку тега и необязательное множество категорий.
+    Возвращает список транзакций с непустым тегом. Строки с тегом найдены заранее,
+    поэтому фильтр по категориям проверяет только их"""
+    rows = store.get_tagged_rows(key)
+    if categories is not None:
+        codes, uniques = store.get_codes(CATEGORY_KEY)
+        rows = rows[np.isin(uniques, list(categories))[codes[rows]]]
+
+    records = store.records
+    result = [records[row] for row in rows.tolist()]
+    logger.info("Получен список транзакций по тегу %s", key)
+    return result
@@ -0,0 +1,183 @@
+import logging
+import os
+from typing import Any
+
+import numpy as np
+
+from src import loggers
+from src.config import AMOUNT_KEY, AMOUNT_ROUND_UP_KEY, CARD_NUMBER_KEY, CASHBACK_KEY, CATEGORY_KEY, STATUS_KEY
+from src.transaction_store import RollupPeriod, TransactionStore, remap_codes
+from src.utils import get_last_digits_card_number, get_top_amounts
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+
+def get_groups_in_order(codes: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Возвращает коды групп, встречающихся в строках по маске, в порядке первого появления"""
+    groups, first = np.unique(codes[mask], return_index=True)
+    return groups[np.argsort(first, kind="stable")]
+
+
+def get_group_sums(codes: np.ndarray, size: int, weights: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Суммирует значения строк по маске по кодам групп. Строки складываются по порядку, как в цикле.
+    Для свода складываются суммы ячеек, поэтому результат может отличаться от построчного в последних знаках"""
+    return np.bincount(codes[mask], weights=weights[mask], minlength=size)
+
+
+def get_operations_mask(
+    store: TransactionStore | RollupPeriod,
+    amounts: np.ndarray,
+    expense: bool = True,
+    status: str = "OK",
+    except_categories: set[str] | None = None,
+) -> np.ndarray:
+    """Возвращает маску строк (или ячеек свода) с ненулевыми суммами, расходов или доходов,
+    с нужным статусом и без исключенных категорий. Статусы и категории сравниваются по кодам"""
+    amount = store.get_values(AMOUNT_KEY)
+    status_codes, statuses = store.get_codes(STATUS_KEY)
+    category_codes, categories = store.get_codes(CATEGORY_KEY)
+
+    mask: np.ndarray = (amounts != 0) & ((amount < 0) if expense else (amount > 0))
+    mask &= (statuses == status)[status_codes]
+    if except_categories:
+        mask &= ~np.isin(categories, list(except_categories))[category_codes]
+    return mask
+
+
+def get_store_total_amount(
+    store: TransactionStore | RollupPeriod,
+    expense: bool = True,
+    status: str = "OK",
+) -> float:
+    """То же, что get_total_amount, но для хранилища или свода за период"""
+    amounts = store.get_values(AMOUNT_ROUND_UP_KEY)
+    mask = get_operations_mask(store, amounts, expense, status)
+    result = float(amounts[mask].sum())
+    logger.info("Получена общая сумма %s из хранилища", "расходов" if expense else "доходов")
+    return result
+
+
+def get_store_amount_for_categories(
+    store: TransactionStore | RollupPeriod,
+    expense: bool = True,
+    status: str = "OK",
+    num_top_cats: int = 0,
+    except_categories: set[str] | None = None,
+    amounts: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """То же, что get_amount_for_categories, но для хранилища: суммы по категориям считаются
+    по кодам категорий через np.bincount. Вместо сумм с округлением можно передать свои суммы"""
+    if amounts is None:
+        amounts = store.get_values(AMOUNT_ROUND_UP_KEY)
+    codes, categories = store.get_codes(CATEGORY_KEY)
+
+    mask = get_operations_mask(store, amounts, expense, status, except_categories)
+    mask &= (categories != "")[codes]
+
+    sums = get_group_sums(codes, len(categories), amounts, mask)
+    operations = {str(categories[code]): float(sums[code]) for code in get_groups_in_order(codes, mask)}
+
+    result = get_top_amounts(operations, num_top_cats)
+    logger.info(
+        "Получен топ%s %s по категориям из хранилища",
+        f"-{num_top_cats}" if num_top_cats != 0 else "",
+        "расходов" if expense else "доходов",
+    )
+    return result
+
+
+def get_store_total_amount_for_card(
+    store: TransactionStore | RollupPeriod,
+    expense: bool = True,
+    status: str = "OK",
+    except_categories: set[str] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """То же, что get_total_amount_for_card, но для хранилища: суммы и кэшбэк считаются
+    по кодам последних цифр номера карты через np.bincount"""
+    amounts = store.get_values(AMOUNT_ROUND_UP_KEY)
+    card_codes, cards = store.get_codes(CARD_NUMBER_KEY)
+    codes, last_digits = remap_codes(card_codes, [get_last_digits_card_number(card) for card in cards])
+
+    mask = get_operations_mask(store, amounts, expense, status, except_categories)
+    mask &= (cards != "")[card_codes]
+
+    sums = get_group_sums(codes, len(last_digits), amounts, mask)
+    cashback = get_group_sums(codes, len(last_digits), store.get_values(CASHBACK_KEY), mask)
+    result = {
+        str(last_digits[code]): {"sum": float(sums[code]), "cashback": float(cashback[code])}
+        for code in get_groups_in_order(codes, mask)
+    }
+    logger.info("Получен словарь с номерами карт и суммами из хранилища")
+    return result
+
+
+def get_smallest_rows(values: np.ndarray, num: int = 0) -> np.ndarray:
+    """Возвращает позиции num наименьших значений по возрастанию, равные значения — по порядку позиций,
+    как при устойчивой сортировке. Граница топа ищется через np.argpartition за O(n), сортируются
+    только значения не больше границы. При num=0 сортируются все значения"""
+    if num <= 0 or num >= len(values):
+        return np.argsort(values, kind="stable")[: num or None]
+    kth = values[np.argpartition(values, num - 1)[num - 1]]
+    candidates: np.ndarray = np.flatnonzero(values <= kth)
+    return candidates[np.argsort(values[candidates], kind="stable")[:num]]
+
+
+def get_store_top_rows(
+    store: TransactionStore,
+    expense: bool = True,
+    status: str = "OK",
+    num_top_cats: int = 0,
+    except_categories: set[str] | None = None,
+) -> np.ndarray:
+    """То же, что top_transactions_by_amount, но для хранилища: возвращает номера строк топа
+    по суммам операций без построения списка транзакций"""
+    amount = store.get_values(AMOUNT_KEY)
+    rows = np.flatnonzero(get_operations_mask(store, amount, expense, status, except_categories))
+    values = amount[rows] if expense else -amount[rows]
+    result: np.ndarray = rows[get_smallest_rows(values, num_top_cats)]
+    logger.info(
+        "Получены строки топ%s %s из хранилища",
+        f"-{num_top_cats}" if num_top_cats != 0 else "",
+        "расходов" if expense else "доходов",
+    )
+    return result
+
+
+def get_store_top_rows_by_group(
+    store: TransactionStore,
+    key: str = CATEGORY_KEY,
+    expense: bool = True,
+    status: str = "OK",
+    num_top_cats: int = 5,
+    except_categories: set[str] | None = None,
+) -> dict[str, np.ndarray]:
+    """Возвращает для каждого значения колонки (категории, номера карты) номера строк топа по суммам
+    за один проход: строки раскладываются по группам устойчивой (поразрядной для int16) сортировкой кодов,
+    топ группы ищется через get_smallest_rows.
+    Группы идут в порядке первого появления, пустые значения пропускаются, при num_top_cats=0 берутся все строки"""
+    amount = store.get_values(AMOUNT_KEY)
+    codes, uniques = store.get_codes(key)
+    mask = get_operations_mask(store, amount, expense, status, except_categories)
+    mask &= (uniques != "")[codes]
+
+    rows = np.flatnonzero(mask)
+    values = amount[rows] if expense else -amount[rows]
+    row_codes = codes[rows]
+    if len(uniques) <= np.iinfo(np.int16).max:
+        row_codes = row_codes.astype(np.int16)
+    order = np.argsort(row_codes, kind="stable")
+    sorted_codes = row_codes[order]
+    starts = np.flatnonzero(np.diff(sorted_codes, prepend=-1))
+    ends = np.append(starts[1:], len(order))
+
+    result = {}
+    for start, end in sorted(zip(starts.tolist(), ends.tolist()), key=lambda x: int(order[x[0]])):
+        group_order = order[start:end]
+        top = rows[group_order[get_smallest_rows(values[group_order], num_top_cats)]]
+        result[str(uniques[sorted_codes[start]])] = top
+    logger.info(
+        "Получены строки топ-%s %s по колонке %s из хранилища", num_top_cats, "расходов" if expense else "доходов", key
+    )
+    return result
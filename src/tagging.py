@@ -0,0 +1,54 @@
+import logging
+import os
+import re
+from typing import Iterable
+
+from src import loggers
+from src.config import MERCHANT_TAG_KEY, PERSON_TAG_KEY, PHONE_TAG_KEY
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+PHONE_PATTERN = r"\+7\s\d{3}\s\d{3}\-\d{2}\-\d{2}"
+PERSON_PATTERN = r"[А-ЯЁ][а-яё]+ [А-ЯЁ]\."
+
+_phone_regex = re.compile(PHONE_PATTERN, re.IGNORECASE)
+_person_regex = re.compile(PERSON_PATTERN, re.IGNORECASE)
+
+
+def get_phone(description: str) -> str:
+    """Возвращает первый мобильный номер из описания операции или пустую строку"""
+    match = _phone_regex.search(description)
+    return match.group() if match else ""
+
+
+def get_person(description: str) -> str:
+    """Возвращает первое имя с первой буквой фамилии (Иван С.) из описания операции или пустую строку"""
+    match = _person_regex.search(description)
+    return match.group() if match else ""
+
+
+def get_merchant(description: str, phone: str, person: str) -> str:
+    """Возвращает описание операции как продавца, если в описании не найдены ни номер, ни имя получателя"""
+    if not description or phone or person:
+        return ""
+    return description
+
+
+# Колонки тегов, которые получаются из описания операции
+TAG_KEYS = (PHONE_TAG_KEY, PERSON_TAG_KEY, MERCHANT_TAG_KEY)
+
+
+def get_tags(descriptions: Iterable[str]) -> dict[str, list[str]]:
+    """Возвращает теги всех колонок тегов для каждого описания. Номер и имя ищутся в описании один раз,
+    продавец получается из уже найденных номера и имени"""
+    phones, persons, merchants = [], [], []
+    for description in descriptions:
+        phone = get_phone(description)
+        person = get_person(description)
+        phones.append(phone)
+        persons.append(person)
+        merchants.append(get_merchant(description, phone, person))
+    logger.debug("Получены теги для %s описаний", len(phones))
+    return {PHONE_TAG_KEY: phones, PERSON_TAG_KEY: persons, MERCHANT_TAG_KEY: merchants}
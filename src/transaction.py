@@ -0,0 +1,254 @@
+import itertools
+import logging
+import operator
+import os
+import sys
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src import loggers
+from src.config import (
+    AMOUNT_KEY,
+    AMOUNT_ROUND_UP_KEY,
+    BANK_CASHBACK_KEY,
+    CARD_NUMBER_KEY,
+    CASHBACK_KEY,
+    CATEGORY_KEY,
+    CURRENCY_KEY,
+    DATE_TRANSACTIONS_KEY,
+    DESCRIPTION_KEY,
+    INVEST_ROUND_KEY,
+    MCC_KEY,
+    PAYMENT_AMOUNT_KEY,
+    PAYMENT_CURRENCY_KEY,
+    PAYMENT_DATE_KEY,
+    STATUS_KEY,
+)
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+# Колонка выгрузки банка и атрибут транзакции
+FIELDS = {
+    DATE_TRANSACTIONS_KEY: "date",
+    PAYMENT_DATE_KEY: "payment_date",
+    CARD_NUMBER_KEY: "card_number",
+    STATUS_KEY: "status",
+    AMOUNT_KEY: "amount",
+    CURRENCY_KEY: "currency",
+    PAYMENT_AMOUNT_KEY: "payment_amount",
+    PAYMENT_CURRENCY_KEY: "payment_currency",
+    BANK_CASHBACK_KEY: "bank_cashback",
+    CATEGORY_KEY: "category",
+    MCC_KEY: "mcc",
+    DESCRIPTION_KEY: "description",
+    CASHBACK_KEY: "cashback",
+    INVEST_ROUND_KEY: "invest_round",
+    AMOUNT_ROUND_UP_KEY: "amount_round_up",
+}
+NUMERIC_FIELDS = frozenset(
+    {"amount", "payment_amount", "bank_cashback", "cashback", "invest_round", "amount_round_up"}
+)
+INTERNED_FIELDS = frozenset({"card_number", "status", "currency", "payment_currency", "category"})
+FIELDS_BATCH_SIZE = 4096
+
+
+def to_float(value: Any) -> float:
+    """Приводит значение ячейки к float, пустые и нечисловые значения становятся нулем"""
+    if type(value) is not float:
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return 0.0
+    return value if value == value else 0.0
+
+
+def to_str(value: Any) -> str:
+    """Приводит значение ячейки к строке, пустые значения становятся пустой строкой"""
+    if type(value) is str:
+        return value
+    if value is None or value != value:
+        return ""
+    return str(value)
+
+
+class Transaction:
+    """Транзакция с атрибутами вместо словаря. Суммы уже приведены к float, пустые суммы равны нулю,
+    номер карты, статус, валюты и категория интернированы. Метод get позволяет читать транзакцию
+    по названиям колонок выгрузки, как словарь"""
+
+    __slots__ = tuple(FIELDS.values())
+
+    def __init__(
+        self,
+        date: str = "",
+        payment_date: str = "",
+        card_number: str = "",
+        status: str = "",
+        amount: float = 0.0,
+        currency: str = "",
+        payment_amount: float = 0.0,
+        payment_currency: str = "",
+        bank_cashback: float = 0.0,
+        category: str = "",
+        mcc: Any = "",
+        description: str = "",
+        cashback: float = 0.0,
+        invest_round: float = 0.0,
+        amount_round_up: float = 0.0,
+    ) -> None:
+        self.date = date
+        self.payment_date = payment_date
+        self.card_number = card_number
+        self.status = status
+        self.amount = amount
+        self.currency = currency
+        self.payment_amount = payment_amount
+        self.payment_currency = payment_currency
+        self.bank_cashback = bank_cashback
+        self.category = category
+        self.mcc = mcc
+        self.description = description
+        self.cashback = cashback
+        self.invest_round = invest_round
+        self.amount_round_up = amount_round_up
+
+    @classmethod
+    def from_dict(cls, transaction: dict[str, Any]) -> "Transaction":
+        """Создает транзакцию из словаря с колонками выгрузки, приводя значения к нужным типам"""
+        get = transaction.get
+        intern = sys.intern
+        return cls(
+            to_str(get(DATE_TRANSACTIONS_KEY)),
+            to_str(get(PAYMENT_DATE_KEY)),
+            intern(to_str(get(CARD_NUMBER_KEY))),
+            intern(to_str(get(STATUS_KEY))),
+            to_float(get(AMOUNT_KEY)),
+            intern(to_str(get(CURRENCY_KEY))),
+            to_float(get(PAYMENT_AMOUNT_KEY)),
+            intern(to_str(get(PAYMENT_CURRENCY_KEY))),
+            to_float(get(BANK_CASHBACK_KEY)),
+            intern(to_str(get(CATEGORY_KEY))),
+            get(MCC_KEY, ""),
+            to_str(get(DESCRIPTION_KEY)),
+            to_float(get(CASHBACK_KEY)),
+            to_float(get(INVEST_ROUND_KEY)),
+            to_float(get(AMOUNT_ROUND_UP_KEY)),
+        )
+
+    @classmethod
+    def from_dataframe(cls, df: DataFrame) -> list["Transaction"]:
+        """Создает список транзакций из dataframe. Колонки приводятся к нужным типам целиком,
+        а не по ячейкам"""
+        size = len(df)
+        columns = []
+        for key, attr in FIELDS.items():
+            if key not in df.columns:
+                column: list[Any] = [0.0 if attr in NUMERIC_FIELDS else ""] * size
+            elif attr in NUMERIC_FIELDS:
+                column = pd.to_numeric(df[key], errors="coerce").fillna(0.0).astype(float).tolist()
+            elif attr == "mcc":
+                column = df[key].tolist()
+            elif attr in INTERNED_FIELDS:
+                column = [sys.intern(to_str(value)) for value in df[key].tolist()]
+            else:
+                column = [to_str(value) for value in df[key].tolist()]
+            columns.append(column)
+
+        result = [cls(*values) for values in zip(*columns)]
+        logger.info("Построен список транзакций из dataframe")
+        return result
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Возвращает значение по названию колонки выгрузки"""
+        attr = FIELDS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def __getitem__(self, key: str) -> Any:
+        attr = FIELDS.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Transaction(date={self.date!r}, amount={self.amount!r}, category={self.category!r})"
+
+    def replace(self, **changes: Any) -> "Transaction":
+        """Возвращает копию транзакции с измененными атрибутами"""
+        values = {attr: getattr(self, attr) for attr in self.__slots__}
+        values.update(changes)
+        return Transaction(**values)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Возвращает словарь с колонками выгрузки"""
+        return {key: getattr(self, attr) for key, attr in FIELDS.items()}
+
+
+def as_transactions(data: Iterable[dict[str, Any] | Transaction]) -> Iterator[Transaction]:
+    """Возвращает итератор транзакций. Словари приводятся к Transaction, готовые транзакции
+    возвращаются как есть"""
+    for tx in data:
+        yield tx if isinstance(tx, Transaction) else Transaction.from_dict(tx)
+
+
+def to_float_column(values: list[Any]) -> list[float]:
+    """Приводит значения колонки к float целиком, пустые и нечисловые значения становятся нулем.
+    Если колонку нельзя привести одним массивом (есть пустые строки или текст), значения приводятся по одному"""
+    try:
+        array = np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return [to_float(value) for value in values]
+    array[np.isnan(array)] = 0.0
+    result: list[float] = array.tolist()
+    return result
+
+
+def to_str_column(values: list[Any]) -> list[str]:
+    """Приводит значения колонки к строкам, пустые значения становятся пустой строкой.
+    Колонка только из строк возвращается как есть"""
+    if set(map(type, values)) <= {str}:
+        return values
+    return [to_str(value) for value in values]
+
+
+def get_column_converter(key: str) -> Callable[[list[Any]], list[Any]]:
+    """Возвращает функцию приведения значений колонки выгрузки к типу атрибута транзакции"""
+    attr = FIELDS[key]
+    if attr in NUMERIC_FIELDS:
+        return to_float_column
+    if attr == "mcc":
+        return lambda values: values
+    return to_str_column
+
+
+def read_column(batch: Sequence[dict[str, Any] | Transaction], key: str) -> list[Any]:
+    """Возвращает значения колонки выгрузки для пачки транзакций, отсутствующие значения — пустые строки"""
+    try:
+        return list(map(operator.itemgetter(key), batch))
+    except KeyError:
+        return [tx.get(key, "") for tx in batch]
+
+
+def iter_fields(data: Iterable[dict[str, Any] | Transaction], keys: Sequence[str]) -> Iterator[tuple[Any, ...]]:
+    """Возвращает итератор кортежей со значениями нужных колонок без построения Transaction для каждой строки.
+    Транзакции читаются пачками по колонкам, колонки словарей приводятся к типам атрибутов целиком"""
+    attr_getters = [operator.attrgetter(FIELDS[key]) for key in keys]
+    converters = [get_column_converter(key) for key in keys]
+
+    for batch in itertools.batched(data, FIELDS_BATCH_SIZE):
+        try:
+            columns = [list(map(get, batch)) for get in attr_getters]
+        except AttributeError:
+            columns = [convert(read_column(batch, key)) for key, convert in zip(keys, converters)]
+        yield from zip(*columns)
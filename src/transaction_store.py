@@ -0,0 +1,600 @@
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src import loggers
+from src.cache_utils import get_cache_path, load_appended_dfs, save_appended_df
+from src.config import (
+    AMOUNT_KEY,
+    AMOUNT_ROUND_UP_KEY,
+    CARD_NUMBER_KEY,
+    CASHBACK_KEY,
+    CATEGORY_KEY,
+    DATA_FOLDER_NAME,
+    DATE_FORMAT,
+    DATE_TRANSACTIONS_KEY,
+    DESCRIPTION_KEY,
+    FILE_OPERATIONS,
+    STATUS_KEY,
+    WEEKDAY_KEY,
+)
+from src.search_index import SearchIndex
+from src.tagging import TAG_KEYS, get_tags
+from src.transaction import Transaction, to_str
+from src.utils import read_df_from_excel
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+OPERATIONS_PATH = os.path.join(os.path.dirname(__file__), f"../{DATA_FOLDER_NAME}", FILE_OPERATIONS)
+CODED_KEYS = (CATEGORY_KEY, STATUS_KEY, CARD_NUMBER_KEY)
+ROLLUP_CODED_KEYS = (CATEGORY_KEY, CARD_NUMBER_KEY, STATUS_KEY)
+ROLLUP_VALUE_KEYS = (AMOUNT_KEY, AMOUNT_ROUND_UP_KEY, CASHBACK_KEY)
+NS_PER_DAY = 24 * 60 * 60 * 10**9
+
+# Дни, коды, суммы, кол-во операций и номера первых строк ячеек свода
+Cells = tuple[np.ndarray, dict[str, np.ndarray], dict[str, np.ndarray], np.ndarray, np.ndarray]
+
+
+def parse_dates(df: DataFrame) -> np.ndarray:
+    """Принимает dataframe, возвращает массив datetime64[ns] с датами операций.
+    Пустые и неверные даты становятся NaT"""
+    if DATE_TRANSACTIONS_KEY not in df.columns:
+        return np.full(len(df), np.datetime64("NaT", "ns"), dtype="datetime64[ns]")
+    dates = pd.to_datetime(df[DATE_TRANSACTIONS_KEY], format=DATE_FORMAT, errors="coerce")
+    return dates.to_numpy(dtype="datetime64[ns]")
+
+
+def get_weekdays(dates: np.ndarray) -> np.ndarray:
+    """Принимает массив datetime64[ns], возвращает номера дней недели int8 (понедельник — 0).
+    Для операций без даты возвращается -1"""
+    days = dates.astype("datetime64[ns]").view("int64") // NS_PER_DAY
+    weekdays = ((days + 3) % 7).astype(np.int8)
+    weekdays[np.isnat(dates)] = -1
+    return weekdays
+
+
+def sort_by_date(df: DataFrame, dates: np.ndarray) -> tuple[DataFrame, np.ndarray]:
+    """Сортирует dataframe и даты от новых операций к старым, операции без даты в конце.
+    Если dataframe уже отсортирован (как выгрузка банка), возвращает его без копирования"""
+    order = pd.Series(dates).sort_values(ascending=False, kind="stable", na_position="last").index.to_numpy()
+    if np.array_equal(order, np.arange(len(order))):
+        return df, dates
+    return df.iloc[order].reset_index(drop=True), dates[order]
+
+
+def remap_codes(codes: np.ndarray, values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Получает коды и новые значения для каждого кода. Совпадающие значения объединяются в один код,
+    порядок кодов — порядок первого появления значения"""
+    labels, uniques = pd.factorize(pd.Series(values, dtype=object), sort=False)
+    return labels.astype(np.int32)[codes], np.asarray(uniques, dtype=object)
+
+
+def encode_column(df: DataFrame, key: str) -> tuple[np.ndarray, np.ndarray]:
+    """Кодирует колонку dataframe целыми числами в порядке первого появления значения.
+    Возвращает массив кодов int32 и словарь строковых значений, пустые значения становятся пустой строкой"""
+    if key not in df.columns:
+        return np.zeros(len(df), dtype=np.int32), np.array([""], dtype=object)
+    codes, uniques = pd.factorize(df[key], sort=False, use_na_sentinel=False)
+    return remap_codes(codes, [to_str(value) for value in uniques])
+
+
+def get_column_strings(df: DataFrame, key: str) -> list[str]:
+    """Возвращает значения колонки dataframe строками, пустые значения становятся пустой строкой"""
+    if key not in df.columns:
+        return [""] * len(df)
+    return [to_str(value) for value in df[key].tolist()]
+
+
+def get_columns_strings(df: DataFrame, keys: list[str]) -> dict[str, list[str]]:
+    """Возвращает значения колонок dataframe строками. Колонки тегов получаются
+    из описаний операций за один поиск по описаниям для всех тегов"""
+    result = {key: get_column_strings(df, key) for key in keys if key not in TAG_KEYS}
+    tag_keys = [key for key in keys if key in TAG_KEYS]
+    if tag_keys:
+        tags = get_tags(get_column_strings(df, DESCRIPTION_KEY))
+        result.update({key: tags[key] for key in tag_keys})
+    return result
+
+
+def extend_codes(codes: np.ndarray, uniques: np.ndarray, values: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Кодирует новые значения по уже известному словарю значений и ставит коды перед старыми.
+    Новые значения добавляются в конец словаря, старые коды не меняются"""
+    series = pd.Series(values, dtype=object)
+    new_uniques = series[~series.isin(uniques)].unique()
+    uniques = np.concatenate([uniques, np.asarray(new_uniques, dtype=object)])
+    new_codes = pd.Index(uniques).get_indexer(series).astype(np.int32)
+    return np.concatenate([new_codes, codes]), uniques
+
+
+def get_numeric_column(df: DataFrame, key: str) -> np.ndarray:
+    """Возвращает колонку dataframe массивом float, пустые и нечисловые значения заменяются нулем"""
+    if key not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[key], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+
+def to_datetime64(date: datetime) -> np.datetime64:
+    """Переводит datetime в datetime64[ns], даты вне диапазона прижимаются к границам"""
+    if date <= pd.Timestamp.min:
+        return pd.Timestamp.min.to_datetime64()
+    if date >= pd.Timestamp.max:
+        return pd.Timestamp.max.to_datetime64()
+    return np.datetime64(date, "ns")
+
+
+class TransactionStore:
+    """Хранилище транзакций: один dataframe и представления над ним без повторной загрузки.
+    Даты операций разбираются один раз при создании, операции отсортированы от новых к старым.
+    Если даты переданы в конструктор, они должны быть уже отсортированы"""
+
+    def __init__(self, df: DataFrame, dates: np.ndarray | None = None) -> None:
+        if dates is None:
+            df, dates = sort_by_date(df, parse_dates(df))
+        self._df = df
+        self._dates = dates
+        self._records: list[dict] | None = None
+        self._transactions: list[Transaction] | None = None
+        self._codes: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._values: dict[str, np.ndarray] = {}
+        self._typed_df: DataFrame | None = None
+        self._date_keys: np.ndarray | None = None
+        self._rollup: DailyRollup | None = None
+        self._search_index: SearchIndex | None = None
+        self._tagged_rows: dict[str, np.ndarray] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_excel(cls, file_path: str) -> "TransactionStore":
+        """Создает хранилище из Excel-файла с операциями"""
+        return cls(read_df_from_excel(file_path))
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    @property
+    def df(self) -> DataFrame:
+        """Возвращает dataframe хранилища. Dataframe общий, изменять его нельзя"""
+        return self._df
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Возвращает массив datetime64[ns] с датами операций в порядке строк dataframe"""
+        return self._dates
+
+    @property
+    def date_keys(self) -> np.ndarray:
+        """Возвращает индекс для бинарного поиска по датам: возрастающий массив int64
+        с датами операций со знаком минус. Операции без даты в индекс не входят"""
+        date_keys = self._date_keys
+        if date_keys is None:
+            valid = len(self._dates) - int(np.isnat(self._dates).sum())
+            date_keys = -self._dates[:valid].view("int64")
+            self._date_keys = date_keys
+        return date_keys
+
+    @property
+    def typed_df(self) -> DataFrame:
+        """Возвращает dataframe, в котором колонка даты операции уже разобрана в datetime64[ns]
+        и добавлена колонка с номером дня недели int8. Остальные колонки общие с исходным dataframe"""
+        typed_df = self._typed_df
+        if typed_df is None:
+            with self._lock:
+                typed_df = self._typed_df
+                if typed_df is None:
+                    typed_df = self._df.copy(deep=False)
+                    typed_df[DATE_TRANSACTIONS_KEY] = self._dates
+                    typed_df[WEEKDAY_KEY] = get_weekdays(self._dates)
+                    self._typed_df = typed_df
+        return typed_df
+
+    @property
+    def records(self) -> list[dict]:
+        """Возвращает список словарей с транзакциями, список строится один раз и общий для всех"""
+        records = self._records
+        if records is None:
+            with self._lock:
+                records = self._records
+                if records is None:
+                    records = self._df.to_dict("records")
+                    self._records = records
+                    logger.info("Построен список словарей с транзакциями")
+        return records
+
+    @property
+    def transactions(self) -> list[Transaction]:
+        """Возвращает список Transaction в порядке строк dataframe, список строится один раз и общий для всех"""
+        transactions = self._transactions
+        if transactions is None:
+            with self._lock:
+                transactions = self._transactions
+                if transactions is None:
+                    transactions = Transaction.from_dataframe(self._df)
+                    self._transactions = transactions
+        return transactions
+
+    @property
+    def rollup(self) -> "DailyRollup":
+        """Возвращает свод операций по дням, свод строится один раз на хранилище"""
+        return self.build_rollup()
+
+    def build_rollup(self) -> "DailyRollup":
+        """Строит свод операций по дням, если он еще не построен, и возвращает его"""
+        rollup = self._rollup
+        if rollup is None:
+            with self._lock:
+                rollup = self._rollup
+                if rollup is None:
+                    rollup = DailyRollup.from_store(self)
+                    self._rollup = rollup
+        return rollup
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Возвращает индекс для поиска по колонкам, индекс общий для всех поисков по хранилищу"""
+        search_index = self._search_index
+        if search_index is None:
+            with self._lock:
+                search_index = self._search_index
+                if search_index is None:
+                    search_index = SearchIndex(self.get_codes)
+                    self._search_index = search_index
+        return search_index
+
+    def get_codes(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        """Возвращает колонку, закодированную целыми числами, и словарь значений.
+        Коды строятся один раз на хранилище, срезы получают их часть.
+        Колонки тегов (телефон, получатель, продавец) строятся вместе из словаря описаний операций"""
+        codes = self._codes.get(key)
+        if codes is None:
+            with self._lock:
+                codes = self._codes.get(key)
+                if codes is None:
+                    if key in TAG_KEYS:
+                        description_codes, descriptions = self.get_codes(DESCRIPTION_KEY)
+                        for tag_key, tags in get_tags(descriptions).items():
+                            self._codes.setdefault(tag_key, remap_codes(description_codes, tags))
+                        codes = self._codes[key]
+                    else:
+                        codes = encode_column(self._df, key)
+                        self._codes[key] = codes
+        return codes
+
+    def get_tagged_rows(self, key: str) -> np.ndarray:
+        """Возвращает номера строк с непустым значением колонки, например строк с найденным телефоном.
+        Номера строк находятся один раз на хранилище"""
+        rows = self._tagged_rows.get(key)
+        if rows is None:
+            codes, uniques = self.get_codes(key)
+            rows = np.flatnonzero((uniques != "")[codes])
+            self._tagged_rows[key] = rows
+        return rows
+
+    def get_values(self, key: str) -> np.ndarray:
+        """Возвращает числовую колонку массивом float, пустые и нечисловые значения заменяются нулем.
+        Массив строится один раз на хранилище, срезы получают его часть"""
+        values = self._values.get(key)
+        if values is None:
+            with self._lock:
+                values = self._values.get(key)
+                if values is None:
+                    values = get_numeric_column(self._df, key)
+                    self._values[key] = values
+        return values
+
+    def take(self, rows: slice | np.ndarray) -> "TransactionStore":
+        """Возвращает хранилище с частью строк: срезом или массивом номеров строк по возрастанию.
+        Уже построенные списки транзакций, коды и числовые колонки передаются в новое хранилище"""
+        store = TransactionStore(self._df.iloc[rows], self._dates[rows])
+        if self._transactions is not None:
+            transactions = self._transactions
+            store._transactions = (
+                transactions[rows] if isinstance(rows, slice) else [transactions[row] for row in rows]
+            )
+        store._codes = {key: (codes[rows], uniques) for key, (codes, uniques) in self._codes.items()}
+        store._values = {key: values[rows] for key, values in self._values.items()}
+        return store
+
+    def append(self, df: DataFrame) -> "TransactionStore":
+        """Возвращает хранилище с добавленными операциями. Если новые операции не старше последней
+        операции хранилища, они ставятся в начало, а даты, коды, числовые колонки, списки транзакций
+        и свод по дням дополняются только новыми строками. Иначе хранилище строится заново.
+        Пустые значения новых операций заменяются пустой строкой, как при чтении Excel-файла"""
+        with pd.option_context("future.no_silent_downcasting", True):
+            df = df.reset_index(drop=True).fillna(value="")
+        df, dates = sort_by_date(df, parse_dates(df))
+        keys = self.date_keys
+        if not len(df):
+            return self
+        if np.isnat(dates).any() or (len(keys) and -keys[0] > dates[-1].view("int64")):
+            logger.info("Новые операции старше последней операции хранилища, хранилище строится заново")
+            return TransactionStore(pd.concat([df, self._df], ignore_index=True))
+
+        store = TransactionStore(pd.concat([df, self._df], ignore_index=True), np.concatenate([dates, self._dates]))
+        store._date_keys = np.concatenate([-dates.view("int64"), keys])
+        new_strings = get_columns_strings(df, list(self._codes))
+        store._codes = {
+            key: extend_codes(codes, uniques, new_strings[key]) for key, (codes, uniques) in self._codes.items()
+        }
+        store._values = {
+            key: np.concatenate([get_numeric_column(df, key), values]) for key, values in self._values.items()
+        }
+        if self._records is not None:
+            store._records = df.to_dict("records") + self._records
+        if self._transactions is not None:
+            store._transactions = Transaction.from_dataframe(df) + self._transactions
+        if self._rollup is not None:
+            store._rollup = self._rollup.extend(store, len(df))
+        logger.info("В хранилище добавлено %s операций", len(df))
+        return store
+
+    def iter_records(self) -> Iterator[dict]:
+        """Возвращает итератор словарей с транзакциями без построения полного списка"""
+        columns = list(self._df.columns)
+        for values in self._df.itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+
+    def get_rows_by_date_period(self, start_date: datetime, end_date: datetime) -> slice:
+        """Получает на вход даты. Возвращает срез строк с транзакциями за этот период,
+        найденный бинарным поиском"""
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+
+        keys = self.date_keys
+        start = np.searchsorted(keys, -to_datetime64(end_date).astype("int64"), side="left")
+        end = np.searchsorted(keys, -to_datetime64(start_date).astype("int64"), side="right")
+        return slice(int(start), int(end))
+
+    def get_by_date_period(self, start_date: datetime, end_date: datetime) -> "TransactionStore":
+        """Получает на вход даты. Возвращает хранилище с транзакциями за этот период.
+        Период ищется бинарным поиском, результат — срез без копирования строк"""
+        rows = self.get_rows_by_date_period(start_date, end_date)
+        logger.info("Получено хранилище транзакций за период")
+        return self.take(rows)
+
+    def get_by_categories(self, categories: set[str]) -> "TransactionStore":
+        """Получает на вход множество категорий. Возвращает хранилище с транзакциями этих категорий.
+        Категории сравниваются по кодам, а не по строкам"""
+        codes, uniques = self.get_codes(CATEGORY_KEY)
+        selected = np.isin(uniques, list(categories))
+        logger.info("Получено хранилище транзакций по категориям")
+        return self.take(np.flatnonzero(selected[codes]))
+
+
+class RollupPeriod:
+    """Ячейки свода за период и строки неполных дней на краях периода по порядку первой строки.
+    Читается как хранилище через get_codes и get_values, поэтому функции store_utils выбирают по нему
+    те же операции и группы, что и по строкам. Суммы складываются по ячейкам, а не по строкам,
+    и могут отличаться от построчных в последних знаках, а группы с равными суммами — идти в другом порядке"""
+
+    def __init__(
+        self,
+        codes: dict[str, tuple[np.ndarray, np.ndarray]],
+        values: dict[str, np.ndarray],
+        counts: np.ndarray,
+        first_rows: np.ndarray,
+    ) -> None:
+        self._codes = codes
+        self._values = values
+        self.counts = counts
+        self.first_rows = first_rows
+
+    def __len__(self) -> int:
+        return len(self.first_rows)
+
+    def get_codes(self, key: str) -> tuple[np.ndarray, np.ndarray]:
+        """Возвращает коды ячеек по колонке и словарь значений хранилища"""
+        if key not in self._codes:
+            raise KeyError(f"Колонки {key} нет в своде")
+        return self._codes[key]
+
+    def get_values(self, key: str) -> np.ndarray:
+        """Возвращает суммы колонки по ячейкам"""
+        if key not in self._values:
+            raise KeyError(f"Колонки {key} нет в своде")
+        return self._values[key]
+
+
+def aggregate_cells(
+    days: np.ndarray,
+    codes: dict[str, np.ndarray],
+    values: dict[str, np.ndarray],
+    counts: np.ndarray,
+    first_rows: np.ndarray,
+) -> Cells:
+    """Складывает строки или ячейки свода, отсортированные по номеру первой строки, в ячейки свода.
+    Возвращает дни, коды, суммы, кол-во операций и номера первых строк ячеек, ячейки отсортированы по дням"""
+    if not len(days):
+        return days, codes, values, counts, first_rows
+
+    amount = values[AMOUNT_KEY]
+    dimensions = [days - days.min()]
+    dimensions += [codes[key] for key in ROLLUP_CODED_KEYS]
+    dimensions += [np.sign(amount).astype(np.int64) + 1, (values[AMOUNT_ROUND_UP_KEY] != 0).astype(np.int64)]
+    shape = tuple(int(dimension.max()) + 1 for dimension in dimensions)
+
+    _, first, cells = np.unique(np.ravel_multi_index(dimensions, shape), return_index=True, return_inverse=True)
+    size = len(first)
+    return (
+        days[first],
+        {key: codes[key][first] for key in ROLLUP_CODED_KEYS},
+        {key: np.bincount(cells, weights=values[key], minlength=size) for key in ROLLUP_VALUE_KEYS},
+        np.bincount(cells, weights=counts, minlength=size).astype(np.int64),
+        first_rows[first],
+    )
+
+
+class DailyRollup:
+    """Свод операций хранилища по дням: день × категория × карта × статус → сумма операций,
+    сумма с округлением, кэшбэк и кол-во операций. Ячейки еще делятся по знаку суммы операции
+    и по тому, равна ли нулю сумма с округлением, поэтому маски расходов и доходов по ячейкам
+    совпадают с масками по строкам. Ячейки отсортированы по дням"""
+
+    def __init__(
+        self,
+        store: "TransactionStore",
+        days: np.ndarray,
+        codes: dict[str, np.ndarray],
+        values: dict[str, np.ndarray],
+        counts: np.ndarray,
+        first_rows: np.ndarray,
+    ) -> None:
+        self._store = store
+        self.days = days
+        self.codes = codes
+        self.values = values
+        self.counts = counts
+        self.first_rows = first_rows
+
+    @staticmethod
+    def get_units(store: "TransactionStore", rows: slice) -> Cells:
+        """Возвращает строки хранилища в виде ячеек свода по одной операции"""
+        days = store.dates[rows].astype("datetime64[D]").view("int64")
+        return (
+            days,
+            {key: store.get_codes(key)[0][rows] for key in ROLLUP_CODED_KEYS},
+            {key: store.get_values(key)[rows] for key in ROLLUP_VALUE_KEYS},
+            np.ones(len(days), dtype=np.int64),
+            np.arange(len(store))[rows],
+        )
+
+    @classmethod
+    def from_store(cls, store: "TransactionStore") -> "DailyRollup":
+        """Строит свод по всем операциям хранилища с датой"""
+        days, codes, values, counts, first_rows = aggregate_cells(
+            *cls.get_units(store, slice(0, len(store.date_keys)))
+        )
+        logger.info("Построен свод по дням: %s ячеек для %s операций", len(days), len(store.date_keys))
+        return cls(store, days.astype("datetime64[D]"), codes, values, counts, first_rows)
+
+    def extend(self, store: "TransactionStore", new_rows: int) -> "DailyRollup":
+        """Возвращает свод для хранилища, в котором перед строками старого хранилища добавлено
+        new_rows строк с операциями не старше старых. Пересчитываются только ячейки дней новых операций"""
+        new_days, new_codes, new_values, new_counts, new_first_rows = self.get_units(store, slice(0, new_rows))
+        first_rows = self.first_rows + new_rows
+        keep = len(self)
+        if new_rows:
+            keep = int(np.searchsorted(self.days.view("int64"), new_days.min(), side="left"))
+
+        days, codes, values, counts, first_rows_merged = aggregate_cells(
+            np.concatenate([new_days, self.days[keep:].view("int64")]),
+            {key: np.concatenate([new_codes[key], self.codes[key][keep:]]) for key in ROLLUP_CODED_KEYS},
+            {key: np.concatenate([new_values[key], self.values[key][keep:]]) for key in ROLLUP_VALUE_KEYS},
+            np.concatenate([new_counts, self.counts[keep:]]),
+            np.concatenate([new_first_rows, first_rows[keep:]]),
+        )
+        logger.info("Свод дополнен %s операциями, пересчитано %s ячеек", new_rows, len(days))
+        return DailyRollup(
+            store,
+            np.concatenate([self.days[:keep], days.astype("datetime64[D]")]),
+            {key: np.concatenate([self.codes[key][:keep], codes[key]]) for key in ROLLUP_CODED_KEYS},
+            {key: np.concatenate([self.values[key][:keep], values[key]]) for key in ROLLUP_VALUE_KEYS},
+            np.concatenate([self.counts[:keep], counts]),
+            np.concatenate([first_rows[:keep], first_rows_merged]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.first_rows)
+
+    def get_edge_rows(self, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+        """Возвращает номера строк хранилища с операциями от start до end включительно"""
+        if start > end:
+            return np.arange(0)
+        rows = self._store.get_rows_by_date_period(pd.Timestamp(start), pd.Timestamp(end))
+        return np.arange(rows.start, rows.stop)
+
+    def get_period(self, start_date: datetime, end_date: datetime) -> RollupPeriod:
+        """Получает на вход даты. Возвращает ячейки свода за полные дни периода
+        и строки хранилища за неполные дни на его краях"""
+        if start_date > end_date:
+            start_date, end_date = end_date, start_date
+        start, end = to_datetime64(start_date), to_datetime64(end_date)
+
+        # Первый полный день — начало периода, округленное вверх до суток, последний — вниз
+        first_day = np.datetime64(-(-int(start.astype("int64")) // NS_PER_DAY), "D")
+        last_day = np.datetime64(int(end.astype("int64")) // NS_PER_DAY, "D")
+
+        if first_day < last_day:
+            cells = np.arange(
+                np.searchsorted(self.days, first_day, side="left"), np.searchsorted(self.days, last_day, side="left")
+            )
+            rows = np.concatenate(
+                [self.get_edge_rows(start, first_day - np.timedelta64(1, "ns")), self.get_edge_rows(last_day, end)]
+            )
+        else:
+            cells = np.arange(0)
+            rows = self.get_edge_rows(start, end)
+
+        first_rows = np.concatenate([self.first_rows[cells], rows])
+        order = np.argsort(first_rows, kind="stable")
+
+        store = self._store
+        codes = {}
+        for key in ROLLUP_CODED_KEYS:
+            store_codes, uniques = store.get_codes(key)
+            codes[key] = (np.concatenate([self.codes[key][cells], store_codes[rows]])[order], uniques)
+        values = {
+            key: np.concatenate([self.values[key][cells], store.get_values(key)[rows]])[order]
+            for key in ROLLUP_VALUE_KEYS
+        }
+        counts = np.concatenate([self.counts[cells], np.ones(len(rows), dtype=np.int64)])[order]
+        logger.info("Получен свод за период: %s ячеек и %s строк неполных дней", len(cells), len(rows))
+        return RollupPeriod(codes, values, counts, first_rows[order])
+
+
+_stores: dict[str, tuple[str | None, TransactionStore]] = {}
+_stores_lock = threading.Lock()
+_append_locks: dict[str, threading.Lock] = {}
+
+
+def get_store(file_path: str = OPERATIONS_PATH) -> TransactionStore:
+    """Возвращает общее для процесса хранилище транзакций из файла.
+    Файл перечитывается, только если он изменился"""
+    abs_path = os.path.abspath(file_path)
+    version = get_cache_path(abs_path)
+
+    with _stores_lock:
+        cached = _stores.get(abs_path)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+
+        store = TransactionStore.from_excel(abs_path)
+        for appended_df in load_appended_dfs(abs_path):
+            store = store.append(appended_df)
+        for key in (*CODED_KEYS, *TAG_KEYS):
+            store.get_codes(key)
+        store.build_rollup()
+        _stores[abs_path] = (version, store)
+    logger.info("Загружено хранилище транзакций из файла %s", abs_path)
+    return store
+
+
+def append_to_store(df: DataFrame, file_path: str = OPERATIONS_PATH) -> TransactionStore:
+    """Добавляет операции к хранилищу файла: сохраняет их рядом с кэшем файла и дополняет
+    загруженное хранилище без перечитывания файла. Возвращает новое хранилище.
+    Добавления к одному файлу идут по очереди, поэтому одновременные добавления не теряются"""
+    abs_path = os.path.abspath(file_path)
+    with _stores_lock:
+        append_lock = _append_locks.setdefault(abs_path, threading.Lock())
+
+    with append_lock:
+        store = get_store(abs_path).append(df)
+        save_appended_df(df, abs_path)
+        with _stores_lock:
+            _stores[abs_path] = (get_cache_path(abs_path), store)
+    logger.info("К хранилищу файла %s добавлено %s операций", abs_path, len(df))
+    return store
+
+
+def clear_stores() -> None:
+    """Очищает загруженные хранилища транзакций"""
+    with _stores_lock:
+        _stores.clear()
+    logger.info("Хранилища транзакций очищены")
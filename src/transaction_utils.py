@@ -1,26 +1,57 @@
+import functools
+import heapq
 import logging
 import os
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
+
+import numpy as np
 
 from src import loggers
 from src.config import AMOUNT_KEY, CATEGORY_KEY, DATE_FORMAT, DATE_TRANSACTIONS_KEY, STATUS_KEY
+from src.store_utils import get_store_top_rows, get_store_top_rows_by_group
+from src.transaction import FIELDS, iter_fields
+from src.transaction_store import TransactionStore
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
+DATE_PARSE_CACHE_SIZE = 4096
+SELECTED_FIELDS = (AMOUNT_KEY, STATUS_KEY, CATEGORY_KEY)
+
+
+@functools.lru_cache(maxsize=DATE_PARSE_CACHE_SIZE)
+def parse_transaction_date(date_str: str) -> datetime:
+    """Разбирает строку с датой операции. Последние разобранные даты кэшируются,
+    повторные вызовы для них не вызывают strptime"""
+    return datetime.strptime(date_str, DATE_FORMAT)
+
+
+def get_transactions_for_categories(
+    data: list[Any] | TransactionStore, categories: set, typed: bool = False
+) -> list[Any]:
+    """Получает на вход транзакции или хранилище, список категорий, возвращает список транзакций.
+    В хранилище категории сравниваются по кодам, с признаком typed возвращается список Transaction"""
+    if isinstance(data, TransactionStore):
+        selected = data.get_by_categories(categories)
+        logger.info("Получен список транзакций по категориям из хранилища")
+        return selected.transactions if typed else selected.records
 
-def get_transactions_for_categories(data: list[dict[str, Any]], categories: set) -> list[dict[str, Any]]:
-    """Получает на вход транзакции, список категорий, возвращает список транзакций"""
     logger.info("Получен список транзакций по категориям")
     return [tx for tx in data if tx.get(CATEGORY_KEY, "") in categories]
 
 
 def get_transactions_by_date_period(
-    data: list[dict[str, Any]], start_date: datetime, end_date: datetime
-) -> list[dict[str, Any]]:
-    """Получает на вход транзакции и даты. Возвращает транзакции за этот период"""
+    data: list[Any] | TransactionStore, start_date: datetime, end_date: datetime, typed: bool = False
+) -> list[Any]:
+    """Получает на вход транзакции или хранилище и даты. Возвращает транзакции за этот период.
+    Для хранилища с признаком typed возвращает список Transaction вместо словарей"""
+    if isinstance(data, TransactionStore):
+        logger.info("Получен список транзакций за период из хранилища")
+        period = data.get_by_date_period(start_date, end_date)
+        return period.transactions if typed else period.records
+
     result = []
 
     if start_date > end_date:
@@ -31,7 +62,7 @@ def get_transactions_by_date_period(
         if not date_tr_str:
             continue
 
-        date_tr = datetime.strptime(date_tr_str, DATE_FORMAT)
+        date_tr = parse_transaction_date(date_tr_str)
 
         if start_date <= date_tr <= end_date:
             result.append(tx)
@@ -39,23 +70,92 @@ def get_transactions_by_date_period(
     return result
 
 
+def iter_selected_amounts(
+    data: list[Any],
+    expense: bool = True,
+    status: str = "OK",
+    except_categories: set[str] | None = None,
+    key: str | None = None,
+) -> Iterator[tuple[float, Any, Any]]:
+    """Перебирает транзакции с нужным статусом, расходы или доходы без исключенных категорий.
+    Возвращает суммы с учетом знака (топ — наименьшие значения), исходные объекты и значения колонки key
+    (пустая строка, если колонка не задана). У словарей читаются только нужные колонки"""
+    keys = SELECTED_FIELDS + ((key,) if key in FIELDS else ())
+    for tx, (amount, tx_status, category, *group) in zip(data, iter_fields(data, keys)):
+        if (
+            tx_status == status
+            and (amount if expense else -amount) < 0.0
+            and (category not in except_categories if except_categories else True)
+        ):
+            yield (amount if expense else -amount), tx, (group[0] if group else "")
+
+
 def top_transactions_by_amount(
-    data: list[dict[str, Any]],
+    data: list[Any] | TransactionStore,
     expense: bool = True,
     status: str = "OK",
     num_top_cats: int = 0,
     except_categories: set[str] | None = None,
-) -> list[dict]:
-    """Получает на вход транзакции, признак расходов, статус, кол-во топов. Возвращает топ движений."""
-    data = [
-        tx
-        for tx in data
-        if tx.get(STATUS_KEY, "") == status
-        and (tx.get(AMOUNT_KEY, 0.0) if expense else -tx.get(AMOUNT_KEY, 0.0)) < 0.0
-        and (tx.get(CATEGORY_KEY, "") not in except_categories if except_categories else True)
-    ]
-    data.sort(key=lambda x: x.get(AMOUNT_KEY, 0), reverse=not expense)
+    typed: bool = False,
+) -> list[Any]:
+    """Получает на вход транзакции, признак расходов, статус, кол-во топов. Возвращает топ движений.
+    Принимает словари и Transaction, возвращает те же объекты, что получила.
+    Топ заданного размера выбирается через heapq.nsmallest без копии и сортировки всего списка.
+    По хранилищу топ ищется по колонке сумм, с признаком typed возвращается список Transaction"""
+    if isinstance(data, TransactionStore):
+        selected_store = data.take(get_store_top_rows(data, expense, status, num_top_cats, except_categories))
+        return selected_store.transactions if typed else selected_store.records
+
+    selected = ((value, tx) for value, tx, _ in iter_selected_amounts(data, expense, status, except_categories))
+    if num_top_cats:
+        pairs = heapq.nsmallest(num_top_cats, selected, key=lambda x: x[0])
+    else:
+        pairs = sorted(selected, key=lambda x: x[0])
     logger.info(
-        f"Получен топ{"-" + str(num_top_cats) if num_top_cats != 0 else ""} {"расходов" if expense else "доходов"}"
+        "Получен топ%s %s", f"-{num_top_cats}" if num_top_cats != 0 else "", "расходов" if expense else "доходов"
     )
-    return data[:num_top_cats] if num_top_cats != 0 else data
+    return [tx for _, tx in pairs]
+
+
+def top_transactions_by_group(
+    data: list[Any] | TransactionStore,
+    key: str = CATEGORY_KEY,
+    expense: bool = True,
+    status: str = "OK",
+    num_top_cats: int = 5,
+    except_categories: set[str] | None = None,
+    typed: bool = False,
+) -> dict[str, list[Any]]:
+    """Возвращает для каждого значения колонки (категории, номера карты) топ движений за один проход
+    по транзакциям: для каждой группы хранится куча из num_top_cats лучших движений.
+    Группы идут в порядке первого появления, пустые значения пропускаются, при num_top_cats=0 берутся все.
+    По хранилищу строки групп выбираются по кодам колонки, с признаком typed возвращаются Transaction"""
+    if isinstance(data, TransactionStore):
+        groups = get_store_top_rows_by_group(data, key, expense, status, num_top_cats, except_categories)
+        rows = np.unique(np.concatenate([np.arange(0), *groups.values()]))
+        selected_store = data.take(rows)
+        items = selected_store.transactions if typed else selected_store.records
+        return {
+            group: [items[position] for position in np.searchsorted(rows, group_rows).tolist()]
+            for group, group_rows in groups.items()
+        }
+
+    heaps: dict[str, list[tuple[float, int, Any]]] = {}
+    selected = iter_selected_amounts(data, expense, status, except_categories, key)
+    for position, (value, tx, group) in enumerate(selected):
+        if not group:
+            continue
+        heap = heaps.setdefault(group, [])
+        item = (-value, -position, tx)
+        if num_top_cats <= 0:
+            heap.append(item)
+        elif len(heap) < num_top_cats:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+
+    result = {
+        group: [tx for _, _, tx in sorted(heap, key=lambda x: x[:2], reverse=True)] for group, heap in heaps.items()
+    }
+    logger.info("Получен топ-%s %s по колонке %s", num_top_cats, "расходов" if expense else "доходов", key)
+    return result
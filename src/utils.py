@@ -1,20 +1,37 @@
+import itertools
 import json
 import logging
 import os
+import zipfile
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Iterable, Iterator
 
+import openpyxl
 import pandas as pd
+from openpyxl.utils.exceptions import InvalidFileException
 from pandas import DataFrame
 
 from src import loggers
-from src.config import AMOUNT_KEY, AMOUNT_ROUND_UP_KEY, CARD_NUMBER_KEY, CASHBACK_KEY, CATEGORY_KEY, STATUS_KEY
+from src.cache_utils import read_excel_cached
+from src.config import (
+    AMOUNT_KEY,
+    AMOUNT_ROUND_UP_KEY,
+    CARD_NUMBER_KEY,
+    CASHBACK_KEY,
+    CATEGORY_KEY,
+    STATUS_KEY,
+    TRANSACTIONS_BATCH_SIZE,
+)
+from src.transaction import Transaction, iter_fields
 
 name = os.path.splitext(os.path.basename(__file__))[0]
 file_name = f"{name}.log"
 logger = loggers.create_logger(name, file_name, logging.DEBUG)
 
+CARD_FIELDS = (CARD_NUMBER_KEY, AMOUNT_ROUND_UP_KEY, AMOUNT_KEY, CASHBACK_KEY, CATEGORY_KEY, STATUS_KEY)
+CATEGORY_FIELDS = (CATEGORY_KEY, AMOUNT_ROUND_UP_KEY, AMOUNT_KEY, STATUS_KEY)
+
 
 def get_greetings(current_date: datetime) -> str:
     """Принимает объект datetime, возвращает часть суток строкой"""
@@ -28,7 +45,7 @@ def get_greetings(current_date: datetime) -> str:
         result = "Добрый день"
     else:
         result = "Добрый вечер"
-    logger.info(f"Получена часть суток {result}")
+    logger.info("Получена часть суток %s", result)
     return result
 
 
@@ -39,40 +56,38 @@ def get_last_digits_card_number(card_number: str) -> str:
         result = card_number[-4:]
     else:
         result = card_number
-    logger.info(f"Получен номер карты {result}")
+    logger.debug("Получен номер карты %s", result)
     return result
 
 
 def get_total_amount_for_card(
-    data: list[dict[str, Any]],
+    data: Iterable[dict[str, Any] | Transaction],
     expense: bool = True,
     status: str = "OK",
     except_categories: set[str] | None = None,
 ) -> dict[str, dict[str, Any]]:
-    """Получает на вход список транзакций, признак расходов, статус.
-    Возвращает словари с номерами карт и общими суммами"""
+    """Получает на вход транзакции, признак расходов, статус.
+    Возвращает словари с номерами карт и общими суммами.
+    Транзакции обходятся один раз, поэтому можно передать итератор по пачкам из файла.
+    Принимает словари и Transaction, у словарей читаются только нужные колонки"""
     result: dict[str, dict[str, Any]] = {}
 
-    for transaction in data:
-        card_number_str = transaction.get(CARD_NUMBER_KEY, "")
-        amount_str = transaction.get(AMOUNT_ROUND_UP_KEY, "")
-        amount = transaction.get(AMOUNT_KEY, "")
-
-        if not (card_number_str and amount_str and amount):
+    fields = iter_fields(data, CARD_FIELDS)
+    for card_number_str, amount_round_up, amount, cashback, category, tx_status in fields:
+        if not (card_number_str and amount_round_up and amount):
             continue
 
-        if except_categories and transaction.get(CATEGORY_KEY, "") in except_categories:
+        if except_categories and category in except_categories:
             continue
 
-        card_number = get_last_digits_card_number(card_number_str)
-        amount = float(amount)
-        if (amount if expense else -amount) >= 0.0 or transaction.get(STATUS_KEY, "") != status:
+        if (amount if expense else -amount) >= 0.0 or tx_status != status:
             continue
 
+        card_number = get_last_digits_card_number(card_number_str)
         if result.get(card_number) is None:
             result[card_number] = {"sum": 0.0, "cashback": 0.0}
-        result[card_number]["sum"] += float(amount_str)
-        result[card_number]["cashback"] += float(transaction.get(CASHBACK_KEY, 0))
+        result[card_number]["sum"] += amount_round_up
+        result[card_number]["cashback"] += cashback
 
     logger.info("Получен словарь с номерами карт и суммами")
     return result
@@ -91,7 +106,7 @@ def get_start_date(target_date: datetime, date_period: str = "M") -> datetime:
     else:
         result = datetime.min
 
-    logger.info(f"Получена дата {result}")
+    logger.info("Получена дата %s", result)
     return result
 
 
@@ -103,73 +118,86 @@ def get_json_file(file_path: str) -> dict[str, Any]:
             try:
                 result = json.load(f)
             except json.decoder.JSONDecodeError as e:
-                logger.error(f"Ошибка: {e}")
+                logger.error("Ошибка: %s", e)
                 return {}
     except FileNotFoundError as e:
-        logger.error(f"Ошибка: {e}")
+        logger.error("Ошибка: %s", e)
         return {}
-    logger.info(f"Получен словарь из файла {file_path}")
+    logger.info("Получен словарь из файла %s", file_path)
     return result
 
 
 def get_total_amount(
-    data: list[dict[str, Any]],
+    data: Iterable[dict[str, Any] | Transaction],
     expense: bool = True,
     status: str = "OK",
     except_categories: set[str] | None = None,
 ) -> float:
     """Получает на вход транзакции, признак расходов, статус, возвращает сумму"""
-    logger.info(f"Получена сумма {"расходов" if expense else "доходов"}")
-    return sum(
-        [
-            float(dct.get(AMOUNT_ROUND_UP_KEY, 0))
-            for dct in data
-            if (dct.get(AMOUNT_KEY, 0) if expense else -dct.get(AMOUNT_KEY, 0)) < 0
-            and dct.get(STATUS_KEY, "") == status
-            and (dct.get(CATEGORY_KEY, "") not in except_categories if except_categories else True)
-        ]
+    logger.info("Получена сумма %s", "расходов" if expense else "доходов")
+    result: float = sum(
+        amount_round_up
+        for category, amount_round_up, amount, tx_status in iter_fields(data, CATEGORY_FIELDS)
+        if (amount if expense else -amount) < 0
+        and tx_status == status
+        and (category not in except_categories if except_categories else True)
     )
+    return result
+
+
+def get_top_amounts(operations: dict[str, float], num_top_cats: int = 0) -> dict[str, float]:
+    """Получает суммы по категориям в порядке первого появления, возвращает словарь по убыванию сумм.
+    Если задано кол-во топов, остальные категории складываются в Остальное"""
+    sorted_operations = sorted(operations.items(), key=lambda x: x[1], reverse=True)
+
+    if not num_top_cats:
+        return {key: value for key, value in sorted_operations}
+
+    result = {key: value for key, value in sorted_operations[:num_top_cats]}
+    if len(sorted_operations) > num_top_cats:
+        other = sum(value for key, value in sorted_operations[num_top_cats:])
+        result["Остальное"] = other
+    return result
 
 
 def get_amount_for_categories(
-    data: list[dict[str, Any]],
+    data: Iterable[dict[str, Any] | Transaction],
     expense: bool = True,
     status: str = "OK",
     num_top_cats: int = 0,
     except_categories: set[str] | None = None,
 ) -> dict[str, Any]:
-    """Получает на вход транзакции, признак расходов, статус, кол-во топов, возвращает словарь по категориям"""
-    result = {}
+    """Получает на вход транзакции, признак расходов, статус, кол-во топов, возвращает словарь по категориям.
+    Транзакции обходятся один раз, поэтому можно передать итератор по пачкам из файла"""
+    fields = iter_fields(data, CATEGORY_FIELDS)
+    return get_amount_for_category_fields(fields, expense, status, num_top_cats, except_categories)
 
-    operations: defaultdict = defaultdict(float)
-    for transaction in data:
-        category_str = transaction.get(CATEGORY_KEY, "")
-        amount_str = transaction.get(AMOUNT_ROUND_UP_KEY, "")
-        amount = transaction.get(AMOUNT_KEY, "")
 
-        if not (category_str and amount_str and amount):
+def get_amount_for_category_fields(
+    fields: Iterable[tuple[Any, ...]],
+    expense: bool = True,
+    status: str = "OK",
+    num_top_cats: int = 0,
+    except_categories: set[str] | None = None,
+) -> dict[str, Any]:
+    """Получает на вход кортежи колонок CATEGORY_FIELDS, признак расходов, статус, кол-во топов,
+    возвращает словарь по категориям"""
+    operations: defaultdict = defaultdict(float)
+    for category, amount_round_up, amount, tx_status in fields:
+        if not (category and amount_round_up and amount):
             continue
-        amount = float(amount)
-        if (amount if expense else -amount) >= 0.0 or transaction.get(STATUS_KEY, "") != status:
+        if (amount if expense else -amount) >= 0.0 or tx_status != status:
             continue
-        if except_categories and transaction.get(CATEGORY_KEY, "") in except_categories:
+        if except_categories and category in except_categories:
             continue
 
-        operations[category_str] += float(amount_str)
-
-    sorted_operations = sorted(operations.items(), key=lambda x: x[1], reverse=True)
+        operations[category] += amount_round_up
 
-    if not num_top_cats:
-        result = {key: value for key, value in sorted_operations}
-    else:
-        result = {key: value for key, value in sorted_operations[:num_top_cats]}
-
-        if len(sorted_operations) > num_top_cats:
-            other = sum(value for key, value in sorted_operations[num_top_cats:])
-            result["Остальное"] = other
+    result = get_top_amounts(operations, num_top_cats)
     logger.info(
-        f"Получен топ{"-" + str(num_top_cats) if num_top_cats != 0 else ""} "
-        f"{"расходов" if expense else "доходов"} по категориям"
+        "Получен топ%s %s по категориям",
+        f"-{num_top_cats}" if num_top_cats != 0 else "",
+        "расходов" if expense else "доходов",
     )
     return result
 
@@ -177,25 +205,80 @@ def get_amount_for_categories(
 def read_transactions_from_excel(file_path: str) -> list[dict]:
     """Читает финансовые операции из Excel-файла и возвращает список словарей с транзакциями"""
     try:
-        df = pd.read_excel(file_path)
+        df = read_excel_cached(file_path)
         df = df.fillna(value="")
     except (FileNotFoundError, ValueError) as e:
-        logger.error(f"Ошибка: {e}")
+        logger.error("Ошибка: %s", e)
         return []
 
     transactions = df.to_dict("records")
-    logger.info(f"Файл {file_path} успешно обработан")
+    logger.info("Файл %s успешно обработан", file_path)
     return transactions
 
 
+def iter_batches_from_excel(file_path: str, batch_size: int = TRANSACTIONS_BATCH_SIZE) -> Iterator[list[dict]]:
+    """Читает Excel-файл построчно в режиме только для чтения, возвращает транзакции пачками по batch_size.
+    В памяти одновременно находится только одна пачка, пустые ячейки заменяются пустой строкой"""
+    try:
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    except (FileNotFoundError, InvalidFileException, zipfile.BadZipFile, ValueError) as e:
+        logger.error("Ошибка: %s", e)
+        return
+
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(column) for column in header]
+
+        batch: list[dict] = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append({key: "" if value is None else value for key, value in zip(columns, row)})
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        workbook.close()
+    logger.info("Файл %s прочитан пачками", file_path)
+
+
+def iter_batches_from_csv(file_path: str, batch_size: int = TRANSACTIONS_BATCH_SIZE) -> Iterator[list[dict]]:
+    """Читает CSV-файл частями, возвращает транзакции пачками по batch_size"""
+    try:
+        for chunk in pd.read_csv(file_path, chunksize=batch_size):
+            yield chunk.fillna(value="").to_dict("records")
+    except (FileNotFoundError, ValueError) as e:
+        logger.error("Ошибка: %s", e)
+        return
+    logger.info("Файл %s прочитан пачками", file_path)
+
+
+def iter_transaction_batches(file_path: str, batch_size: int = TRANSACTIONS_BATCH_SIZE) -> Iterator[list[dict]]:
+    """Возвращает транзакции из Excel- или CSV-файла пачками по batch_size"""
+    if os.path.splitext(file_path)[1].lower() == ".csv":
+        return iter_batches_from_csv(file_path, batch_size)
+    return iter_batches_from_excel(file_path, batch_size)
+
+
+def iter_transactions(file_path: str, batch_size: int = TRANSACTIONS_BATCH_SIZE) -> Iterator[dict]:
+    """Возвращает итератор транзакций из файла, файл читается пачками по batch_size.
+    Итератор можно передать в get_total_amount_for_card, get_total_amount и get_amount_for_categories"""
+    return itertools.chain.from_iterable(iter_transaction_batches(file_path, batch_size))
+
+
 def read_df_from_excel(file_path: str) -> DataFrame:
     """Читает финансовые операции из Excel-файла и возвращает dataframe с транзакциями"""
     try:
-        df = pd.read_excel(file_path)
+        df = read_excel_cached(file_path)
         df = df.fillna(value="")
         return df
     except (FileNotFoundError, ValueError) as e:
-        logger.error(f"Ошибка: {e}")
+        logger.error("Ошибка: %s", e)
         return pd.DataFrame()
 
 
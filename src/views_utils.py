@@ -0,0 +1,84 @@
+import logging
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src import loggers
+from src.config import AMOUNT_KEY, AMOUNT_ROUND_UP_KEY, CATEGORY_KEY, STATUS_KEY
+from src.store_utils import get_group_sums, get_groups_in_order
+from src.transaction_store import RollupPeriod, TransactionStore, encode_column, get_numeric_column
+
+name = os.path.splitext(os.path.basename(__file__))[0]
+file_name = f"{name}.log"
+logger = loggers.create_logger(name, file_name, logging.DEBUG)
+
+OTHER_CATEGORY = "Остальное"
+TRANSFERS_AND_CASH_CATEGORIES = frozenset({"Наличные", "Переводы"})
+
+
+def get_sums_by_categories(
+    codes: np.ndarray, categories: np.ndarray, amounts: np.ndarray, mask: np.ndarray
+) -> pd.Series:
+    """Возвращает суммы по кодам категорий для строк по маске в порядке первого появления категории"""
+    order = get_groups_in_order(codes, mask)
+    sums = get_group_sums(codes, len(categories), amounts, mask)
+    return pd.Series(sums[order], index=categories[order], dtype=float)
+
+
+def get_top_categories(sums: pd.Series, num_top_cats: int = 0) -> dict[str, float]:
+    """Получает суммы по категориям, возвращает словарь по убыванию сумм.
+    Если задано кол-во топов, остальные категории складываются в Остальное"""
+    sorted_sums = sums.sort_values(ascending=False, kind="stable")
+
+    if not num_top_cats or len(sorted_sums) <= num_top_cats:
+        return {str(key): float(value) for key, value in sorted_sums.items()}
+
+    result = {str(key): float(value) for key, value in sorted_sums.iloc[:num_top_cats].items()}
+    result[OTHER_CATEGORY] = float(sorted_sums.iloc[num_top_cats:].sum())
+    return result
+
+
+def get_events_summary(
+    df: DataFrame | TransactionStore | RollupPeriod,
+    status: str = "OK",
+    num_top_cats: int = 7,
+    transfers_and_cash: frozenset[str] = TRANSFERS_AND_CASH_CATEGORIES,
+) -> dict[str, Any]:
+    """Получает на вход dataframe, хранилище или свод за период, статус и кол-во топов категорий расходов.
+    За один проход считает суммы расходов и доходов по кодам категорий, топ категорий расходов,
+    Остальное и суммы по переводам и наличным получаются из тех же сумм"""
+    if isinstance(df, DataFrame):
+        codes, categories = encode_column(df, CATEGORY_KEY)
+        status_codes, statuses = encode_column(df, STATUS_KEY)
+        amounts = get_numeric_column(df, AMOUNT_KEY)
+        round_up = get_numeric_column(df, AMOUNT_ROUND_UP_KEY)
+    else:
+        codes, categories = df.get_codes(CATEGORY_KEY)
+        status_codes, statuses = df.get_codes(STATUS_KEY)
+        amounts = df.get_values(AMOUNT_KEY)
+        round_up = df.get_values(AMOUNT_ROUND_UP_KEY)
+
+    is_status = (statuses == status)[status_codes]
+    expense = is_status & (amounts < 0)
+    income = is_status & (amounts > 0)
+
+    grouped = (categories != "")[codes] & (round_up != 0)
+    expense_sums = get_sums_by_categories(codes, categories, round_up, grouped & expense)
+    income_sums = get_sums_by_categories(codes, categories, round_up, grouped & income)
+
+    result = {
+        "expenses": {
+            "total_amount": float(round_up[expense].sum()),
+            "main": get_top_categories(expense_sums, num_top_cats),
+            "transfers_and_cash": get_top_categories(expense_sums[expense_sums.index.isin(transfers_and_cash)]),
+        },
+        "income": {
+            "total_amount": float(round_up[income].sum()),
+            "main": get_top_categories(income_sums),
+        },
+    }
+    logger.info("Получены суммы расходов и доходов по категориям")
+    return result
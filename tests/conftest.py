@@ -1,8 +1,12 @@
 from datetime import datetime
+from unittest.mock import patch
 
 import pandas as pd
 import pytest
 
+from src.transaction_store import TransactionStore
+from tests.mock_api_server import MockApiServer
+
 
 @pytest.fixture
 def list_transactions():
@@ -255,6 +259,28 @@ def stocks_response():
     }
 
 
+@pytest.fixture
+def mock_api_server(user_settings):
+    server = MockApiServer(delay=0.2).start()
+    server.stock_prices = {"AAPL": 196.98, "AMZN": 172.5}
+    server.currency_rates = {"USD": 0.0125, "EUR": 0.0110}
+    with (
+        patch("src.api_utils.API_STOCKS_URL", f"{server.url}/time_series"),
+        patch("src.api_utils.API_EXCHANGE_URL", f"{server.url}/exchangerates_data/"),
+        patch("src.api_utils.get_json_file", return_value=user_settings),
+    ):
+        yield server
+    server.stop()
+
+
+@pytest.fixture
+def stocks_batch_response(stocks_response):
+    return {
+        "AAPL": {**stocks_response, "status": "ok"},
+        "AMZN": {"code": 400, "message": "symbol not found", "status": "error"},
+    }
+
+
 @pytest.fixture
 def test_date():
     return datetime(2020, 1, 1)
@@ -275,6 +301,11 @@ def dataframe_tr(list_transactions):
     return pd.DataFrame(list_transactions)
 
 
+@pytest.fixture
+def store_transactions(list_transactions):
+    return TransactionStore(pd.DataFrame(list_transactions))
+
+
 @pytest.fixture
 def good_df():
     return pd.DataFrame(
@@ -0,0 +1,81 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+
+class MockApiServer:
+    """Локальный сервер, отвечающий как API валют и акций. Нужен для тестов и замеров без сети"""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.requests: list[dict[str, Any]] = []
+        self.stock_prices: dict[str, float] = {}
+        self.currency_rates: dict[str, float] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockApiServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def get_stock_response(self, symbol: str) -> dict[str, Any]:
+        if symbol not in self.stock_prices:
+            return {"code": 400, "message": f"symbol {symbol} not found", "status": "error"}
+        return {
+            "meta": {"symbol": symbol, "interval": "1day"},
+            "values": [{"datetime": "2025-04-17", "close": f"{self.stock_prices[symbol]:.5f}"}],
+            "status": "ok",
+        }
+
+    def get_stocks_response(self, params: dict[str, str]) -> dict[str, Any]:
+        symbols = params.get("symbol", "").split(",")
+        if len(symbols) == 1:
+            return self.get_stock_response(symbols[0])
+        return {symbol: self.get_stock_response(symbol) for symbol in symbols}
+
+    def get_exchange_response(self, params: dict[str, str]) -> dict[str, Any]:
+        symbols = params.get("symbols", "").split(",")
+        return {"rates": {symbol: self.currency_rates[symbol] for symbol in symbols if symbol in self.currency_rates}}
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                params = {key: value[0] for key, value in parse_qs(parsed.query).items()}
+                server.requests.append({"path": parsed.path, "params": params})
+                time.sleep(server.delay)
+
+                if parsed.path.startswith("/time_series"):
+                    body = server.get_stocks_response(params)
+                elif parsed.path.startswith("/exchangerates_data/"):
+                    body = server.get_exchange_response(params)
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
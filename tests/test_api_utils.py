@@ -1,14 +1,25 @@
+import time
 from unittest.mock import patch
 
+import pytest
 import requests
 
-from src.api_utils import get_currency_rates, get_stock_prices
+from src.api_utils import get_currency_rates, get_market_data, get_session, get_stock_prices, parse_stock_prices
+from src.quote_cache import QuoteCache
+
+
+@pytest.fixture(autouse=True)
+def quote_cache():
+    cache = QuoteCache()
+    with patch("src.api_utils.get_quote_cache", return_value=cache):
+        yield cache
 
 
 @patch("src.api_utils.get_json_file")
 def test_get_currency_rates(mock_file, user_settings, test_date):
     mock_file.return_value = user_settings
-    with patch("src.api_utils.requests.get") as mock_get:
+    with patch("src.api_utils.get_session") as mock_session:
+        mock_get = mock_session.return_value.get
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = {"rates": {"EUR": 0.014409, "GBP": 0.012201}}
         assert get_currency_rates(test_date) == {
@@ -26,48 +37,129 @@ def test_get_currency_rates_empty_settings(mock_file, test_date):
 @patch("src.api_utils.get_json_file")
 def test_get_currency_rates_err_req(mock_file, user_settings, test_date):
     mock_file.return_value = user_settings
-    with patch("src.api_utils.requests.get") as mock_get:
-        mock_get.side_effect = requests.exceptions.RequestException
+    with patch("src.api_utils.get_session") as mock_session:
+        mock_session.return_value.get.side_effect = requests.exceptions.RequestException
         assert get_currency_rates(test_date) == {}
 
 
 @patch("src.api_utils.get_json_file")
 def test_get_currency_rates_err_status_code(mock_file, user_settings, test_date):
     mock_file.return_value = user_settings
-    with patch("src.api_utils.requests.get") as mock_get:
-        mock_get.return_value.status_code = 400
+    with patch("src.api_utils.get_session") as mock_session:
+        mock_session.return_value.get.return_value.status_code = 400
         assert get_currency_rates(test_date) == {}
 
 
 @patch("src.api_utils.get_json_file")
 def test_get_currency_rates_res_empty(mock_file, user_settings, test_date):
     mock_file.return_value = user_settings
-    with patch("src.api_utils.requests.get") as mock_get:
+    with patch("src.api_utils.get_session") as mock_session:
+        mock_get = mock_session.return_value.get
         mock_get.return_value.status_code = 200
         mock_get.return_value.json.return_value = {}
         assert get_currency_rates(test_date) == {}
 
 
 @patch("src.api_utils.get_json_file")
-@patch("src.api_utils.requests.get")
-def test_get_stock_prices(mock_get, mock_json, user_settings, stocks_response, test_date):
+@patch("src.api_utils.get_session")
+def test_get_stock_prices(mock_session, mock_json, user_settings, stocks_batch_response, test_date):
     mock_json.return_value = user_settings
+    mock_get = mock_session.return_value.get
     mock_get.return_value.status_code = 200
-    mock_get.return_value.json.return_value = stocks_response
-    assert get_stock_prices(test_date) == {"AAPL": 196.98, "AMZN": 196.98}
+    mock_get.return_value.json.return_value = stocks_batch_response
+    assert get_stock_prices(test_date) == {"AAPL": 196.98}
+    mock_get.assert_called_once()
+    assert mock_get.call_args.kwargs["params"]["symbol"] == "AAPL,AMZN"
+    assert mock_get.call_args.kwargs["params"]["outputsize"] == "1"
+
+
+@pytest.mark.parametrize("stocks, expected", [(["AAPL"], {"AAPL": 196.98}), (["AAPL", "AMZN"], {})])
+def test_parse_stock_prices_single(stocks_response, stocks, expected):
+    assert parse_stock_prices(stocks_response, stocks) == expected
+
+
+def test_parse_stock_prices_error():
+    assert parse_stock_prices({"code": 400, "status": "error"}, ["IBM"]) == {}
+
+
+def test_parse_stock_prices_batch(stocks_batch_response):
+    assert parse_stock_prices(stocks_batch_response, ["AAPL", "AMZN", "IBM"]) == {"AAPL": 196.98}
 
 
 @patch("src.api_utils.get_json_file")
-@patch("src.api_utils.requests.get")
-def test_get_stock_prices_exception(mock_get, mock_json, user_settings, test_date):
+@patch("src.api_utils.get_session")
+def test_get_stock_prices_exception(mock_session, mock_json, user_settings, test_date):
     mock_json.return_value = user_settings
-    mock_get.side_effect = requests.exceptions.RequestException
+    mock_session.return_value.get.side_effect = requests.exceptions.RequestException
     assert get_stock_prices(test_date) == {}
 
 
 @patch("src.api_utils.get_json_file")
-@patch("src.api_utils.requests.get")
-def test_get_stock_prices_status_code(mock_get, mock_json, user_settings, test_date):
+@patch("src.api_utils.get_session")
+def test_get_stock_prices_status_code(mock_session, mock_json, user_settings, test_date):
     mock_json.return_value = user_settings
-    mock_get.mock_get.return_value.status_code = 400
+    mock_session.return_value.get.return_value.status_code = 400
     assert get_stock_prices(test_date) == {}
+
+
+def test_get_session():
+    assert get_session() is get_session()
+
+
+def test_get_stock_prices_server(mock_api_server, test_date):
+    start = time.perf_counter()
+    result = get_stock_prices(test_date)
+    elapsed = time.perf_counter() - start
+
+    assert result == {"AAPL": 196.98, "AMZN": 172.5}
+    assert len(mock_api_server.requests) == 1
+    assert elapsed < 2 * mock_api_server.delay
+
+
+def test_get_stock_prices_server_chunks(mock_api_server, user_settings, test_date):
+    user_settings["user_stocks"] = ["AAPL", "AMZN", "IBM"]
+    mock_api_server.stock_prices["IBM"] = 250.0
+
+    with patch("src.api_utils.API_STOCKS_BATCH_SIZE", 2):
+        result = get_stock_prices(test_date)
+
+    assert result == {"AAPL": 196.98, "AMZN": 172.5, "IBM": 250.0}
+    assert sorted(request["params"]["symbol"] for request in mock_api_server.requests) == ["AAPL,AMZN", "IBM"]
+
+
+def test_get_stock_prices_server_partial(mock_api_server, test_date):
+    del mock_api_server.stock_prices["AMZN"]
+    assert get_stock_prices(test_date) == {"AAPL": 196.98}
+
+
+def test_get_market_data_server(mock_api_server, test_date):
+    start = time.perf_counter()
+    currency_rates, stock_prices = get_market_data(test_date)
+    elapsed = time.perf_counter() - start
+
+    assert currency_rates == {"USD": 80.0, "EUR": 90.91}
+    assert stock_prices == {"AAPL": 196.98, "AMZN": 172.5}
+    assert len(mock_api_server.requests) == 2
+    assert elapsed < 2 * mock_api_server.delay
+
+
+def test_get_market_data_cached(mock_api_server, test_date):
+    first = get_market_data(test_date)
+    second = get_market_data(test_date)
+
+    assert first == second
+    assert len(mock_api_server.requests) == 2
+
+
+def test_get_stock_prices_cached_partial(mock_api_server, quote_cache, test_date):
+    quote_cache.set("stock", "AMZN", "2020-01-01", 170.0)
+
+    assert get_stock_prices(test_date) == {"AAPL": 196.98, "AMZN": 170.0}
+    assert [request["params"]["symbol"] for request in mock_api_server.requests] == ["AAPL"]
+
+
+def test_get_currency_rates_cached_partial(mock_api_server, quote_cache, test_date):
+    quote_cache.set("currency", "USD", "2020-01-01", 75.0)
+
+    assert get_currency_rates(test_date) == {"USD": 75.0, "EUR": 90.91}
+    assert mock_api_server.requests[0]["params"]["symbols"] == "EUR"
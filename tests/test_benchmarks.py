@@ -0,0 +1,52 @@
+import json
+import os
+
+import pandas as pd
+
+from benchmarks.ledger import generate_ledger, get_source_operations
+from benchmarks.run import compare_results, run_benchmarks, save_results
+from src.config import DATE_FORMAT, DATE_TRANSACTIONS_KEY
+
+
+def test_generate_ledger():
+    df = generate_ledger(500, seed=1)
+    dates = pd.to_datetime(df[DATE_TRANSACTIONS_KEY], format=DATE_FORMAT)
+
+    assert len(df) == 500
+    assert list(df.columns) == list(get_source_operations().columns)
+    assert dates.is_monotonic_decreasing
+    assert generate_ledger(500, seed=1).equals(df)
+
+
+def test_run_benchmarks(tmp_path):
+    results = run_benchmarks([300], repeat=1, excel_max_size=0)
+    items = {item["name"]: item for item in results["results"]}
+
+    assert items["read_transactions_from_excel[cold]"] == {
+        "name": "read_transactions_from_excel[cold]",
+        "size": 300,
+        "skipped": True,
+    }
+    assert len(items["get_data_events"]["runs"]) == 1
+    assert items["get_total_amount_for_card"]["median"] >= 0.0
+
+    file_path = save_results(results, os.path.join(tmp_path, "results.json"))
+    with open(file_path, encoding="utf-8") as f:
+        assert json.load(f)["results"] == results["results"]
+
+
+def test_compare_results():
+    base = {
+        "commit": "a",
+        "results": [{"name": "x", "size": 10, "median": 1.0}, {"name": "y", "size": 10, "median": 1}],
+    }
+    new = {
+        "commit": "b",
+        "results": [{"name": "x", "size": 10, "median": 2.0}, {"name": "y", "size": 10, "median": 1}],
+    }
+
+    lines = compare_results(base, new)
+
+    assert len(lines) == 3
+    assert lines[1].endswith("регрессия")
+    assert not lines[2].endswith("регрессия")
@@ -0,0 +1,86 @@
+import os
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.cache_utils import get_appends_path, get_cache_path, load_appended_dfs, read_excel_cached, save_appended_df
+
+
+def test_get_cache_path_file_not_found():
+    assert get_cache_path("") is None
+
+
+def test_get_cache_path_changes_with_file(tmp_path):
+    file_path = tmp_path / "operations.xlsx"
+    file_path.write_bytes(b"1")
+    first = get_cache_path(str(file_path))
+
+    file_path.write_bytes(b"12")
+    second = get_cache_path(str(file_path))
+
+    assert first != second
+    assert os.path.basename(first).split("_")[0] == os.path.basename(second).split("_")[0]
+
+
+def test_read_excel_cached(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        with patch("pandas.read_excel", wraps=pd.read_excel) as mock_xlsx:
+            first = read_excel_cached(str(file_path))
+            second = read_excel_cached(str(file_path))
+
+    mock_xlsx.assert_called_once()
+    assert first.equals(second)
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+
+def test_read_excel_cached_invalidate(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        read_excel_cached(str(file_path))
+        pd.concat([good_df, good_df]).to_excel(file_path, index=False)
+        result = read_excel_cached(str(file_path))
+
+    assert len(result) == 2
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+
+@patch("src.cache_utils.pd.read_pickle")
+def test_read_excel_cached_broken_cache(mock_pickle, tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+    mock_pickle.side_effect = EOFError
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        read_excel_cached(str(file_path))
+        result = read_excel_cached(str(file_path))
+
+    assert len(result) == 1
+
+
+def test_save_appended_df(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    file_path.write_bytes(b"1")
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        save_appended_df(good_df, str(file_path))
+        save_appended_df(good_df.iloc[:0], str(file_path))
+        appended = load_appended_dfs(str(file_path))
+        old_appends_path = get_appends_path(str(file_path))
+
+        file_path.write_bytes(b"12")
+        assert load_appended_dfs(str(file_path)) == []
+        save_appended_df(good_df, str(file_path))
+
+    assert [len(df) for df in appended] == [1, 0]
+    assert appended[0].equals(good_df)
+    assert not os.path.exists(old_appends_path)
+
+
+def test_appended_df_file_not_found(tmp_path, good_df):
+    assert load_appended_dfs(str(tmp_path / "missing.xlsx")) == []
+    save_appended_df(good_df, str(tmp_path / "missing.xlsx"))
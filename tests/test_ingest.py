@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.ingest import get_fingerprints, get_new_operations, ingest_operations
+from src.transaction_store import TransactionStore, clear_stores, get_store
+
+
+@pytest.fixture(autouse=True)
+def clean_stores():
+    clear_stores()
+    yield
+    clear_stores()
+
+
+@pytest.fixture
+def operations(dataframe_tr):
+    return TransactionStore(dataframe_tr.fillna(value="")).df
+
+
+def test_get_fingerprints(operations):
+    columns = list(operations.columns)
+    fingerprints = get_fingerprints(operations, columns)
+
+    assert len(set(fingerprints.tolist())) == 5
+    assert get_fingerprints(operations.astype({"MCC": object}).iloc[:1], columns)[0] == fingerprints[0]
+    assert get_fingerprints(operations.iloc[:0], columns).tolist() == []
+
+
+def test_get_new_operations(operations):
+    store = TransactionStore(operations.iloc[2:])
+
+    result = get_new_operations(store, operations)
+
+    assert result.to_dict("records") == operations.iloc[:2].to_dict("records")
+
+
+def test_get_new_operations_overlap(operations):
+    store = TransactionStore(operations.iloc[[0, 2, 3, 4]])
+    export = pd.concat([operations, operations.iloc[[4]]])
+
+    result = get_new_operations(store, export)
+
+    assert result.to_dict("records") == operations.iloc[[1, 4]].to_dict("records")
+
+
+def test_get_new_operations_empty_store(operations):
+    export = operations.copy()
+    export.loc[0, "Дата операции"] = ""
+
+    result = get_new_operations(TransactionStore(pd.DataFrame()), export)
+
+    assert len(result) == 4
+
+
+def test_ingest_operations(tmp_path, operations):
+    file_path = tmp_path / "operations.xlsx"
+    export_path = tmp_path / "export.xlsx"
+    operations.iloc[2:].to_excel(file_path, index=False)
+    operations.iloc[:3].to_excel(export_path, index=False)
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        assert ingest_operations(str(export_path), str(file_path)) == 2
+        assert ingest_operations(str(export_path), str(file_path)) == 0
+        assert ingest_operations(str(tmp_path / "missing.xlsx"), str(file_path)) == 0
+        store = get_store(str(file_path))
+
+    assert store.records == TransactionStore(operations).records
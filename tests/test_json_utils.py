@@ -0,0 +1,55 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from src.json_utils import to_json, write_json
+
+
+@pytest.fixture
+def data():
+    return [{"Описание": "Иван С.", "Сумма": -3000.0, "MCC": None}, {"Описание": "Магнит\nТЦ", "Сумма": 1}]
+
+
+def test_to_json_pretty(data):
+    assert to_json(data) == json.dumps(data, indent=4, ensure_ascii=False)
+
+
+def test_to_json_compact(data):
+    result = to_json(data, pretty=False)
+
+    assert "\n" not in result.replace("\\n", "")
+    assert "Иван" in result
+    assert json.loads(result) == data
+    assert json.loads(to_json({"a": np.float64(1.5)}, pretty=False)) == {"a": 1.5}
+
+
+def test_to_json_compact_non_str_keys():
+    data = {2024: {1: 10.0}, "x": 1}
+
+    assert to_json(data, pretty=False) == json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+@pytest.mark.parametrize("size", [0, 1, 2])
+def test_write_json(data, pretty, size):
+    file = io.StringIO()
+
+    assert write_json(iter(data[:size]), file, pretty) == size
+    assert json.loads(file.getvalue()) == data[:size]
+    if pretty:
+        assert file.getvalue() == to_json(data[:size])
+
+
+def test_write_json_stdout(capsys):
+    write_json([1, 2])
+    assert capsys.readouterr().out == "[1,2]"
+
+
+def test_write_json_compact_chunks(monkeypatch):
+    monkeypatch.setattr("src.json_utils.COMPACT_CHUNK_SIZE", 2)
+    items = [{"a": i} for i in range(5)]
+    file = io.StringIO()
+    assert write_json(items, file) == 5
+    assert json.loads(file.getvalue()) == items
@@ -1,19 +1,34 @@
 import logging
 import os
+import threading
+from logging.handlers import QueueHandler
 from unittest.mock import patch
 
-from src.loggers import FORMAT_DATE_LOG, FORMAT_LOG, create_logger
+import pytest
+
+from src.loggers import (
+    FORMAT_DATE_LOG,
+    FORMAT_LOG,
+    RoutingHandler,
+    create_logger,
+    get_file_handler,
+    start_listener,
+    stop_listener,
+)
 
 
 def test_create_logger():
     tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
 
     logger = create_logger("test", tmp_path, logging.DEBUG)
-    handler = logger.handlers[0]
+    handler = get_file_handler("test")
+    assert isinstance(handler, logging.FileHandler)
     formatter = handler.formatter
 
     assert logger.name == "test"
     assert logger.level == logging.DEBUG
+    assert len(logger.handlers) == 1
+    assert isinstance(logger.handlers[0], QueueHandler)
 
     assert handler.baseFilename == tmp_path
     assert handler.mode == "w"
@@ -30,3 +45,83 @@ def test_create_logger_without_path(mock_exists, mock_makedirs):
     tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
 
     create_logger("test", tmp_path, logging.DEBUG)
+
+    mock_makedirs.assert_called_once()
+
+
+def test_create_logger_twice():
+    tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
+
+    create_logger("test", tmp_path, logging.DEBUG)
+    logger = create_logger("test", tmp_path, logging.DEBUG)
+
+    assert len(logger.handlers) == 1
+
+
+def test_create_logger_writes_in_background():
+    tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
+
+    logger = create_logger("test", tmp_path, logging.DEBUG)
+    logger.info("Сообщение %s", "из теста")
+    stop_listener()
+
+    with open(tmp_path, encoding="utf-8") as f:
+        content = f.read()
+    assert "test_loggers.test_create_logger_writes_in_background - INFO: Сообщение из теста" in content
+
+
+def test_create_logger_level_from_settings():
+    tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
+
+    with patch.dict("src.loggers.LOG_LEVELS", {"test": "WARNING"}):
+        logger = create_logger("test", tmp_path, logging.DEBUG)
+
+    assert logger.level == logging.WARNING
+    assert not logger.isEnabledFor(logging.INFO)
+
+
+@pytest.mark.parametrize("level", ["warning", logging.WARNING])
+def test_create_logger_level_normalized(level):
+    tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
+
+    with patch.dict("src.loggers.LOG_LEVELS", {"test": level}):
+        logger = create_logger("test", tmp_path, logging.DEBUG)
+
+    assert logger.level == logging.WARNING
+    assert get_file_handler("test").level == logging.WARNING
+
+
+def test_create_logger_writes_after_stop():
+    tmp_path = os.path.join(os.path.dirname(__file__), "test.log")
+
+    logger = create_logger("test", tmp_path, logging.DEBUG)
+    stop_listener()
+    logger.info("Сообщение после остановки")
+    get_file_handler("test").flush()
+
+    with open(tmp_path, encoding="utf-8") as f:
+        content = f.read()
+    start_listener()
+    assert "INFO: Сообщение после остановки" in content
+
+
+def test_routing_handler_closes_under_lock():
+    routing_handler = RoutingHandler()
+    old_handler = logging.NullHandler()
+    acquired = []
+
+    def try_acquire():
+        acquired.append(routing_handler.lock.acquire(blocking=False))
+        if acquired[-1]:
+            routing_handler.lock.release()
+
+    def close():
+        thread = threading.Thread(target=try_acquire)
+        thread.start()
+        thread.join()
+
+    old_handler.close = close
+    routing_handler.set_handler("test", old_handler)
+    routing_handler.set_handler("test", logging.NullHandler())
+
+    assert acquired == [False]
@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.quote_cache import QuoteCache
+
+
+def test_quote_cache_get_set():
+    cache = QuoteCache()
+    cache.set("stock", "AAPL", "2025-04-17", 196.98)
+
+    assert cache.get("stock", "AAPL", "2025-04-17") == 196.98
+    assert cache.get("stock", "AAPL", "2025-04-18") is None
+    assert cache.get_many("stock", ["AAPL", "AMZN"], "2025-04-17") == {"AAPL": 196.98}
+
+
+@patch("src.quote_cache.time.time")
+def test_quote_cache_ttl(mock_time):
+    cache = QuoteCache(ttl=60)
+    mock_time.return_value = 1000.0
+    cache.set("currency", "USD", "2025-04-17", 80.0)
+
+    mock_time.return_value = 1060.0
+    assert cache.get("currency", "USD", "2025-04-17") == 80.0
+
+    mock_time.return_value = 1061.0
+    assert cache.get("currency", "USD", "2025-04-17") is None
+    assert len(cache) == 0
+
+
+def test_quote_cache_lru():
+    cache = QuoteCache(max_size=2)
+    cache.set("stock", "AAPL", "2025-04-17", 1.0)
+    cache.set("stock", "AMZN", "2025-04-17", 2.0)
+    cache.get("stock", "AAPL", "2025-04-17")
+    cache.set("stock", "IBM", "2025-04-17", 3.0)
+
+    assert cache.get("stock", "AMZN", "2025-04-17") is None
+    assert cache.get("stock", "AAPL", "2025-04-17") == 1.0
+    assert cache.get("stock", "IBM", "2025-04-17") == 3.0
+
+
+def test_quote_cache_persistence(tmp_path):
+    file_path = str(tmp_path / "quotes_cache.json")
+    cache = QuoteCache(file_path)
+    cache.set_many("stock", {"AAPL": 196.98, "AMZN": 172.5}, "2025-04-17")
+
+    loaded = QuoteCache(file_path)
+    assert loaded.get_many("stock", ["AAPL", "AMZN"], "2025-04-17") == {"AAPL": 196.98, "AMZN": 172.5}
+
+
+def test_quote_cache_load_expired(tmp_path):
+    file_path = tmp_path / "quotes_cache.json"
+    file_path.write_text(json.dumps({"stock:AAPL:2025-04-17": [196.98, 0.0]}), encoding="utf-8")
+
+    assert len(QuoteCache(str(file_path))) == 0
+
+
+def test_quote_cache_load_broken(tmp_path):
+    file_path = tmp_path / "quotes_cache.json"
+    file_path.write_text("{", encoding="utf-8")
+
+    assert len(QuoteCache(str(file_path))) == 0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [["stock:AAPL:2025-04-17", 196.98]],
+        {"stock:AAPL:2025-04-17": [196.98]},
+        {"stock:AAPL:2025-04-17": 196.98},
+        {"stock:AAPL:2025-04-17": ["abc", 1.0]},
+        {"stock:AAPL:2025-04-17": [None, 1.0]},
+    ],
+)
+def test_quote_cache_load_invalid(tmp_path, data):
+    file_path = tmp_path / "quotes_cache.json"
+    file_path.write_text(json.dumps(data), encoding="utf-8")
+
+    assert len(QuoteCache(str(file_path))) == 0
+
+
+def test_quote_cache_load_skips_invalid(tmp_path):
+    file_path = tmp_path / "quotes_cache.json"
+    now = time.time()
+    data = {"stock:AAPL:2025-04-17": [196.98, now], "stock:AMZN:2025-04-17": ["abc", now]}
+    file_path.write_text(json.dumps(data), encoding="utf-8")
+
+    cache = QuoteCache(str(file_path))
+    assert cache.get_many("stock", ["AAPL", "AMZN"], "2025-04-17") == {"AAPL": 196.98}
+
+
+def test_quote_cache_save_threads(tmp_path):
+    file_path = str(tmp_path / "quotes_cache.json")
+    cache = QuoteCache(file_path)
+
+    def worker(n):
+        for i in range(20):
+            cache.set_many("stock", {f"S{n}_{i}": float(i)}, "2025-04-17")
+
+    with patch("src.quote_cache.logger") as mock_logger:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    mock_logger.error.assert_not_called()
+    assert not os.path.exists(f"{file_path}.tmp")
+    assert len(QuoteCache(file_path)) == 160
@@ -0,0 +1,201 @@
+import json
+import os
+import pickle
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.report_writer import ReportWriter, get_content_hash, write_atomic
+
+
+@pytest.fixture
+def report_writer(tmp_path):
+    report_writer = ReportWriter(str(tmp_path / "reports"))
+    yield report_writer
+    report_writer.stop()
+
+
+def test_write_atomic(tmp_path):
+    file_path = str(tmp_path / "reports" / "test.json")
+
+    write_atomic(file_path, b"[1]")
+    write_atomic(file_path, b"[2]")
+
+    with open(file_path, "rb") as f:
+        assert f.read() == b"[2]"
+    assert os.listdir(tmp_path / "reports") == ["test.json"]
+
+
+def test_write_atomic_err(tmp_path):
+    file_path = str(tmp_path / "test.json")
+    write_atomic(file_path, b"[1]")
+
+    with patch("src.report_writer.os.replace", side_effect=OSError):
+        with pytest.raises(OSError):
+            write_atomic(file_path, b"[2]")
+
+    with open(file_path, "rb") as f:
+        assert f.read() == b"[1]"
+    assert os.listdir(tmp_path) == ["test.json"]
+
+
+def test_report_writer_submit(report_writer, tmp_path):
+    file_path = report_writer.submit("test.json", {"Красота": 337.0})
+    report_writer.flush()
+
+    assert file_path == os.path.join(str(tmp_path / "reports"), "test.json")
+    with open(file_path, encoding="utf-8") as f:
+        content = f.read()
+    assert content == json.dumps({"Красота": 337.0}, ensure_ascii=False, indent=4)
+
+
+@pytest.mark.parametrize(
+    "report_format, file_name, load",
+    [
+        ("compact", "test.json", lambda f: json.loads(f.read())),
+        ("pickle", "test.pkl", pickle.load),
+    ],
+)
+def test_report_writer_formats(report_writer, tmp_path, report_format, file_name, load):
+    report_writer.submit("test.json", {"Красота": 337.0}, report_format)
+    report_writer.flush()
+
+    with open(tmp_path / "reports" / file_name, "rb") as f:
+        assert load(f) == {"Красота": 337.0}
+
+
+def test_report_writer_unknown_format(report_writer):
+    with pytest.raises(ValueError):
+        report_writer.submit("test.json", {}, "xml")
+
+
+def test_report_writer_unchanged(tmp_path):
+    report_writer = ReportWriter(str(tmp_path), background=False)
+    file_path = str(tmp_path / "test.json")
+
+    assert report_writer.write(file_path, {"a": 1}, "json")
+    assert not report_writer.write(file_path, {"a": 1}, "json")
+    assert ReportWriter(str(tmp_path), background=False).write(file_path, {"a": 1}, "json") is False
+
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("{}")
+    assert report_writer.write(file_path, {"a": 1}, "json")
+    with patch("src.report_writer.write_atomic") as mock_write:
+        report_writer.write(file_path, {"a": 1}, "json")
+    mock_write.assert_not_called()
+
+
+def test_report_writer_err(tmp_path):
+    report_writer = ReportWriter(str(tmp_path), background=False)
+
+    assert not report_writer.write(str(tmp_path / "test.json"), {"a": {1, 2}}, "json")
+    with patch("src.report_writer.write_atomic", side_effect=OSError):
+        assert not report_writer.write(str(tmp_path / "test.json"), {"a": 1}, "json")
+    assert os.listdir(tmp_path) == []
+
+
+def test_report_writer_last_write_wins(report_writer, tmp_path):
+    event = threading.Event()
+    write = report_writer.write
+
+    def slow_write(*args):
+        event.wait()
+        return write(*args)
+
+    with patch.object(report_writer, "write", side_effect=slow_write) as mock_write:
+        report_writer.submit("first.json", [0])
+        for number in range(1, 5):
+            report_writer.submit("test.json", [number])
+        event.set()
+        report_writer.flush()
+
+    assert mock_write.call_count == 2
+    with open(tmp_path / "reports" / "test.json", encoding="utf-8") as f:
+        assert json.load(f) == [4]
+
+
+def test_report_writer_concurrent(report_writer, tmp_path):
+    def submit(number):
+        for _ in range(20):
+            report_writer.submit("test.json", {"number": number, "items": list(range(1000))})
+
+    threads = [threading.Thread(target=submit, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report_writer.flush()
+
+    with open(tmp_path / "reports" / "test.json", encoding="utf-8") as f:
+        assert json.load(f)["items"] == list(range(1000))
+    assert os.listdir(tmp_path / "reports") == ["test.json"]
+
+
+class Unpicklable:
+    def __reduce__(self):
+        raise RuntimeError("unpicklable")
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_report_writer_worker_err(report_writer, tmp_path):
+    report_writer.submit("bad.json", Unpicklable(), "pickle")
+    report_writer.submit("test.json", [1])
+    report_writer.flush()
+
+    assert not os.path.exists(tmp_path / "reports" / "bad.pkl")
+    assert os.path.exists(tmp_path / "reports" / "test.json")
+
+    with patch.object(report_writer, "write", side_effect=SystemExit):
+        report_writer.submit("stopped.json", [2])
+        thread = report_writer._thread
+        report_writer.flush()
+        thread.join()
+    report_writer.submit("test.json", [3])
+    report_writer.flush()
+
+    with open(tmp_path / "reports" / "test.json", encoding="utf-8") as f:
+        assert json.load(f) == [3]
+
+
+def test_report_writer_stop(tmp_path):
+    report_writer = ReportWriter(str(tmp_path))
+    report_writer.submit("test.json", [1])
+    report_writer.stop()
+
+    assert os.path.exists(tmp_path / "test.json")
+    report_writer.submit("test.json", [2])
+    report_writer.stop()
+    with open(tmp_path / "test.json", encoding="utf-8") as f:
+        assert json.load(f) == [2]
+
+
+def test_report_writer_submit_while_stopping(report_writer, tmp_path):
+    event = threading.Event()
+    write = report_writer.write
+
+    def slow_write(*args):
+        event.wait()
+        return write(*args)
+
+    with patch.object(report_writer, "write", side_effect=slow_write):
+        report_writer.submit("first.json", [1])
+        stop_thread = threading.Thread(target=report_writer.stop)
+        stop_thread.start()
+        while report_writer._queue.qsize() == 0:
+            time.sleep(0.001)
+        report_writer.submit("second.json", [2])
+        event.set()
+        stop_thread.join(timeout=5)
+        assert not stop_thread.is_alive()
+        report_writer.flush()
+
+    assert os.path.exists(tmp_path / "reports" / "first.json")
+    with open(tmp_path / "reports" / "second.json", encoding="utf-8") as f:
+        assert json.load(f) == [2]
+
+
+def test_get_content_hash():
+    assert get_content_hash(b"[1]") == get_content_hash(b"[1]")
+    assert get_content_hash(b"[1]") != get_content_hash(b"[2]")
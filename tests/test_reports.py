@@ -1,31 +1,57 @@
+import json
 from unittest.mock import patch
 
 import pandas as pd
+import pytest
 
-from src.reports import log_reports_to_file, spending_by_category, spending_by_weekday, spending_by_workday
+from src.report_writer import ReportWriter
+from src.reports import (
+    log_reports_to_file,
+    spending_by_categories,
+    spending_by_category,
+    spending_by_weekday,
+    spending_by_workday,
+    spending_rolling,
+)
+from src.transaction_store import TransactionStore
 
 
-@patch("src.reports.json.dump")
-@patch("builtins.open")
-def test_log_reports_to_file(mock_file, mock_json, df_test):
+@pytest.fixture(autouse=True)
+def report_writer(tmp_path):
+    report_writer = ReportWriter(str(tmp_path))
+    with patch("src.reports.get_report_writer", return_value=report_writer):
+        yield report_writer
+    report_writer.stop()
+
+
+def test_log_reports_to_file(report_writer, df_test, tmp_path):
     @log_reports_to_file("test.json")
     def foo():
         return df_test
 
     assert foo().equals(df_test)
-    mock_file.assert_called_once()
-    mock_json.assert_called_once()
+    report_writer.flush()
+    with open(tmp_path / "test.json", encoding="utf-8") as f:
+        assert json.load(f) == {str(key): value for key, value in df_test["Сумма операции"].to_dict().items()}
 
 
-@patch("builtins.open")
-def test_log_reports_to_file_err(mock_file, df_test):
-    @log_reports_to_file("test.json")
+def test_log_reports_to_file_format(report_writer, df_test, tmp_path):
+    @log_reports_to_file("test.json", column=None, report_format="pickle")
+    def foo():
+        return df_test[["Категория"]]
+
+    foo()
+    report_writer.flush()
+    assert pd.read_pickle(tmp_path / "test.pkl") == df_test[["Категория"]].to_dict()
+
+
+def test_log_reports_to_file_err(df_test, tmp_path):
+    @log_reports_to_file("test.json", report_format="xml")
     def foo():
         return df_test
 
-    mock_file.side_effect = FileNotFoundError
     assert foo().equals(df_test)
-    mock_file.assert_called_once()
+    assert list(tmp_path.iterdir()) == []
 
 
 def test_spending_by_category(df_test):
@@ -54,3 +80,87 @@ def test_spending_by_workday(df_test):
     expected_df.index.name = "type_day"
 
     pd.testing.assert_frame_equal(result_df, expected_df, check_dtype=False)  # Игнорируем различия типов
+
+
+def test_reports_on_typed_frame(df_test):
+    store = TransactionStore(df_test.copy())
+    typed_df = store.typed_df
+    columns = list(typed_df.columns)
+
+    with patch("src.reports_utils.pd.to_datetime") as mock_to_datetime:
+        by_category = spending_by_category(typed_df, "Красота", "2018-02-01")
+        by_weekday = spending_by_weekday(typed_df, "2018-02-01")
+        by_workday = spending_by_workday(typed_df, "2018-02-01")
+    mock_to_datetime.assert_not_called()
+
+    assert by_category.equals(spending_by_category(df_test, "Красота", "2018-02-01"))
+    assert by_weekday.equals(spending_by_weekday(df_test, "2018-02-01"))
+    assert by_workday.equals(spending_by_workday(df_test, "2018-02-01"))
+    assert list(typed_df.columns) == columns
+
+
+def test_spending_by_categories(df_test):
+    result_df = spending_by_categories(df_test, dates=["2018-02-01", "2018-01-02"])
+
+    expected_df = pd.DataFrame(
+        {"2018-02-01": [337.0, 3000.0, 73.06], "2018-01-02": [316.0, 3000.0, 0.0]},
+        index=pd.Index(["Красота", "Переводы", "Супермаркеты"], name="Категория"),
+    )
+    pd.testing.assert_frame_equal(result_df, expected_df)
+    for category in expected_df.index:
+        by_category = spending_by_category(df_test, category, "2018-02-01")
+        assert by_category.loc[category, "Сумма операции"] == result_df.loc[category, "2018-02-01"]
+
+
+def test_spending_by_categories_repeated_dates(df_test):
+    result_df = spending_by_categories(df_test, dates=["2018-02-01", "2018-01-02", "2018-02-01"])
+
+    assert list(result_df.columns) == ["2018-02-01", "2018-01-02"]
+    pd.testing.assert_frame_equal(result_df, spending_by_categories(df_test, dates=["2018-02-01", "2018-01-02"]))
+
+
+def test_spending_by_categories_selected(df_test):
+    result_df = spending_by_categories(df_test, {"Красота", "Нет"}, ["2018-02-01"])
+
+    assert result_df.to_dict() == {"2018-02-01": {"Красота": 337.0, "Нет": 0.0}}
+
+
+def test_spending_by_categories_empty(df_test):
+    result_df = spending_by_categories(df_test, dates=["2000-01-01"])
+
+    assert result_df.empty
+    assert list(result_df.columns) == ["2000-01-01"]
+
+
+def test_spending_rolling(df_test):
+    result_df = spending_rolling(df_test, "2018-01-01", "2018-03-01")
+
+    assert list(result_df.columns) == ["2018-01-01", "2018-02-01", "2018-03-01"]
+    assert result_df.index.name == "Категория"
+    for date in result_df.columns:
+        expected = spending_by_categories(df_test, dates=[date])[date]
+        assert result_df[date].loc[expected.index].equals(expected)
+    assert result_df.loc["Красота", "2018-02-01"] == 337.0
+
+
+def test_spending_rolling_weekday(df_test):
+    result_df = spending_rolling(df_test, "2018-01-29", "2018-02-05", by="weekday", freq="week")
+
+    assert list(result_df.columns) == ["2018-01-29", "2018-02-05"]
+    assert list(result_df.index) == ["Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье"]
+    for date in result_df.columns:
+        expected = spending_by_weekday(df_test, date)["Сумма операции"]
+        assert result_df[date].loc[expected.index].equals(expected)
+    assert result_df["2018-01-29"].sum() == 3410.06
+
+
+def test_spending_rolling_workday(df_test):
+    result_df = spending_rolling(df_test, "2018-02-01", "2018-02-01", by="workday")
+
+    assert result_df.to_dict() == {"2018-02-01": {"Рабочий день": 3410.06, "Выходной день": 0.0}}
+
+
+@pytest.mark.parametrize("kwargs", [{"by": "month"}, {"freq": "day"}])
+def test_spending_rolling_err(df_test, kwargs):
+    with pytest.raises(ValueError):
+        spending_rolling(df_test, "2018-01-01", "2018-03-01", **kwargs)
@@ -1,6 +1,20 @@
 from datetime import datetime
+from unittest.mock import patch
 
-from src.reports_utils import get_dataframe_spending, get_dates_by_month
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.reports_utils import (
+    get_dataframe_spending,
+    get_dates_by_month,
+    get_rolling_sums,
+    get_rolling_windows,
+    get_spending_rows,
+    get_typed_frame,
+    get_window_positions,
+)
+from src.transaction_store import TransactionStore
 
 
 def test_get_dataframe_spending(dataframe_tr, test_date_start, test_date_end):
@@ -82,3 +96,74 @@ def test_get_dataframe_spending_incomes(dataframe_tr, test_date_start, test_date
 
 def test_get_dates_by_month():
     assert get_dates_by_month("2019-01-01") == (datetime(2018, 10, 1), datetime(2019, 1, 1))
+
+
+def test_get_typed_frame(dataframe_tr):
+    columns = list(dataframe_tr.columns)
+    typed = get_typed_frame(dataframe_tr)
+
+    assert typed["day_of_week"].dtype == np.int8
+    assert typed["Дата операции"].dt.weekday.tolist() == typed["day_of_week"].tolist()
+    assert list(dataframe_tr.columns) == columns
+    assert dataframe_tr["Дата операции"].iloc[0] == "01.01.2018 20:27:51"
+
+
+def test_get_typed_frame_store(dataframe_tr):
+    typed_df = TransactionStore(dataframe_tr).typed_df
+
+    with patch("src.reports_utils.pd.to_datetime") as mock_to_datetime:
+        assert get_typed_frame(typed_df) is typed_df
+    mock_to_datetime.assert_not_called()
+
+
+def test_get_spending_rows(dataframe_tr, test_date_start, test_date_end):
+    typed = get_typed_frame(dataframe_tr)
+
+    assert get_spending_rows(typed, test_date_start, test_date_end, "Красота").tolist() == [0, 3]
+    assert get_spending_rows(typed, test_date_start, test_date_end, "Красота", False).tolist() == [4]
+    assert get_spending_rows(typed, test_date_start, test_date_end, "Нет").tolist() == []
+
+
+def test_get_window_positions(dataframe_tr):
+    typed = get_typed_frame(dataframe_tr)
+    windows = [(datetime(2018, 1, 1), datetime(2018, 1, 2)), (datetime(2018, 1, 3), datetime(2018, 1, 31))]
+
+    window_index, positions = get_window_positions(typed, np.array([4, 0, 2]), windows)
+
+    assert window_index.tolist() == [0, 1, 1]
+    assert positions.tolist() == [1, 0, 2]
+
+    windows.append((datetime(2019, 1, 1), datetime(2019, 1, 31)))
+    window_index, positions = get_window_positions(typed, np.array([4, 0, 2]), windows)
+    assert window_index.tolist() == [0, 1, 1]
+    assert get_window_positions(typed, np.array([4, 0, 2]), [])[0].tolist() == []
+
+
+def test_get_rolling_windows():
+    assert get_rolling_windows("2018-12-15", "2019-02-01") == [
+        (datetime(2018, 10, 1), datetime(2019, 1, 1)),
+        (datetime(2018, 11, 1), datetime(2019, 2, 1)),
+    ]
+    assert get_rolling_windows("2024-03-01", "2024-03-12", "week", 1) == [
+        (datetime(2024, 2, 4), datetime(2024, 3, 4)),
+        (datetime(2024, 2, 11), datetime(2024, 3, 11)),
+    ]
+    with pytest.raises(ValueError):
+        get_rolling_windows("2024-03-01", "2024-03-12", "day")
+
+
+def test_get_rolling_sums():
+    df = pd.DataFrame(
+        {
+            "Дата операции": pd.to_datetime(
+                ["2018-01-01 00:00:00", "2018-01-10 12:00:00", "2018-02-01 00:00:00", "2018-02-01 00:00:01"]
+            ),
+            "Сумма операции": [-1.0, -2.0, -4.0, -8.0],
+        }
+    )
+    windows = [(datetime(2018, 1, 1), datetime(2018, 2, 1)), (datetime(2018, 1, 2), datetime(2018, 2, 2))]
+
+    sums = get_rolling_sums(df, np.arange(4), np.array([0, 1, 0, 1]), 2, windows)
+
+    assert sums.tolist() == [[5.0, 4.0], [2.0, 10.0]]
+    assert get_rolling_sums(df, np.arange(4), np.zeros(4, dtype=int), 1, []).shape == (1, 0)
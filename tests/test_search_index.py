@@ -0,0 +1,55 @@
+import re
+
+import numpy as np
+import pytest
+
+from src.search_index import SearchIndex, TrigramIndex, get_ngrams
+
+
+@pytest.fixture
+def index():
+    codes = np.array([0, 1, 2, 0, 1, 3], dtype=np.int32)
+    uniques = np.array(["Магнит", "Линзомат ТЦ Юность", "Перевод Иван И.", ""], dtype=object)
+    return TrigramIndex(codes, uniques)
+
+
+def test_get_ngrams():
+    assert get_ngrams("МаГн") == {"маг", "агн"}
+    assert get_ngrams("аб") == set()
+
+
+def test_trigram_index_get_candidates(index):
+    assert index.get_candidates("ГНИ").tolist() == [0]
+    assert index.get_candidates("ат").tolist() == [0, 1, 2, 3]
+    assert index.get_candidates("магнитогорск").tolist() == []
+
+
+def test_trigram_index_get_rows(index):
+    assert index.get_rows([1, 2]).tolist() == [1, 4, 2]
+    assert index.get_rows([]).tolist() == []
+
+
+@pytest.mark.parametrize(
+    "pattern, keyword, expected",
+    [
+        ("магнит", "магнит", [0, 3]),
+        ("ТЦ Юн", "ТЦ Юн", [1, 4]),
+        ("ат", "ат", [1, 4]),
+        (r"[А-ЯЁ][а-яё]+ [А-ЯЁ]\.", None, [2]),
+    ],
+)
+def test_trigram_index_search(index, pattern, keyword, expected):
+    assert index.search(re.compile(pattern, re.IGNORECASE), keyword).tolist() == expected
+
+
+def test_search_index():
+    columns = {
+        "Категория": (np.array([0, 1, 0], dtype=np.int32), np.array(["Переводы", "Такси"], dtype=object)),
+        "Описание": (np.array([0, 0, 1], dtype=np.int32), np.array(["Перевод", "Яндекс Такси"], dtype=object)),
+    }
+    search_index = SearchIndex(columns.__getitem__)
+
+    assert search_index.search("такси", {"Категория", "Описание"}).tolist() == [1, 2]
+    assert search_index.search("перевод", {"Описание"}).tolist() == [0, 1]
+    assert search_index.search("самолет", {"Категория", "Описание"}).tolist() == []
+    assert search_index.get_index("Описание") is search_index.get_index("Описание")
@@ -1,8 +1,20 @@
+import io
 import json
 from unittest.mock import patch
 
-from src.services import (get_beneficial_categories, investment_bank, search_by_phone, search_person_transfer,
-                          simple_search)
+import pandas as pd
+import pytest
+
+from src.services import (
+    dump_transactions,
+    get_beneficial_categories,
+    investment_bank,
+    investment_bank_table,
+    search_by_phone,
+    search_person_transfer,
+    simple_search,
+)
+from src.transaction_store import TransactionStore
 
 
 def test_get_beneficial_categories(list_transactions):
@@ -10,17 +22,40 @@ def test_get_beneficial_categories(list_transactions):
     assert json.loads(res_json) == {"Красота": 16.0, "Супермаркеты": 3.0}
 
 
-@patch("src.services.json.dumps")
+@patch("src.json_utils.json.dumps")
 def test_get_beneficial_categories_err(mock_json, list_transactions):
     mock_json.side_effect = [ValueError, "{}"]
     res_json = get_beneficial_categories(list_transactions, "2018", "01")
     assert json.loads(res_json) == {}
 
 
+def test_get_beneficial_categories_store(store_transactions):
+    res_json = get_beneficial_categories(store_transactions, "2018", "01")
+    assert json.loads(res_json) == {"Красота": 16.0, "Супермаркеты": 3.0}
+
+
 def test_investment_bank(list_transactions):
     assert investment_bank("2018-01", list_transactions, 50) == 89.94
 
 
+def test_investment_bank_store(store_transactions):
+    assert investment_bank("2018-01", store_transactions, 50) == 89.94
+
+
+def test_investment_bank_table(list_transactions, store_transactions):
+    res_json = investment_bank_table("2017-12", "2018-01", list_transactions, (10, 50))
+
+    assert json.loads(res_json) == {"2017-12": {"10": 0.0, "50": 0.0}, "2018-01": {"10": 19.94, "50": 89.94}}
+    assert investment_bank_table("2017-12", "2018-01", store_transactions, (10, 50)) == res_json
+    assert json.loads(investment_bank_table("2018-01", "2018-01", store_transactions))["2018-01"]["50"] == round(
+        investment_bank("2018-01", store_transactions, 50), 2
+    )
+
+
+def test_investment_bank_table_err(store_transactions):
+    assert investment_bank_table("2018-01", "2018-01", store_transactions, (0,)) == "{}"
+
+
 def test_simple_search(list_transactions):
     res_json = simple_search(list_transactions, "Линзомат")
     assert json.loads(res_json) == [
@@ -44,7 +79,13 @@ def test_simple_search(list_transactions):
     ]
 
 
-@patch("src.services.json.dumps")
+def test_simple_search_store(store_transactions):
+    res_json = simple_search(store_transactions, "Линзомат")
+    assert json.loads(res_json) == json.loads(simple_search(store_transactions.records, "Линзомат"))
+    assert len(json.loads(res_json)) == 1
+
+
+@patch("src.json_utils.json.dumps")
 def test_simple_search_err(mock_json, list_transactions):
     mock_json.side_effect = [ValueError, "{}"]
     res_json = simple_search(list_transactions, "Линзомат")
@@ -74,7 +115,30 @@ def test_search_by_phone(list_tr):
     ]
 
 
-@patch("src.services.json.dumps")
+def test_search_by_phone_store(list_tr):
+    store = TransactionStore(pd.DataFrame(list_tr))
+    expected = [tx["Описание"] for tx in json.loads(search_by_phone(list_tr))]
+    assert [tx["Описание"] for tx in json.loads(search_by_phone(store))] == expected
+
+
+def test_search_by_phone_compact_file(list_tr):
+    file = io.StringIO()
+
+    assert search_by_phone(list_tr, pretty=False, file=file) == ""
+    assert json.loads(file.getvalue()) == json.loads(search_by_phone(list_tr))
+    assert json.loads(search_by_phone(list_tr, pretty=False)) == json.loads(search_by_phone(list_tr))
+
+
+def test_dump_transactions_file_err():
+    file = io.StringIO()
+
+    with pytest.raises(TypeError):
+        dump_transactions([{"Описание": "Ок"}, {"Описание": {1, 2}}], file=file)
+    assert file.getvalue().startswith('[\n    {\n        "Описание": "Ок"\n    }')
+    assert not file.getvalue().endswith("{}")
+
+
+@patch("src.json_utils.json.dumps")
 def test_search_by_phone_err(mock_json, list_tr):
     mock_json.side_effect = [ValueError, "{}"]
     res_json = search_by_phone(list_tr)
@@ -104,7 +168,13 @@ def test_search_person_transfer(list_tr):
     ]
 
 
-@patch("src.services.json.dumps")
+def test_search_person_transfer_store(list_tr):
+    store = TransactionStore(pd.DataFrame(list_tr))
+    expected = [tx["Описание"] for tx in json.loads(search_person_transfer(list_tr))]
+    assert [tx["Описание"] for tx in json.loads(search_person_transfer(store))] == expected
+
+
+@patch("src.json_utils.json.dumps")
 def test_search_person_transfer_err(mock_json, list_tr):
     mock_json.side_effect = [ValueError, "{}"]
     res_json = search_person_transfer(list_tr)
@@ -1,4 +1,20 @@
-from src.services_utils import get_cashback_categories, get_invest_amount, get_search_by_keyword
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config import AMOUNT_ROUND_UP_KEY, INVEST_ROUND_KEY
+from src.services_utils import (
+    get_cashback_categories,
+    get_invest_amount,
+    get_invest_amounts,
+    get_invest_diffs,
+    get_invest_table,
+    get_search_by_keyword,
+    get_search_mask,
+    get_tagged_transactions,
+)
+from src.transaction import Transaction
+from src.transaction_store import TransactionStore
 
 
 def test_get_cashback_categories(list_transactions):
@@ -12,6 +28,53 @@ def test_get_invest_amount(tr_by_period):
     assert get_invest_amount(tr_by_period, 50) == 55.94
 
 
+def test_get_cashback_and_invest_amount_typed(list_transactions, tr_by_period):
+    transactions = [Transaction.from_dict(tx) for tx in list_transactions]
+
+    assert get_cashback_categories(transactions, percent_cashback=5.0) == {"Красота": 16, "Супермаркеты": 3}
+    assert get_invest_amount([Transaction.from_dict(tx) for tx in tr_by_period], 50) == 55.94
+
+
+def test_get_invest_amounts():
+    values = np.array([1075.0, 22.0, 50.0, 394.0])
+    result = get_invest_amounts(values, np.array([0, 1, 1, 0]), 3, [10, 50, 100])
+
+    assert result.tolist() == [[11.0, 31.0, 31.0], [8.0, 28.0, 128.0], [0.0, 0.0, 0.0]]
+    assert get_invest_diffs(values, [50]).ravel().tolist() == [25.0, 28.0, 0.0, 6.0]
+    with pytest.raises(ValueError):
+        get_invest_amounts(values, np.zeros(4, dtype=np.int64), 1, [0])
+
+
+def test_get_invest_table(store_transactions):
+    result = get_invest_table(store_transactions, "2018-02", "2017-12", [10, 50, 100, 30])
+
+    assert result.index.tolist() == ["2017-12", "2018-01", "2018-02"]
+    assert result.columns.tolist() == [10, 50, 100, 30]
+    assert result.loc["2018-01"].tolist() == [19.94, 89.94, 189.94, 39.94]
+    assert result.loc["2017-12"].tolist() == [0.0, 0.0, 0.0, 0.0]
+
+
+def test_get_invest_table_reconcile(list_transactions):
+    transactions = [dict(tx) for tx in list_transactions]
+    for tx in transactions:
+        tx[INVEST_ROUND_KEY] = 0
+    transactions[0][AMOUNT_ROUND_UP_KEY] += 25
+    transactions[0][INVEST_ROUND_KEY] = 25
+
+    result = get_invest_table(TransactionStore(pd.DataFrame(transactions)), "2018-01", "2018-01", reconcile=True)
+    expected = get_invest_table(TransactionStore(pd.DataFrame(list_transactions)), "2018-01", "2018-01")
+
+    assert result.columns.tolist() == [10, 50, 100, "bank"]
+    assert result[[10, 50, 100]].equals(expected)
+    assert result.loc["2018-01", "bank"] == 25.0
+
+
+def test_get_cashback_categories_store(store_transactions, list_transactions):
+    result = get_cashback_categories(store_transactions, percent_cashback=5.0)
+
+    assert result == get_cashback_categories(list_transactions, percent_cashback=5.0)
+
+
 def test_get_search_by_keyword(list_transactions):
     assert get_search_by_keyword(list_transactions, "перевод", {"Категория"}) == [
         {
@@ -32,3 +95,57 @@ def test_get_search_by_keyword(list_transactions):
             "Сумма операции с округлением": 3000.0,
         }
     ]
+
+
+def test_get_search_by_keyword_store(store_transactions):
+    store = store_transactions
+
+    for keyword in ["перевод", "ТЦ", "а", "магнит"]:
+        assert get_search_by_keyword(store, keyword, {"Категория", "Описание"}) == get_search_by_keyword(
+            store.records, keyword, {"Категория", "Описание"}
+        )
+    assert store.search_index is store.search_index
+
+
+def test_get_tagged_transactions(store_transactions):
+    store = store_transactions
+
+    assert get_tagged_transactions(store, "Продавец") == [
+        tx for tx in store.records if tx["Описание"] and tx["Описание"] != "Иван С."
+    ]
+    assert get_tagged_transactions(store, "Продавец", {"Переводы"}) == [
+        tx for tx in store.records if tx["Категория"] == "Переводы"
+    ]
+    assert get_tagged_transactions(store, "Телефон") == []
+
+
+@pytest.mark.parametrize(
+    "keyword, esc_symbols, expected",
+    [
+        ("перевод", True, [False, True, False, False, False]),
+        ("oOo", True, [True, False, False, True, True]),
+        ("ТЦ.", True, [False, False, False, False, False]),
+        (r"\d+$", False, [False, False, True, False, False]),
+        ("бассейн", True, [False, False, False, False, False]),
+    ],
+)
+def test_get_search_mask(dataframe_tr, store_transactions, keyword, esc_symbols, expected):
+    search_keys = {"Категория", "Описание", "Нет такой колонки"}
+
+    assert get_search_mask(dataframe_tr, keyword, search_keys, esc_symbols).tolist() == expected
+    store_mask = get_search_mask(store_transactions, keyword, search_keys - {"Нет такой колонки"}, esc_symbols)
+    assert store_mask.tolist() == [expected[row] for row in [4, 2, 3, 0, 1]]
+
+
+def test_get_search_by_keyword_dataframe(dataframe_tr, list_transactions):
+    result = get_search_by_keyword(dataframe_tr.fillna(value=""), "balid", {"Категория", "Описание"})
+
+    assert [tx["Дата операции"] for tx in result] == [
+        tx["Дата операции"] for tx in get_search_by_keyword(list_transactions, "balid", {"Описание"})
+    ]
+
+
+def test_get_search_by_keyword_store_regex(store_transactions):
+    result = get_search_by_keyword(store_transactions, r"\d+$", {"Описание"}, esc_symbols=False)
+
+    assert [tx["Описание"] for tx in result] == ["Magazin 25"]
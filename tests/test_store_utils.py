@@ -0,0 +1,139 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.store_utils import (
+    get_group_sums,
+    get_groups_in_order,
+    get_smallest_rows,
+    get_store_amount_for_categories,
+    get_store_top_rows,
+    get_store_top_rows_by_group,
+    get_store_total_amount,
+    get_store_total_amount_for_card,
+)
+from src.transaction_store import TransactionStore
+from src.utils import get_amount_for_categories, get_total_amount, get_total_amount_for_card
+
+
+def test_get_groups_in_order():
+    codes = np.array([2, 0, 2, 1, 0])
+    mask = np.array([False, True, True, True, True])
+
+    assert get_groups_in_order(codes, mask).tolist() == [0, 2, 1]
+
+
+def test_get_group_sums():
+    codes = np.array([2, 0, 2, 1, 0])
+    mask = np.array([True, True, False, True, True])
+
+    assert get_group_sums(codes, 4, np.array([1.0, 2.0, 3.0, 4.0, 5.0]), mask).tolist() == [7.0, 4.0, 1.0, 0.0]
+
+
+@pytest.mark.parametrize("expense", [True, False])
+@pytest.mark.parametrize("num_top_cats", [0, 1])
+@pytest.mark.parametrize("except_categories", [None, {"Переводы"}])
+def test_get_store_amount_for_categories(list_transactions, expense, num_top_cats, except_categories):
+    store = TransactionStore(pd.DataFrame(list_transactions).fillna(value=""))
+
+    result = get_store_amount_for_categories(store, expense, "OK", num_top_cats, except_categories)
+    expected = get_amount_for_categories(store.records, expense, "OK", num_top_cats, except_categories)
+
+    assert result == expected
+    assert list(result) == list(expected)
+
+
+def test_get_store_amount_for_categories_amounts(list_transactions):
+    store = TransactionStore(pd.DataFrame(list_transactions).fillna(value=""))
+
+    result = get_store_amount_for_categories(store, amounts=np.ones(len(store)))
+
+    assert list(result.items()) == [("Красота", 2.0), ("Супермаркеты", 1.0), ("Переводы", 1.0)]
+
+
+@pytest.mark.parametrize("expense", [True, False])
+def test_get_store_total_amount_for_card(list_transactions, expense):
+    store = TransactionStore(pd.DataFrame(list_transactions).fillna(value=""))
+
+    result = get_store_total_amount_for_card(store, expense)
+
+    assert result == get_total_amount_for_card(store.records, expense)
+    assert list(result) == list(get_total_amount_for_card(store.records, expense))
+
+
+def test_get_store_total_amount_for_card_same_last_digits():
+    store = TransactionStore(
+        pd.DataFrame(
+            {
+                "Дата операции": ["02.01.2018 10:00:00", "01.01.2018 10:00:00", "01.01.2018 09:00:00"],
+                "Номер карты": ["*7197", "1117197", ""],
+                "Статус": ["OK", "OK", "OK"],
+                "Сумма операции": [-10.0, -20.0, -30.0],
+                "Сумма операции с округлением": [10.0, 20.0, 30.0],
+                "Бонусы (включая кэшбэк)": [1, 2, 3],
+                "Категория": ["Фастфуд", "Фастфуд", "Фастфуд"],
+            }
+        )
+    )
+
+    assert get_store_total_amount_for_card(store) == {"7197": {"sum": 30.0, "cashback": 3.0}}
+
+
+@pytest.mark.parametrize("expense", [True, False])
+def test_get_store_total_amount(list_transactions, expense):
+    store = TransactionStore(pd.DataFrame(list_transactions).fillna(value=""))
+
+    assert get_store_total_amount(store, expense) == get_total_amount(store.records, expense)
+
+
+@pytest.mark.parametrize("expense", [True, False])
+def test_store_utils_rollup_period(list_transactions, expense):
+    store = TransactionStore(pd.DataFrame(list_transactions).fillna(value=""))
+    start_date, end_date = datetime(2018, 1, 1, 13), datetime(2018, 1, 23, 12)
+
+    period = store.rollup.get_period(start_date, end_date)
+    records = store.get_by_date_period(start_date, end_date).records
+
+    assert get_store_total_amount(period, expense) == get_total_amount(records, expense)
+    assert list(get_store_amount_for_categories(period, expense).items()) == list(
+        get_amount_for_categories(records, expense).items()
+    )
+    assert list(get_store_total_amount_for_card(period, expense).items()) == list(
+        get_total_amount_for_card(records, expense).items()
+    )
+
+
+@pytest.mark.parametrize("num", [0, 1, 2, 3, 5, 10])
+def test_get_smallest_rows(num):
+    values = np.array([3.0, 1.0, 2.0, 1.0, 3.0, 2.0, 1.0])
+
+    assert get_smallest_rows(values, num).tolist() == np.argsort(values, kind="stable")[: num or None].tolist()
+
+
+def test_get_store_top_rows(list_transactions):
+    store = TransactionStore(pd.DataFrame(list_transactions))
+    amounts = store.get_values("Сумма операции")
+
+    assert amounts[get_store_top_rows(store)].tolist() == [-3000.0, -316.0, -73.06, -21.0]
+    assert amounts[get_store_top_rows(store, num_top_cats=2)].tolist() == [-3000.0, -316.0]
+    assert amounts[get_store_top_rows(store, expense=False)].tolist() == [21.0]
+    assert amounts[get_store_top_rows(store, except_categories={"Переводы"}, num_top_cats=1)].tolist() == [-316.0]
+
+
+def test_get_store_top_rows_by_group(list_transactions):
+    store = TransactionStore(pd.DataFrame(list_transactions))
+    amounts = store.get_values("Сумма операции")
+
+    result = get_store_top_rows_by_group(store, num_top_cats=1)
+
+    assert list(result) == ["Супермаркеты", "Красота", "Переводы"]
+    assert {key: amounts[rows].tolist() for key, rows in result.items()} == {
+        "Супермаркеты": [-73.06],
+        "Красота": [-316.0],
+        "Переводы": [-3000.0],
+    }
+    result = get_store_top_rows_by_group(store, "Номер карты", num_top_cats=0)
+    assert {key: amounts[rows].tolist() for key, rows in result.items()} == {"*7197": [-316.0, -73.06, -21.0]}
+    assert get_store_top_rows_by_group(store, status="FAILED") == {}
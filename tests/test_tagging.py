@@ -0,0 +1,44 @@
+import pytest
+
+from src.tagging import get_merchant, get_person, get_phone, get_tags
+
+
+@pytest.mark.parametrize(
+    "description, expected",
+    [
+        ("Я МТС +7 921 211-22-33", "+7 921 211-22-33"),
+        ("Тинькофф Мобайл +7 995 555-55-55", "+7 995 555-55-55"),
+        ("Магнит", ""),
+    ],
+)
+def test_get_phone(description, expected):
+    assert get_phone(description) == expected
+
+
+@pytest.mark.parametrize(
+    "description, expected",
+    [("Иван С.", "Иван С."), ("Светлана Т. перевод", "Светлана Т."), ("Магнит", "")],
+)
+def test_get_person(description, expected):
+    assert get_person(description) == expected
+
+
+@pytest.mark.parametrize(
+    "description, phone, person, expected",
+    [
+        ("Магнит", "", "", "Магнит"),
+        ("Иван С.", "", "Иван С.", ""),
+        ("Я МТС +7 921 211-22-33", "+7 921 211-22-33", "", ""),
+        ("", "", "", ""),
+    ],
+)
+def test_get_merchant(description, phone, person, expected):
+    assert get_merchant(description, phone, person) == expected
+
+
+def test_get_tags():
+    assert get_tags(["Магнит", "Я МТС +7 921 211-22-33", "Иван С."]) == {
+        "Телефон": ["", "+7 921 211-22-33", ""],
+        "Получатель": ["", "", "Иван С."],
+        "Продавец": ["Магнит", "", ""],
+    }
@@ -0,0 +1,92 @@
+import sys
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from src.transaction import Transaction, as_transactions, iter_fields, to_float, to_str
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(1.5, 1.5), (3, 3.0), ("2.5", 2.5), ("", 0.0), (None, 0.0), (float("nan"), 0.0), ("abc", 0.0)],
+)
+def test_to_float(value, expected):
+    assert to_float(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [("abc", "abc"), (None, ""), (float("nan"), ""), (5411.0, "5411.0")])
+def test_to_str(value, expected):
+    assert to_str(value) == expected
+
+
+def test_transaction_from_dict(list_transactions):
+    tx = Transaction.from_dict(list_transactions[1])
+
+    assert tx.date == "01.01.2018 12:49:53"
+    assert tx.card_number == ""
+    assert tx.amount == -3000.0
+    assert tx.bank_cashback == 0.0
+    assert tx.cashback == 0.0
+    assert tx.amount_round_up == 3000.0
+    assert tx.category is sys.intern("Переводы")
+    assert tx.mcc is None
+
+
+def test_transaction_as_mapping(list_transactions):
+    tx = Transaction.from_dict(list_transactions[0])
+
+    assert tx.get("Сумма операции") == -316.0
+    assert tx["Описание"] == "OOO Balid"
+    assert tx.get("Нет такой колонки", "x") == "x"
+    with pytest.raises(KeyError):
+        tx["Нет такой колонки"]
+    assert tx.to_dict()["Категория"] == "Красота"
+    assert not hasattr(tx, "__dict__")
+
+
+def test_transaction_replace(list_transactions):
+    tx = Transaction.from_dict(list_transactions[0])
+    new_tx = tx.replace(amount_round_up=1.0)
+
+    assert new_tx.amount_round_up == 1.0
+    assert tx.amount_round_up == 316.0
+    assert new_tx.replace(amount_round_up=316.0) == tx
+
+
+def test_transaction_from_dataframe(list_transactions):
+    df = pd.DataFrame(list_transactions).fillna(value="")
+
+    transactions = Transaction.from_dataframe(df)
+
+    assert transactions == [Transaction.from_dict(tx) for tx in df.to_dict("records")]
+
+
+def test_as_transactions(list_transactions):
+    tx = Transaction.from_dict(list_transactions[0])
+    result = list(as_transactions([tx, list_transactions[1]]))
+
+    assert result[0] is tx
+    assert result[1] == Transaction.from_dict(list_transactions[1])
+
+
+@pytest.mark.parametrize("size", [1, 3, 10])
+def test_iter_fields(list_transactions, size):
+    data = [list_transactions[0], Transaction.from_dict(list_transactions[1]), *list_transactions[2:]]
+    data.append({"Сумма операции": "", "Категория": float("nan"), "Кэшбэк": "abc"})
+    keys = ["Номер карты", "Сумма операции", "Категория", "Кэшбэк", "MCC"]
+    expected = [tuple(typed.get(key) for key in keys) for typed in as_transactions(data)]
+
+    with patch("src.transaction.FIELDS_BATCH_SIZE", size):
+        result = list(iter_fields(data, keys))
+
+    assert result == expected
+    assert result[-1] == ("", 0.0, "", 0.0, "")
+
+
+def test_iter_fields_transactions(list_transactions):
+    transactions = [Transaction.from_dict(tx) for tx in list_transactions]
+
+    result = list(iter_fields(transactions, ["Сумма операции с округлением"]))
+
+    assert result == [(tx.amount_round_up,) for tx in transactions]
@@ -0,0 +1,369 @@
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.transaction import Transaction
+from src.transaction_store import (
+    TransactionStore,
+    append_to_store,
+    clear_stores,
+    extend_codes,
+    get_store,
+    get_weekdays,
+    sort_by_date,
+    to_datetime64,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_stores():
+    clear_stores()
+    yield
+    clear_stores()
+
+
+def test_transaction_store_views(dataframe_tr):
+    dataframe_tr = dataframe_tr.fillna(value="")
+    store = TransactionStore(dataframe_tr)
+    expected = dataframe_tr.iloc[[4, 2, 3, 0, 1]].to_dict("records")
+
+    assert len(store) == 5
+    assert store.records == expected
+    assert store.records is store.records
+    assert list(store.iter_records()) == expected
+
+
+def test_transaction_store_transactions(dataframe_tr):
+    dataframe_tr = dataframe_tr.fillna(value="")
+    store = TransactionStore(dataframe_tr)
+
+    assert store.transactions is store.transactions
+    assert [tx.to_dict() for tx in store.transactions] == [Transaction.from_dict(tx).to_dict() for tx in store.records]
+
+    period = store.get_by_date_period(datetime(2018, 1, 3), datetime(2018, 1, 5))
+    assert period.transactions == store.transactions[1:3]
+    assert period.transactions[0] is store.transactions[1]
+
+
+def test_transaction_store_codes(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+    codes, uniques = store.get_codes("Категория")
+
+    assert codes.dtype == np.int32
+    assert uniques[codes].tolist() == store.df["Категория"].tolist()
+    assert uniques.tolist() == ["Красота", "Супермаркеты", "Переводы"]
+    assert store.get_codes("Категория")[0] is codes
+
+    card_codes, cards = store.get_codes("Номер карты")
+    assert "" in cards.tolist()
+    assert store.get_codes("Нет такой колонки")[1].tolist() == [""]
+
+
+def test_transaction_store_values(dataframe_tr):
+    store = TransactionStore(dataframe_tr.fillna(value=""))
+    values = store.get_values("Кэшбэк")
+
+    assert values.dtype == np.float64
+    assert values.tolist() == [0.0] * 5
+    assert store.get_values("Сумма операции").tolist() == store.df["Сумма операции"].tolist()
+
+
+def test_transaction_store_take(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+    codes, uniques = store.get_codes("Категория")
+    values = store.get_values("Сумма операции")
+    transactions = store.transactions
+
+    part = store.take(np.array([0, 2, 3]))
+
+    assert part.records == [store.records[0], store.records[2], store.records[3]]
+    assert part.get_codes("Категория")[0].tolist() == codes[[0, 2, 3]].tolist()
+    assert part.get_codes("Категория")[1] is uniques
+    assert part.get_values("Сумма операции").tolist() == values[[0, 2, 3]].tolist()
+    assert part.transactions[1] is transactions[2]
+
+
+def test_transaction_store_get_by_categories(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+
+    result = store.get_by_categories({"Переводы", "Красота"})
+
+    assert result.df["Категория"].tolist() == ["Красота", "Красота", "Красота", "Переводы"]
+    assert result.dates.tolist() == store.dates[[0, 2, 3, 4]].tolist()
+    assert len(store.get_by_categories({"Нет такой категории"})) == 0
+
+
+def test_transaction_store_dates(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+
+    assert store.dates.dtype == np.dtype("datetime64[ns]")
+    assert store.dates[0] == np.datetime64("2018-01-23T14:55:21")
+    assert (np.diff(store.dates.astype("int64")) <= 0).all()
+
+
+def test_transaction_store_typed_df(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+
+    assert pd.api.types.is_datetime64_any_dtype(store.typed_df["Дата операции"])
+    assert store.df["Дата операции"].iloc[0] == "23.01.2018 14:55:21"
+    assert store.typed_df["day_of_week"].dtype == np.int8
+    assert store.typed_df["day_of_week"].tolist() == [1, 2, 2, 0, 0]
+    assert "day_of_week" not in store.df.columns
+
+
+def test_get_weekdays():
+    dates = np.array(["1970-01-01", "2024-03-04", "1969-12-28", "NaT"], dtype="datetime64[ns]")
+
+    assert get_weekdays(dates).tolist() == [3, 0, 6, -1]
+
+
+def test_sort_by_date_sorted(dataframe_tr):
+    df = dataframe_tr.iloc[[4, 2, 3, 0, 1]].reset_index(drop=True)
+    dates = pd.to_datetime(df["Дата операции"], dayfirst=True).to_numpy()
+
+    assert sort_by_date(df, dates)[0] is df
+
+
+def test_get_by_date_period(dataframe_tr, tr_by_period):
+    store = TransactionStore(dataframe_tr)
+
+    assert store.get_by_date_period(datetime(2018, 1, 3), datetime(2018, 1, 5)).records == tr_by_period
+    assert store.get_by_date_period(datetime(2018, 1, 5), datetime(2018, 1, 3)).records == tr_by_period
+    assert len(store.get_by_date_period(datetime.min, datetime(2018, 1, 31))) == 5
+
+
+def test_get_by_date_period_bounds(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+
+    result = store.get_by_date_period(datetime(2018, 1, 3, 14, 55, 21), datetime(2018, 1, 23, 14, 55, 21))
+    assert [tx["Дата операции"] for tx in result.records] == [
+        "23.01.2018 14:55:21",
+        "03.01.2018 15:03:35",
+        "03.01.2018 14:55:21",
+    ]
+    assert len(store.get_by_date_period(datetime(2019, 1, 1), datetime(2019, 2, 1))) == 0
+
+
+def test_get_by_date_period_without_dates(dataframe_tr):
+    dataframe_tr.loc[0, "Дата операции"] = ""
+    store = TransactionStore(dataframe_tr)
+
+    assert len(store.date_keys) == 4
+    assert len(store.get_by_date_period(datetime.min, datetime.max)) == 4
+
+
+def test_get_by_date_period_nested(dataframe_tr, tr_by_period):
+    store = TransactionStore(dataframe_tr).get_by_date_period(datetime(2018, 1, 1), datetime(2018, 1, 10))
+
+    assert store.get_by_date_period(datetime(2018, 1, 3), datetime(2018, 1, 5)).records == tr_by_period
+
+
+def test_daily_rollup(dataframe_tr):
+    store = TransactionStore(dataframe_tr)
+    rollup = store.rollup
+
+    assert store.rollup is rollup
+    assert store.build_rollup() is rollup
+    assert len(rollup) == 5
+    assert rollup.days.tolist() == sorted(rollup.days.tolist())
+    assert rollup.counts.sum() == 5
+    assert rollup.values["Сумма операции"].sum() == store.get_values("Сумма операции").sum()
+
+
+def test_daily_rollup_merges_cells():
+    store = TransactionStore(
+        pd.DataFrame(
+            {
+                "Дата операции": ["01.01.2018 12:00:00", "01.01.2018 10:00:00", "01.01.2018 09:00:00"],
+                "Статус": ["OK", "OK", "OK"],
+                "Сумма операции": [-10.0, -5.0, 3.0],
+                "Сумма операции с округлением": [10.0, 5.0, 3.0],
+                "Категория": ["Красота", "Красота", "Красота"],
+            }
+        )
+    )
+
+    assert store.rollup.counts.tolist() == [2, 1]
+    assert store.rollup.values["Сумма операции с округлением"].tolist() == [15.0, 3.0]
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        (datetime(2018, 1, 1), datetime(2018, 1, 31)),
+        (datetime(2018, 1, 1, 13), datetime(2018, 1, 23, 14, 55, 21)),
+        (datetime(2018, 1, 3, 15), datetime(2018, 1, 3, 16)),
+        (datetime(2018, 1, 31), datetime(2018, 1, 1, 13)),
+        (datetime.min, datetime.max),
+    ],
+)
+def test_daily_rollup_get_period(dataframe_tr, start_date, end_date):
+    store = TransactionStore(dataframe_tr)
+
+    period = store.rollup.get_period(start_date, end_date)
+    expected = store.get_by_date_period(start_date, end_date)
+
+    assert period.counts.sum() == len(expected)
+    assert period.get_values("Сумма операции").sum() == pytest.approx(expected.get_values("Сумма операции").sum())
+    assert period.first_rows.tolist() == sorted(period.first_rows.tolist())
+    with pytest.raises(KeyError):
+        period.get_values("Описание")
+
+
+def test_transaction_store_tags():
+    store = TransactionStore(
+        pd.DataFrame(
+            {
+                "Дата операции": ["04.01.2018 10:00:00", "03.01.2018 10:00:00", "02.01.2018 10:00:00", ""],
+                "Описание": ["Я МТС +7 921 211-22-33", "Магнит", "Иван С.", "Магнит"],
+            }
+        )
+    )
+
+    codes, uniques = store.get_codes("Телефон")
+    assert uniques[codes].tolist() == ["+7 921 211-22-33", "", "", ""]
+    assert store.get_tagged_rows("Получатель").tolist() == [2]
+    assert store.get_tagged_rows("Продавец").tolist() == [1, 3]
+
+    store = store.append(pd.DataFrame({"Дата операции": ["05.01.2018 10:00:00"], "Описание": ["Петр П."]}))
+    assert store.get_tagged_rows("Получатель").tolist() == [0, 3]
+
+
+def test_extend_codes():
+    codes, uniques = extend_codes(
+        np.array([0, 1, 0], dtype=np.int32),
+        np.array(["Красота", "Переводы"], dtype=object),
+        ["Переводы", "Такси", ""],
+    )
+
+    assert codes.tolist() == [1, 2, 3, 0, 1, 0]
+    assert uniques.tolist() == ["Красота", "Переводы", "Такси", ""]
+
+
+@pytest.mark.parametrize("new_rows", [1, 2, 3])
+def test_transaction_store_append(dataframe_tr, new_rows):
+    dataframe_tr = TransactionStore(dataframe_tr.fillna(value="")).df
+    old = TransactionStore(dataframe_tr.iloc[new_rows:])
+    old.records, old.transactions, old.rollup
+
+    store = old.append(dataframe_tr.iloc[:new_rows])
+    expected = TransactionStore(dataframe_tr)
+
+    assert store.records == expected.records
+    assert store.transactions == expected.transactions
+    assert store.date_keys.tolist() == expected.date_keys.tolist()
+    codes, uniques = store.get_codes("Категория")
+    assert uniques[codes].tolist() == dataframe_tr["Категория"].tolist()
+    assert sorted(store.rollup.first_rows.tolist()) == sorted(expected.rollup.first_rows.tolist())
+    assert store.rollup.counts.sum() == 5
+
+
+def test_transaction_store_append_nan(dataframe_tr):
+    old = TransactionStore(dataframe_tr)
+    new_df = dataframe_tr.iloc[:1].assign(**{"Дата операции": "01.02.2018 10:00:00", "Описание": np.nan})
+
+    store = old.append(new_df)
+
+    assert store.records[0]["Описание"] == ""
+    assert store.transactions[0].description == ""
+    assert store.get_codes("Описание")[1][store.get_codes("Описание")[0][0]] == ""
+
+
+def test_transaction_store_append_older(dataframe_tr):
+    dataframe_tr = TransactionStore(dataframe_tr.fillna(value="")).df
+    old = TransactionStore(dataframe_tr.iloc[:3])
+
+    store = old.append(dataframe_tr.iloc[3:])
+
+    assert store.records == TransactionStore(dataframe_tr).records
+    assert old.append(dataframe_tr.iloc[:0]) is old
+
+
+@pytest.mark.parametrize(
+    "date, expected",
+    [
+        (datetime.min, pd.Timestamp.min.to_datetime64()),
+        (datetime.max, pd.Timestamp.max.to_datetime64()),
+        (datetime(2018, 1, 3), np.datetime64("2018-01-03T00:00:00", "ns")),
+    ],
+)
+def test_to_datetime64(date, expected):
+    assert to_datetime64(date) == expected
+
+
+def test_get_store_loads_once(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        with patch("src.transaction_store.read_df_from_excel", return_value=good_df) as mock_read:
+            first = get_store(str(file_path))
+            second = get_store(str(file_path))
+
+    mock_read.assert_called_once()
+    assert first is second
+    assert first._rollup is not None
+
+
+def test_get_store_reloads_changed_file(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        first = get_store(str(file_path))
+        pd.concat([good_df, good_df]).to_excel(file_path, index=False)
+        second = get_store(str(file_path))
+
+    assert first is not second
+    assert len(second) == 2
+
+
+def test_get_store_file_not_found(tmp_path):
+    assert len(get_store(str(tmp_path / "missing.xlsx"))) == 0
+
+
+def test_append_to_store(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+    new_df = good_df.assign(**{"Дата операции": "01.02.2018 10:00:00"})
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        store = append_to_store(new_df, str(file_path))
+        assert get_store(str(file_path)) is store
+        clear_stores()
+        reloaded = get_store(str(file_path))
+
+    assert len(store) == 2
+    assert reloaded.records == store.records
+
+
+def test_append_to_store_concurrent(tmp_path, good_df):
+    file_path = tmp_path / "operations.xlsx"
+    good_df.to_excel(file_path, index=False)
+    append = TransactionStore.append
+
+    def slow_append(store, df):
+        time.sleep(0.05)
+        return append(store, df)
+
+    def add(day):
+        append_to_store(good_df.assign(**{"Дата операции": f"0{day}.02.2018 10:00:00"}), str(file_path))
+
+    with patch("src.cache_utils.CACHE_PATH", str(tmp_path / "cache")):
+        with patch.object(TransactionStore, "append", slow_append):
+            threads = [threading.Thread(target=add, args=(day,)) for day in range(1, 5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        store = get_store(str(file_path))
+        clear_stores()
+        reloaded = get_store(str(file_path))
+
+    assert len(store) == 5
+    assert reloaded.records == store.records
@@ -1,7 +1,13 @@
 from datetime import datetime
 
-from src.transaction_utils import (get_transactions_by_date_period, get_transactions_for_categories,
-                                   top_transactions_by_amount)
+from src.transaction import Transaction
+from src.transaction_utils import (
+    get_transactions_by_date_period,
+    get_transactions_for_categories,
+    parse_transaction_date,
+    top_transactions_by_amount,
+    top_transactions_by_group,
+)
 
 
 def test_get_transactions_by_date_period(list_transactions, tr_by_period):
@@ -10,10 +16,32 @@ def test_get_transactions_by_date_period(list_transactions, tr_by_period):
     )
 
 
+def test_get_transactions_by_date_period_store(store_transactions, tr_by_period):
+    assert (
+        get_transactions_by_date_period(store_transactions, datetime(2018, 1, 3), datetime(2018, 1, 5)) == tr_by_period
+    )
+
+
+def test_get_transactions_by_date_period_store_typed(store_transactions, tr_by_period):
+    start_date, end_date = datetime(2018, 1, 3), datetime(2018, 1, 5)
+
+    result = get_transactions_by_date_period(store_transactions, start_date, end_date, typed=True)
+
+    assert all(isinstance(tx, Transaction) for tx in result)
+    assert [tx.date for tx in result] == [tx["Дата операции"] for tx in tr_by_period]
+
+
 def test_get_transactions_by_date_period_rev(tr_by_period, test_date_start, test_date_end):
     assert get_transactions_by_date_period([{}], test_date_end, test_date_start) == []
 
 
+def test_parse_transaction_date():
+    parse_transaction_date.cache_clear()
+    assert parse_transaction_date("03.01.2018 15:03:35") == datetime(2018, 1, 3, 15, 3, 35)
+    assert parse_transaction_date("03.01.2018 15:03:35") == datetime(2018, 1, 3, 15, 3, 35)
+    assert parse_transaction_date.cache_info().hits == 1
+
+
 def test_top_transactions_by_amount(list_transactions):
     assert top_transactions_by_amount(list_transactions) == [
         {
@@ -87,6 +115,15 @@ def test_top_transactions_by_amount(list_transactions):
     ]
 
 
+def test_top_transactions_by_amount_typed(list_transactions):
+    transactions = [Transaction.from_dict(tx) for tx in list_transactions]
+
+    result = top_transactions_by_amount(transactions, num_top_cats=2)
+
+    assert result == [transactions[1], transactions[0]]
+    assert result[0] is transactions[1]
+
+
 def test_get_transactions_for_categories(list_transactions):
     assert get_transactions_for_categories(list_transactions, {"Красота", "Переводы"}) == [
         {
@@ -158,3 +195,58 @@ def test_get_transactions_for_categories(list_transactions):
             "Сумма операции с округлением": 21.0,
         },
     ]
+
+
+def test_get_transactions_for_categories_store(store_transactions):
+    result = get_transactions_for_categories(store_transactions, {"Красота", "Переводы"})
+    typed = get_transactions_for_categories(store_transactions, {"Красота", "Переводы"}, typed=True)
+
+    assert [tx["Дата операции"] for tx in result] == [
+        "23.01.2018 14:55:21",
+        "03.01.2018 14:55:21",
+        "01.01.2018 20:27:51",
+        "01.01.2018 12:49:53",
+    ]
+    assert [tx.date for tx in typed] == [tx["Дата операции"] for tx in result]
+
+
+def test_top_transactions_by_amount_store(list_transactions, store_transactions):
+    expected = top_transactions_by_amount(list_transactions, num_top_cats=3)
+
+    result = top_transactions_by_amount(store_transactions, num_top_cats=3)
+    typed = top_transactions_by_amount(store_transactions, num_top_cats=3, typed=True)
+
+    assert [tx["Дата операции"] for tx in result] == [tx["Дата операции"] for tx in expected]
+    assert all(isinstance(tx, Transaction) for tx in typed)
+    assert [tx.amount for tx in typed] == [-3000.0, -316.0, -73.06]
+
+
+def test_top_transactions_by_amount_ties():
+    amounts = [-1, -2, -1, -2]
+    data = [{"Статус": "OK", "Сумма операции": amount, "Описание": str(i)} for i, amount in enumerate(amounts)]
+
+    assert [tx["Описание"] for tx in top_transactions_by_amount(data, num_top_cats=3)] == ["1", "3", "0"]
+    assert [tx["Описание"] for tx in top_transactions_by_amount(data)] == ["1", "3", "0", "2"]
+
+
+def test_top_transactions_by_group(list_transactions, store_transactions):
+    result = top_transactions_by_group(list_transactions, num_top_cats=1)
+    store_result = top_transactions_by_group(store_transactions, num_top_cats=1)
+
+    assert list(result) == ["Красота", "Переводы", "Супермаркеты"]
+    assert {key: [tx["Сумма операции"] for tx in value] for key, value in result.items()} == {
+        "Красота": [-316.0],
+        "Переводы": [-3000.0],
+        "Супермаркеты": [-73.06],
+    }
+    assert {key: [tx["Дата операции"] for tx in value] for key, value in store_result.items()} == {
+        key: [tx["Дата операции"] for tx in value] for key, value in result.items()
+    }
+
+
+def test_top_transactions_by_group_all(list_transactions):
+    result = top_transactions_by_group(list_transactions, "Номер карты", num_top_cats=0)
+
+    assert {key: [tx["Сумма операции"] for tx in value] for key, value in result.items()} == {
+        "*7197": [-316.0, -73.06, -21.0]
+    }
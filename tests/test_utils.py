@@ -5,9 +5,21 @@ from unittest.mock import mock_open, patch
 import pandas as pd
 import pytest
 
-from src.utils import (get_amount_for_categories, get_greetings, get_json_file, get_last_digits_card_number,
-                       get_start_date, get_total_amount, get_total_amount_for_card, is_valid_datetime,
-                       read_df_from_excel, read_transactions_from_excel)
+from src.transaction import Transaction
+from src.utils import (
+    get_amount_for_categories,
+    get_greetings,
+    get_json_file,
+    get_last_digits_card_number,
+    get_start_date,
+    get_total_amount,
+    get_total_amount_for_card,
+    is_valid_datetime,
+    iter_transaction_batches,
+    iter_transactions,
+    read_df_from_excel,
+    read_transactions_from_excel,
+)
 
 
 @pytest.mark.parametrize(
@@ -120,9 +132,49 @@ def test_read_df_from_excel_file_not_found():
     assert read_df_from_excel("").equals(pd.DataFrame())
 
 
+@pytest.mark.parametrize("extension", [".xlsx", ".csv"])
+def test_iter_transaction_batches(tmp_path, list_transactions, extension):
+    file_path = str(tmp_path / f"operations{extension}")
+    df = pd.DataFrame(list_transactions)
+    if extension == ".csv":
+        df.to_csv(file_path, index=False)
+    else:
+        df.to_excel(file_path, index=False)
+
+    batches = list(iter_transaction_batches(file_path, batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [tx for batch in batches for tx in batch] == df.fillna(value="").to_dict("records")
+
+
+def test_iter_transaction_batches_file_not_found():
+    assert list(iter_transaction_batches("operations.xlsx")) == []
+    assert list(iter_transaction_batches("operations.csv")) == []
+
+
+def test_aggregates_from_iter_transactions(tmp_path, list_transactions):
+    file_path = str(tmp_path / "operations.xlsx")
+    pd.DataFrame(list_transactions).to_excel(file_path, index=False)
+    data = pd.DataFrame(list_transactions).fillna(value="").to_dict("records")
+
+    assert get_total_amount_for_card(iter_transactions(file_path, batch_size=2)) == get_total_amount_for_card(data)
+    assert get_total_amount(iter_transactions(file_path, batch_size=2)) == get_total_amount(data)
+    assert get_amount_for_categories(iter_transactions(file_path, batch_size=2)) == get_amount_for_categories(data)
+
+
 def test_is_valid_datetime():
     assert not is_valid_datetime("2012.10.11 15:16:17", "%Y-%m-%d %H:%M:%S")
 
 
 def test_is_valid_datetime_true():
     assert is_valid_datetime("01.01.2018 20:27:51", "%d.%m.%Y %H:%M:%S")
+
+
+def test_aggregates_from_transactions(list_transactions):
+    transactions = [Transaction.from_dict(tx) for tx in list_transactions]
+
+    assert get_total_amount_for_card(transactions) == get_total_amount_for_card(list_transactions)
+    assert get_total_amount(transactions) == get_total_amount(list_transactions)
+    assert get_amount_for_categories(transactions, num_top_cats=1) == get_amount_for_categories(
+        list_transactions, num_top_cats=1
+    )
@@ -5,16 +5,13 @@ from src.config import AMOUNT_ROUND_UP_KEY, CATEGORY_KEY, DATE_TRANSACTIONS_KEY,
 from src.views import get_data_events, get_data_main
 
 
-@patch("src.views.get_stock_prices")
-@patch("src.views.get_currency_rates")
+@patch("src.views.get_market_data")
 @patch("src.views.top_transactions_by_amount")
-@patch("src.views.get_total_amount_for_card")
+@patch("src.views.get_store_total_amount_for_card")
 @patch("src.views.get_greetings")
-@patch("src.views.read_transactions_from_excel")
-def test_get_data_main(
-    mock_excel, mock_greetings, mock_amount_card, mock_top, mock_currency, mock_stock, list_transactions
-):
-    mock_excel.return_value = list_transactions
+@patch("src.views.get_store")
+def test_get_data_main(mock_store, mock_greetings, mock_amount_card, mock_top, mock_market, store_transactions):
+    mock_store.return_value = store_transactions
 
     mock_greetings.return_value = "Добрый день"
 
@@ -29,9 +26,7 @@ def test_get_data_main(
         }
     ]
 
-    mock_currency.return_value = {"USD": 73.21}
-
-    mock_stock.return_value = {"AAPL": 150.12}
+    mock_market.return_value = ({"USD": 73.21}, {"AAPL": 150.12})
 
     result = get_data_main("2018-01-31 12:14:00")
     expected = json.dumps(
@@ -60,16 +55,13 @@ def test_get_data_main(
     assert result == expected
 
 
-@patch("src.views.get_stock_prices")
-@patch("src.views.get_currency_rates")
+@patch("src.views.get_market_data")
 @patch("src.views.top_transactions_by_amount")
-@patch("src.views.get_total_amount_for_card")
+@patch("src.views.get_store_total_amount_for_card")
 @patch("src.views.get_greetings")
-@patch("src.views.read_transactions_from_excel")
-def test_get_data_main_err(
-    mock_excel, mock_greetings, mock_amount_card, mock_top, mock_currency, mock_stock, list_transactions
-):
-    mock_excel.return_value = list_transactions
+@patch("src.views.get_store")
+def test_get_data_main_err(mock_store, mock_greetings, mock_amount_card, mock_top, mock_market, store_transactions):
+    mock_store.return_value = store_transactions
 
     mock_greetings.return_value = "Добрый день"
 
@@ -84,11 +76,9 @@ def test_get_data_main_err(
         }
     ]
 
-    mock_currency.return_value = {"USD": 73.21}
-
-    mock_stock.return_value = {"AAPL": 150.12}
+    mock_market.return_value = ({"USD": 73.21}, {"AAPL": 150.12})
 
-    with patch("src.views.json.dumps") as mock_json:
+    with patch("src.json_utils.json.dumps") as mock_json:
         mock_json.side_effect = [ValueError, "{}"]
         result = get_data_main("2018-01-31 12:14:00")
     expected = json.dumps({}, indent=4, ensure_ascii=False)
@@ -96,45 +86,30 @@ def test_get_data_main_err(
     assert result == expected
 
 
-@patch("src.views.get_stock_prices")
-@patch("src.views.get_currency_rates")
-@patch("src.views.get_transactions_for_categories")
-@patch("src.views.get_amount_for_categories")
-@patch("src.views.get_total_amount")
-@patch("src.views.read_transactions_from_excel")
-def test_get_data_events(
-    mock_excel, mock_amount, mock_categories, mock_trans_cat, mock_currency, mock_stock, list_transactions
-):
-    mock_excel.return_value = list_transactions
+@patch("src.views.get_market_data")
+@patch("src.views.get_store")
+def test_get_data_events(mock_store, mock_market, store_transactions):
+    mock_store.return_value = store_transactions
 
-    mock_amount.side_effect = [32101, 54271]
-
-    mock_categories.side_effect = [
-        {"Супермаркеты": 17319},
-        {"Наличные": 500, "Переводы": 200},
-        {"Пополнение_BANK007": 33000},
-    ]
-
-    mock_currency.return_value = {"USD": 73.21}
-
-    mock_stock.return_value = {"AAPL": 150.12}
+    mock_market.return_value = ({"USD": 73.21}, {"AAPL": 150.12})
 
     expected = json.dumps(
         {
             "expenses": {
-                "total_amount": 32101,
+                "total_amount": 3410.06,
                 "main": [
-                    {"category": "Супермаркеты", "amount": 17319},
+                    {"category": "Переводы", "amount": 3000.0},
+                    {"category": "Красота", "amount": 337.0},
+                    {"category": "Супермаркеты", "amount": 73.06},
                 ],
                 "transfers_and_cash": [
-                    {"category": "Наличные", "amount": 500},
-                    {"category": "Переводы", "amount": 200},
+                    {"category": "Переводы", "amount": 3000.0},
                 ],
             },
             "income": {
-                "total_amount": 54271,
+                "total_amount": 21.0,
                 "main": [
-                    {"category": "Пополнение_BANK007", "amount": 33000},
+                    {"category": "Красота", "amount": 21.0},
                 ],
             },
             "currency_rates": [
@@ -149,32 +124,34 @@ def test_get_data_events(
     assert result == expected
 
 
-@patch("src.views.get_stock_prices")
-@patch("src.views.get_currency_rates")
-@patch("src.views.get_transactions_for_categories")
-@patch("src.views.get_amount_for_categories")
-@patch("src.views.get_total_amount")
-@patch("src.views.read_transactions_from_excel")
-def test_get_data_events_err(
-    mock_excel, mock_amount, mock_categories, mock_trans_cat, mock_currency, mock_stock, list_transactions
-):
-    mock_excel.return_value = list_transactions
+@patch("src.views.get_market_data")
+@patch("src.views.get_events_summary")
+@patch("src.views.get_store")
+def test_get_data_events_err(mock_store, mock_summary, mock_market, store_transactions):
+    mock_store.return_value = store_transactions
 
-    mock_amount.side_effect = [32101, 54271]
+    mock_summary.return_value = {
+        "expenses": {"total_amount": 32101, "main": {"Супермаркеты": 17319}, "transfers_and_cash": {}},
+        "income": {"total_amount": 54271, "main": {"Пополнение_BANK007": 33000}},
+    }
 
-    mock_categories.side_effect = [
-        {"Супермаркеты": 17319},
-        {"Наличные": 500, "Переводы": 200},
-        {"Пополнение_BANK007": 33000},
-    ]
+    mock_market.return_value = ({"USD": 73.21}, {"AAPL": 150.12})
 
-    mock_currency.return_value = {"USD": 73.21}
-
-    mock_stock.return_value = {"AAPL": 150.12}
-
-    with patch("src.views.json.dumps") as mock_json:
+    with patch("src.json_utils.json.dumps") as mock_json:
         mock_json.side_effect = [ValueError, "{}"]
         result = get_data_events("2018-01-31 12:14:00")
     expected = json.dumps({}, indent=4, ensure_ascii=False)
 
     assert result == expected
+
+
+@patch("src.views.get_market_data")
+@patch("src.views.get_store")
+def test_get_data_events_compact(mock_store, mock_market, store_transactions):
+    mock_store.return_value = store_transactions
+    mock_market.return_value = ({"USD": 73.21}, {"AAPL": 150.12})
+
+    result = get_data_events("2018-01-31 12:14:00", pretty=False)
+
+    assert "\n" not in result
+    assert json.loads(result) == json.loads(get_data_events("2018-01-31 12:14:00"))
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pandas as pd
+
+from src.transaction_store import TransactionStore
+from src.utils import get_amount_for_categories, get_total_amount
+from src.views_utils import get_events_summary, get_top_categories
+
+
+def test_get_events_summary(dataframe_tr, list_transactions):
+    result = get_events_summary(dataframe_tr, num_top_cats=1)
+
+    assert result == {
+        "expenses": {
+            "total_amount": get_total_amount(list_transactions),
+            "main": get_amount_for_categories(list_transactions, num_top_cats=1),
+            "transfers_and_cash": {"Переводы": 3000.0},
+        },
+        "income": {
+            "total_amount": get_total_amount(list_transactions, expense=False),
+            "main": get_amount_for_categories(list_transactions, expense=False),
+        },
+    }
+
+
+def test_get_events_summary_store(dataframe_tr):
+    store = TransactionStore(dataframe_tr.fillna(value=""))
+
+    result = get_events_summary(store, num_top_cats=1)
+
+    assert result == get_events_summary(dataframe_tr, num_top_cats=1)
+    assert result == get_events_summary(store.rollup.get_period(datetime.min, datetime.max), num_top_cats=1)
+
+
+def test_get_events_summary_status(dataframe_tr):
+    dataframe_tr["Статус"] = "FAILED"
+    result = get_events_summary(dataframe_tr)
+
+    assert result["expenses"] == {"total_amount": 0.0, "main": {}, "transfers_and_cash": {}}
+    assert result["income"] == {"total_amount": 0.0, "main": {}}
+
+
+def test_get_events_summary_without_cats(list_transactions_without_cats):
+    result = get_events_summary(pd.DataFrame(list_transactions_without_cats))
+
+    assert result["expenses"]["main"] == get_amount_for_categories(list_transactions_without_cats)
+    assert result["expenses"]["total_amount"] == get_total_amount(list_transactions_without_cats)
+
+
+def test_get_events_summary_empty():
+    result = get_events_summary(pd.DataFrame())
+
+    assert result["expenses"] == {"total_amount": 0.0, "main": {}, "transfers_and_cash": {}}
+
+
+def test_get_top_categories():
+    sums = pd.Series({"Красота": 10.0, "Такси": 30.0, "Аптеки": 10.0, "Фастфуд": 5.0})
+
+    assert get_top_categories(sums) == {"Такси": 30.0, "Красота": 10.0, "Аптеки": 10.0, "Фастфуд": 5.0}
+    assert get_top_categories(sums, 2) == {"Такси": 30.0, "Красота": 10.0, "Остальное": 15.0}